@@ -0,0 +1,170 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SERVER_BOOT = """
+import sys
+sys.path.insert(0, {root!r})
+from src.database.database import AMSDatabase
+AMSDatabase.DB_PATH = sys.argv[1]
+AMSDatabase().init_db()
+from src.controllers.user import UserController
+UserController.create_user(dict(
+    first_name="Bench", last_name="User", email="bench@example.com",
+    password="Bench12345", phone="9800000000", dob="1990-01-01", gender="o",
+    address="Kathmandu", role="super_admin",
+))
+import main
+getattr(main, "run_" + sys.argv[2])(int(sys.argv[3]))
+"""
+
+CONCURRENCY = (10, 100)
+DURATION = 5.0
+IDLE_CONNECTIONS = 500
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(engine, db_path):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVER_BOOT.format(root=ROOT), db_path, engine, str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{engine} server did not start")
+
+
+def thread_count(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("Threads:"):
+                return int(line.split()[1])
+    return -1
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+        if line.lower().startswith(b"transfer-encoding:"):
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    return status, head
+    await reader.readexactly(length)
+    return status, head
+
+
+async def login(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"email=bench%40example.com&password=Bench12345"
+    writer.write(
+        b"POST /login HTTP/1.1\r\nHost: bench\r\n"
+        b"Content-Type: application/x-www-form-urlencoded\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+    )
+    _, head = await read_response(reader)
+    writer.close()
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"set-cookie:"):
+            return line.split(b":", 1)[1].split(b";")[0].strip()
+    raise RuntimeError("login failed")
+
+
+async def client(port, request, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            status, _ = await read_response(reader)
+            if status != 200:
+                errors.append(status)
+            latencies.append(time.perf_counter() - started)
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        errors.append(type(e).__name__)
+    finally:
+        writer.close()
+
+
+async def load(port, concurrency, duration=DURATION):
+    cookie = await login(port)
+    request = (
+        b"GET /dashboard?tab=users HTTP/1.1\r\nHost: bench\r\nCookie: %s\r\n\r\n"
+        % cookie
+    )
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(
+            client(port, request, deadline, latencies, errors)
+            for _ in range(concurrency)
+        )
+    )
+    latencies.sort()
+    return {
+        "rps": len(latencies) / duration,
+        "p50": latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+async def idle_connections(port, pid, count=IDLE_CONNECTIONS):
+    connections = []
+    for _ in range(count):
+        connections.append(await asyncio.open_connection("127.0.0.1", port))
+    await asyncio.sleep(1)
+    threads = thread_count(pid)
+    for _, writer in connections:
+        writer.close()
+    return threads
+
+
+def main():
+    print(f"{'engine':<10} {'conns':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for engine in ("threaded", "asyncio"):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            process, port = start_server(engine, os.path.join(tmp_dir, "bench.db"))
+            try:
+                for concurrency in CONCURRENCY:
+                    result = asyncio.run(load(port, concurrency))
+                    print(
+                        f"{engine:<10} {concurrency:>6} {result['rps']:>9.0f} "
+                        f"{result['p50']:>8.1f} {result['p99']:>8.1f} {result['errors']:>7}"
+                    )
+                threads = asyncio.run(idle_connections(port, process.pid))
+                print(f"{engine:<10} {IDLE_CONNECTIONS} idle keep-alive connections -> {threads} threads")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,781 @@
+import argparse
+import asyncio
+import gzip
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SCENARIOS = ("login", "dashboard", "songs", "import_export", "crud")
+VOLUMES = {"users": 200, "artists": 5000, "songs": 100000}
+MANAGERS = 20
+PASSWORD = "Bench12345"
+GENRES = ("rnb", "country", "classic", "rock", "jazz")
+ALBUMS_PER_ARTIST = 8
+SEED_BATCH_SIZE = 10000
+BCRYPT_ROUNDS = 10
+CONCURRENCY = 10
+DURATION = 10.0
+WARMUP = 2.0
+PAGE_DEPTH = 5
+IMPORT_ROWS = 20
+JOB_POLL_INTERVAL = 0.05
+SCENARIO_EMAIL_PREFIX = "load-"
+PERCENTILES = (50, 95, 99)
+UNLIMITED = (10**9, 10**9)
+NEXT_LINK = re.compile(rb'class="page-btn " href="([^"]+)">Next<')
+
+
+def seeded_db_path(volumes, seed):
+    name = "ams-load-{users}u-{artists}a-{songs}s".format(**volumes)
+    return os.path.join(tempfile.gettempdir(), f"{name}-{seed}.db")
+
+
+def seed_database(db_path, volumes, rounds, seed, reseed=False):
+    from src.database.database import AMSDatabase
+    from src.utils.password import bcrypt_hash
+
+    if reseed:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    AMSDatabase.DB_PATH = db_path
+    AMSDatabase().init_db()
+    AMSDatabase.shutdown()
+
+    conn = sqlite3.connect(db_path)
+    if conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]:
+        conn.close()
+        return False
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    password_hash = bcrypt_hash(PASSWORD, rounds)
+    now = datetime(2024, 1, 1).isoformat(" ")
+
+    def user(email, role, index):
+        return (
+            "Load",
+            f"User{index}",
+            email,
+            password_hash,
+            f"98{index:08d}"[:10],
+            "1990-01-01",
+            rng.choice("mfo"),
+            "Kathmandu",
+            role,
+            now,
+            now,
+        )
+
+    def users():
+        yield user("admin@bench.local", "super_admin", 0)
+        for index in range(1, volumes["users"]):
+            if index <= MANAGERS:
+                yield user(f"manager{index}@bench.local", "artist_manager", index)
+            else:
+                yield user(f"admin{index}@bench.local", "super_admin", index)
+        for index in range(volumes["artists"]):
+            yield user(f"artist{index}@bench.local", "artist", index)
+
+    def artists(first_user_id):
+        for index in range(volumes["artists"]):
+            yield (
+                first_user_id + index,
+                f"Stage {index}",
+                rng.randint(1970, 2024),
+                rng.randint(0, 20),
+                now,
+                now,
+            )
+
+    def songs():
+        for index in range(volumes["songs"]):
+            artist_id = rng.randint(1, volumes["artists"])
+            yield (
+                artist_id,
+                f"Song {index}",
+                f"Album {artist_id}-{rng.randrange(ALBUMS_PER_ARTIST)}",
+                rng.choice(GENRES),
+                now,
+                now,
+            )
+
+    def insert(sql, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= SEED_BATCH_SIZE:
+                conn.executemany(sql, batch)
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+
+    conn.execute("PRAGMA synchronous=OFF")
+    with conn:
+        insert(
+            "INSERT INTO users (first_name, last_name, email, password_hash, phone, dob,"
+            " gender, address, role, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            users(),
+        )
+        first_artist_user = conn.execute(
+            "SELECT id FROM users WHERE email = 'artist0@bench.local'"
+        ).fetchone()[0]
+        insert(
+            "INSERT INTO artists (user_id, stage_name, first_release_year,"
+            " no_of_albums_released, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            artists(first_artist_user),
+        )
+        insert(
+            "INSERT INTO songs (artist_id, title, album_name, genre, created_at,"
+            " updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            songs(),
+        )
+    conn.execute("ANALYZE")
+    conn.close()
+    print(f"Seeded {db_path} in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+def remove_scenario_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    with conn:
+        conn.execute(
+            "DELETE FROM users WHERE email LIKE ?", (SCENARIO_EMAIL_PREFIX + "%",)
+        )
+        conn.execute("DELETE FROM songs WHERE title LIKE ?", (SCENARIO_EMAIL_PREFIX + "%",))
+        conn.execute("DELETE FROM sessions")
+        conn.execute("DELETE FROM jobs")
+    conn.close()
+
+
+class InProcessServer:
+
+    def __init__(self, engine, db_path):
+        self.engine = engine
+        self.db_path = db_path
+        self.port = None
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        from src.database.database import AMSDatabase
+        from src.server import AMSRequestHandler
+        from src.utils import rate_limit
+        from src.worker import start_job_workers
+
+        AMSDatabase.DB_PATH = self.db_path
+        AMSDatabase().init_db()
+        rate_limit.login_throttle = rate_limit.Throttle(UNLIMITED, UNLIMITED)
+        rate_limit.register_throttle = rate_limit.Throttle(UNLIMITED, UNLIMITED)
+        start_job_workers()
+
+        handler = type(
+            "QuietRequestHandler",
+            (AMSRequestHandler,),
+            {"log_message": lambda self, format, *args: None},
+        )
+        if self.engine == "asyncio":
+            self._start_asyncio(handler)
+        else:
+            self._start_threaded(handler)
+        return self
+
+    def _start_threaded(self, handler):
+        from http.server import ThreadingHTTPServer
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _start_asyncio(self, handler):
+        from src.aio_server import AsyncAMSServer
+
+        started = threading.Event()
+
+        async def serve():
+            self._server = await AsyncAMSServer(
+                "127.0.0.1", 0, handler_class=handler
+            ).start()
+            self.port = self._server.server_address[1]
+            started.set()
+            await self._server.serve_forever()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(serve(),), daemon=True
+        )
+        self._thread.start()
+        started.wait()
+
+    def stop(self):
+        from src.database.database import AMSDatabase
+        from src.utils.password import shutdown_hasher
+        from src.utils.session_store import close_session_store
+        from src.worker import stop_job_workers
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        else:
+            self._server.shutdown()
+            self._server.server_close()
+        self._thread.join(timeout=10)
+        stop_job_workers()
+        shutdown_hasher()
+        close_session_store()
+        AMSDatabase.shutdown()
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    status = int(lines[0].split(b" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if b":" in line:
+            name, value = line.split(b":", 1)
+            headers[name.strip().lower().decode()] = value.strip().decode()
+
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            chunks.append(await reader.readexactly(size + 2))
+            if size == 0:
+                break
+        body = b"".join(chunk[:-2] for chunk in chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    elif status in (204, 304) or status < 200:
+        body = b""
+    else:
+        body = await reader.read()
+
+    if headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return status, headers, body
+
+
+class HttpClient:
+
+    def __init__(self, port):
+        self.port = port
+        self.cookie = None
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=b"", content_type=None):
+        head = [
+            f"{method} {path} HTTP/1.1",
+            "Host: bench",
+            "Accept-Encoding: gzip",
+        ]
+        if self.cookie:
+            head.append(f"Cookie: {self.cookie}")
+        if method == "POST":
+            head.append(
+                f"Content-Type: {content_type or 'application/x-www-form-urlencoded'}"
+            )
+            head.append(f"Content-Length: {len(body)}")
+        data = ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    "127.0.0.1", self.port
+                )
+            try:
+                self.writer.write(data)
+                status, headers, payload = await read_response(self.reader)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if attempt:
+                    raise
+
+        if headers.get("connection") == "close":
+            self.close()
+        cookie = headers.get("set-cookie")
+        if cookie:
+            self.cookie = cookie.split(";")[0]
+        return status, headers, payload
+
+    async def post(self, path, fields):
+        return await self.request("POST", path, urlencode(fields).encode())
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Recorder:
+
+    def __init__(self, measure_from):
+        self.measure_from = measure_from
+        self.latencies = {}
+        self.errors = {}
+
+    async def timed(self, label, request, expected=(200,)):
+        started = time.perf_counter()
+        try:
+            response = await request
+        except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+            self.record_error(label, started, type(e).__name__)
+            raise
+        if response[0] not in expected:
+            self.record_error(label, started, response[0])
+        elif started >= self.measure_from:
+            self.latencies.setdefault(label, []).append(time.perf_counter() - started)
+        return response
+
+    def record_error(self, label, started, error):
+        if started >= self.measure_from:
+            errors = self.errors.setdefault(label, {})
+            errors[str(error)] = errors.get(str(error), 0) + 1
+
+
+def percentile(values, percent):
+    index = max(0, math.ceil(percent / 100 * len(values)) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+def summarize(latencies, errors, duration):
+    values = sorted(latencies)
+    summary = {
+        "requests": len(values),
+        "errors": sum(errors.values()),
+        "throughput_rps": round(len(values) / duration, 2),
+    }
+    if values:
+        summary["latency_ms"] = {
+            f"p{percent}": round(percentile(values, percent) * 1000, 2)
+            for percent in PERCENTILES
+        }
+        summary["latency_ms"]["max"] = round(values[-1] * 1000, 2)
+    if errors:
+        summary["error_kinds"] = errors
+    return summary
+
+
+def unique_name(rng):
+    return f"{SCENARIO_EMAIL_PREFIX}{os.getpid()}-{rng.getrandbits(48):x}"
+
+
+def lookup(db, sql, params):
+    row = db.execute(sql, params).fetchone()
+    return row[0] if row else None
+
+
+async def login(client, email):
+    client.cookie = None
+    status, _, _ = await client.post("/login", {"email": email, "password": PASSWORD})
+    if status != 303 or not client.cookie:
+        raise RuntimeError(f"login failed for {email}: {status}")
+
+
+async def follow_pages(client, record, label, path):
+    for _ in range(PAGE_DEPTH):
+        _, _, body = await record.timed(label, client.request("GET", path))
+        match = NEXT_LINK.search(body)
+        if match is None:
+            return
+        path = match.group(1).decode().replace("&amp;", "&")
+
+
+class VirtualUser:
+
+    def __init__(self, index, port, volumes, db_path, seed):
+        self.index = index
+        self.client = HttpClient(port)
+        self.volumes = volumes
+        self.rng = random.Random(seed * 1000 + index)
+        self.db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.manager = f"manager{index % MANAGERS + 1}@bench.local"
+        self.artist_index = self.rng.randrange(volumes["artists"])
+
+    async def setup(self, scenario):
+        if scenario == "login":
+            return
+        if scenario == "dashboard" and self.index % 2:
+            await login(self.client, "admin@bench.local")
+        elif scenario == "crud" and self.index % 2:
+            await login(self.client, f"artist{self.artist_index}@bench.local")
+            self.artist_id = lookup(
+                self.db,
+                "SELECT a.id FROM artists a JOIN users u ON u.id = a.user_id"
+                " WHERE u.email = ?",
+                (f"artist{self.artist_index}@bench.local",),
+            )
+        else:
+            await login(self.client, self.manager)
+
+    async def login(self, record):
+        if self.rng.random() < 0.5:
+            email = f"artist{self.rng.randrange(self.volumes['artists'])}@bench.local"
+        else:
+            email = self.manager
+        self.client.cookie = None
+        await record.timed(
+            "POST /login",
+            self.client.post("/login", {"email": email, "password": PASSWORD}),
+            expected=(303,),
+        )
+        await record.timed(
+            "POST /logout", self.client.post("/logout", {}), expected=(303,)
+        )
+
+    async def dashboard(self, record):
+        tab = "users" if self.index % 2 else "artists"
+        await follow_pages(
+            self.client, record, f"GET /dashboard?tab={tab}", f"/dashboard?tab={tab}"
+        )
+
+    async def songs(self, record):
+        artist_id = self.rng.randint(1, self.volumes["artists"])
+        query = {"sort": self.rng.choice(("newest", "oldest", "title"))}
+        if self.rng.random() < 0.5:
+            query["genre"] = self.rng.choice(GENRES)
+        await follow_pages(
+            self.client,
+            record,
+            "GET /artists/{id}/songs",
+            f"/artists/{artist_id}/songs?{urlencode(query)}",
+        )
+
+    async def import_export(self, record):
+        if self.rng.random() < 0.5:
+            await record.timed(
+                "GET /artists/export", self.client.request("GET", "/artists/export")
+            )
+            return
+
+        boundary = f"bench{self.rng.getrandbits(64):x}"
+        lines = [
+            "first_name,last_name,email,password,phone,dob,gender,address,"
+            "stage_name,first_release_year,no_of_albums_released"
+        ]
+        for _ in range(IMPORT_ROWS):
+            name = unique_name(self.rng)
+            lines.append(
+                f"Load,Import,{name}@bench.local,{PASSWORD},9800000000,1990-01-01,o,"
+                f"Kathmandu,{name},2001,1"
+            )
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="artists.csv"\r\n'
+            "Content-Type: text/csv\r\n\r\n" + "\n".join(lines) + f"\r\n--{boundary}--\r\n"
+        ).encode()
+        started = time.perf_counter()
+        _, headers, _ = await record.timed(
+            "POST /artists/import",
+            self.client.request(
+                "POST",
+                "/artists/import",
+                body,
+                f"multipart/form-data; boundary={boundary}",
+            ),
+            expected=(303,),
+        )
+        job_path = headers.get("location", "")
+        while job_path.startswith("/jobs/"):
+            _, _, payload = await self.client.request("GET", f"{job_path}?format=json")
+            if json.loads(payload)["status"] in ("done", "failed"):
+                break
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+        if started >= record.measure_from:
+            record.latencies.setdefault("import job", []).append(
+                time.perf_counter() - started
+            )
+
+    async def crud(self, record):
+        if self.index % 2:
+            await self.song_crud(record)
+        else:
+            await self.artist_crud(record)
+
+    async def artist_crud(self, record):
+        name = unique_name(self.rng)
+        email = f"{name}@bench.local"
+        await record.timed(
+            "POST /artists/create",
+            self.client.post(
+                "/artists/create",
+                {
+                    "first_name": "Load",
+                    "last_name": "Crud",
+                    "email": email,
+                    "password": PASSWORD,
+                    "phone": "9800000000",
+                    "dob": "1990-01-01",
+                    "gender": "o",
+                    "address": "Kathmandu",
+                    "stage_name": name,
+                    "first_release_year": "2001",
+                    "no_of_albums_released": "1",
+                },
+            ),
+            expected=(303,),
+        )
+        artist_id = lookup(
+            self.db,
+            "SELECT a.id FROM artists a JOIN users u ON u.id = a.user_id"
+            " WHERE u.email = ?",
+            (email,),
+        )
+        if artist_id is None:
+            return
+        await record.timed(
+            "POST /artists/update",
+            self.client.post(
+                "/artists/update",
+                {
+                    "id": artist_id,
+                    "stage_name": name + " updated",
+                    "first_release_year": "2002",
+                    "no_of_albums_released": "2",
+                },
+            ),
+            expected=(303,),
+        )
+        await record.timed(
+            "POST /artists/delete",
+            self.client.post("/artists/delete", {"id": artist_id}),
+            expected=(303,),
+        )
+
+    async def song_crud(self, record):
+        title = unique_name(self.rng)
+        fields = {
+            "artist_id": self.artist_id,
+            "title": title,
+            "album_name": "Load album",
+            "genre": self.rng.choice(GENRES),
+        }
+        await record.timed(
+            "POST /songs/create",
+            self.client.post("/songs/create", fields),
+            expected=(303,),
+        )
+        song_id = lookup(self.db, "SELECT id FROM songs WHERE title = ?", (title,))
+        if song_id is None:
+            return
+        await record.timed(
+            "POST /songs/update",
+            self.client.post(
+                "/songs/update", dict(fields, id=song_id, title=title + " updated")
+            ),
+            expected=(303,),
+        )
+        await record.timed(
+            "POST /songs/delete",
+            self.client.post("/songs/delete", {"id": song_id}),
+            expected=(303,),
+        )
+
+    async def run(self, scenario, record, deadline):
+        action = getattr(self, scenario)
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    await action(record)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    self.client.close()
+        finally:
+            self.client.close()
+            self.db.close()
+
+
+async def run_scenario(port, scenario, concurrency, duration, warmup, volumes, db_path, seed):
+    users = [
+        VirtualUser(index, port, volumes, db_path, seed) for index in range(concurrency)
+    ]
+    for user in users:
+        await user.setup(scenario)
+    started = time.perf_counter()
+    record = Recorder(started + warmup)
+    deadline = started + warmup + duration
+    await asyncio.gather(*(user.run(scenario, record, deadline) for user in users))
+
+    measured = [
+        value
+        for label, values in record.latencies.items()
+        if label != "import job"
+        for value in values
+    ]
+    errors = {}
+    for kinds in record.errors.values():
+        for kind, count in kinds.items():
+            errors[kind] = errors.get(kind, 0) + count
+    result = summarize(measured, errors, duration)
+    result["by_request"] = {
+        label: summarize(record.latencies.get(label, []), record.errors.get(label, {}), duration)
+        for label in sorted(set(record.latencies) | set(record.errors))
+    }
+    return result
+
+
+def drive(*args):
+    return asyncio.run(run_scenario(*args))
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def print_results(results, baseline=None):
+    print(
+        f"{'scenario':<15} {'request':<26} {'req/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for scenario, result in results["scenarios"].items():
+        rows = [("all", result)] + list(result["by_request"].items())
+        for label, row in rows:
+            latency = row.get("latency_ms", {})
+            line = (
+                f"{scenario:<15} {label:<26} {row['throughput_rps']:>8.1f} "
+                f"{latency.get('p50', 0):>8.1f} {latency.get('p95', 0):>8.1f} "
+                f"{latency.get('p99', 0):>8.1f} {row['errors']:>7}"
+            )
+            previous = (baseline or {}).get("scenarios", {}).get(scenario)
+            if previous is not None and label != "all":
+                previous = previous.get("by_request", {}).get(label)
+            if previous and previous.get("throughput_rps"):
+                change = row["throughput_rps"] / previous["throughput_rps"] - 1
+                p95 = previous.get("latency_ms", {}).get("p95")
+                line += f"  rps {change:+.0%}"
+                if p95:
+                    line += f", p95 {latency.get('p95', 0) / p95 - 1:+.0%}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test ArtistOps in-process.")
+    parser.add_argument("--engine", choices=("threaded", "asyncio"), default="threaded")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--users", type=int, default=VOLUMES["users"])
+    parser.add_argument("--artists", type=int, default=VOLUMES["artists"])
+    parser.add_argument("--songs", type=int, default=VOLUMES["songs"])
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--warmup", type=float, default=WARMUP)
+    parser.add_argument("--bcrypt-rounds", type=int, default=BCRYPT_ROUNDS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="database to seed and reuse")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args()
+    for name in ("db", "output", "compare"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(ROOT)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    volumes = {"users": args.users, "artists": args.artists, "songs": args.songs}
+    if volumes["users"] <= MANAGERS or volumes["artists"] < 1:
+        parser.error(f"--users must be above {MANAGERS} and --artists at least 1")
+
+    os.environ["AMS_BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    db_path = args.db or seeded_db_path(volumes, args.seed)
+    seed_database(db_path, volumes, args.bcrypt_rounds, args.seed, args.reseed)
+    remove_scenario_rows(db_path)
+
+    commit, dirty = git_revision()
+    results = {
+        "benchmark": "load",
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "engine": args.engine,
+        "volumes": volumes,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "seed": args.seed,
+        "scenarios": {},
+    }
+
+    server = InProcessServer(args.engine, db_path).start()
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as client:
+            for scenario in scenarios:
+                results["scenarios"][scenario] = client.submit(
+                    drive,
+                    server.port,
+                    scenario,
+                    args.concurrency,
+                    args.duration,
+                    args.warmup,
+                    volumes,
+                    db_path,
+                    args.seed,
+                ).result()
+    finally:
+        server.stop()
+        remove_scenario_rows(db_path)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        f"load-{datetime.now():%Y%m%d-%H%M%S}-{commit}{'-dirty' if dirty else ''}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.controllers.artist import EXPORT_COLUMNS
+from src.server import AMSRequestHandler
+from src.utils.pagination import encode_cursor
+from src.utils.session import parse_cookies
+from src.utils.stream import iter_csv
+from src.utils.template import FLUSH, parse_post_body, render_template
+from src.utils.validate import validate_artist_create_form, validate_user_create_form
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "micro_baseline.json")
+MIN_REPEAT_TIME = 0.1
+REPEATS = 7
+ALLOC_CALLS = 20
+TOLERANCE = 0.15
+ALLOC_SLACK_BYTES = 64
+CALIBRATION_ITEMS = 200
+
+ARTIST_FORM = {
+    "first_name": "Asha",
+    "last_name": "Gurung",
+    "email": "Asha.Gurung@example.com",
+    "password": "Sup3rSecret",
+    "phone": "9801234567",
+    "dob": "1994-07-21",
+    "gender": "f",
+    "address": "Lakeside, Pokhara",
+    "stage_name": "Asha G",
+    "first_release_year": "2015",
+    "no_of_albums_released": "4",
+}
+USER_FORM = dict(ARTIST_FORM, role="artist")
+COOKIE_HEADER = (
+    "theme=dark; ams_session_id=Jx8yXr2m4k1sQ0bLZP3n9aVt7cWfH5eD; "
+    "_ga=GA1.1.1234567890.1700000000; lang=en-US"
+)
+FORM_BODY = "&".join(
+    f"{key}={value.replace(' ', '+').replace('@', '%40')}"
+    for key, value in ARTIST_FORM.items()
+).encode()
+EXPORT_HEADER = list(EXPORT_COLUMNS)
+EXPORT_BATCH = [
+    (
+        f"First{index}",
+        f"Last{index}",
+        f"artist{index}@example.com",
+        "9800000000",
+        "1990-01-01",
+        "o",
+        f"Ward {index}, Kathmandu",
+        f'Stage "{index}", Live',
+        2000 + index % 24,
+        index % 12,
+    )
+    for index in range(500)
+]
+ROW_HTML = "".join(
+    f"<tr><td>{index}</td><td>Stage {index}</td><td>2001</td><td>3</td></tr>"
+    for index in range(50)
+)
+
+
+class FormRequest:
+
+    def __init__(self, body):
+        self.headers = {
+            "Content-Length": str(len(body)),
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        self.rfile = io.BytesIO(body)
+
+
+def bench_render_template():
+    table = render_template(
+        "artists_table.html",
+        rows=ROW_HTML,
+        create_form="<form></form>",
+        csv_controls="",
+        pagination='<div class="pagination"></div>',
+        alert_html="",
+    )
+    content = render_template("dashboard.html", table=table)
+    return render_template(
+        "base.html",
+        title="Dashboard",
+        content=content,
+        users_tab="",
+        artists_tab="",
+        user_info="Bench User (ARTIST_MANAGER)",
+    )
+
+
+def bench_parse_post_body():
+    request = FormRequest(FORM_BODY)
+    return lambda: (request.rfile.seek(0), parse_post_body(request))
+
+
+def bench_build_pagination():
+    handler = AMSRequestHandler.__new__(AMSRequestHandler)
+    next_cursor = encode_cursor(120)
+    prev_cursor = encode_cursor(124)
+    return lambda: handler.build_pagination(
+        "/dashboard?tab=artists", 3, 500, next_cursor, prev_cursor
+    )
+
+
+def bench_export_csv():
+    def export():
+        size = 0
+        for piece in iter_csv(EXPORT_HEADER, [EXPORT_BATCH]):
+            if piece is not FLUSH:
+                size += len(piece)
+        return size
+
+    return export
+
+
+CASES = {
+    "render_template": lambda: bench_render_template,
+    "validate_user_create_form": lambda: lambda: validate_user_create_form(USER_FORM),
+    "validate_artist_create_form": lambda: lambda: validate_artist_create_form(
+        ARTIST_FORM
+    ),
+    "parse_cookies": lambda: lambda: parse_cookies(COOKIE_HEADER),
+    "parse_post_body": bench_parse_post_body,
+    "build_pagination": bench_build_pagination,
+    "export_csv_500_rows": bench_export_csv,
+}
+
+
+def calibration_loop():
+    items = {}
+    total = 0
+    for index in range(CALIBRATION_ITEMS):
+        key = f"item-{index}"
+        items[key] = index
+        total += len(key) + items[key]
+    return total
+
+
+def calibrate(fn):
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - started >= MIN_REPEAT_TIME / 10:
+            elapsed = (time.perf_counter() - started) / loops
+            return max(1, int(MIN_REPEAT_TIME / elapsed))
+        loops *= 10
+
+
+def time_per_call(fn, repeats=REPEATS):
+    loops = calibrate(fn)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - started) / loops)
+    return timings
+
+
+def peak_allocation(fn, calls=ALLOC_CALLS):
+    fn()
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / calls
+
+
+def calibration_unit():
+    return statistics.median(time_per_call(calibration_loop))
+
+
+def run_case(fn, unit):
+    timings = time_per_call(fn)
+    median = statistics.median(timings)
+    return {
+        "ops_per_sec": round(1 / median, 1),
+        "us_per_call": round(median * 1e6, 3),
+        "relative_cost": round(median / unit, 4),
+        "stdev_pct": round(statistics.pstdev(timings) / median * 100, 1),
+        "peak_alloc_bytes": round(peak_allocation(fn)),
+    }
+
+
+def speed_change(result, previous, same_host):
+    if same_host:
+        return result["ops_per_sec"] / previous["ops_per_sec"] - 1
+    if "relative_cost" not in previous:
+        return None
+    return previous["relative_cost"] / result["relative_cost"] - 1
+
+
+def regressions(name, result, baseline, tolerance, same_host):
+    previous = baseline.get("results", {}).get(name)
+    if previous is None:
+        return []
+    problems = []
+    change = speed_change(result, previous, same_host)
+    if change is not None and change < -tolerance:
+        measure = (
+            f"{result['ops_per_sec']:.0f} ops/s"
+            if same_host
+            else f"{result['relative_cost']:.2f} calibration units/call"
+        )
+        problems.append(f"{name}: {measure} is {-change:.0%} slower than baseline")
+    allowed = previous["peak_alloc_bytes"] * (1 + tolerance) + ALLOC_SLACK_BYTES
+    if result["peak_alloc_bytes"] > allowed:
+        problems.append(
+            f"{name}: {result['peak_alloc_bytes']} B/call peak allocation, "
+            f"baseline {previous['peak_alloc_bytes']} B"
+        )
+    return problems
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def host_id():
+    return f"{platform.node()} {platform.platform()} {platform.python_version()}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark ArtistOps hot paths.")
+    parser.add_argument("cases", nargs="*", help="case names to run (default: all)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--output", help="also write the results as JSON here")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    unknown = sorted(set(args.cases) - set(CASES))
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    same_host = baseline.get("host") == host_id()
+    if baseline and not same_host:
+        print(
+            "Note: baseline comes from another host, comparing speed relative to "
+            "the calibration loop."
+        )
+
+    unit = calibration_unit()
+    results = {}
+    problems = []
+    print(
+        f"{'case':<30} {'ops/s':>12} {'us/call':>10} {'+-%':>6} "
+        f"{'peak B/call':>12} {'vs baseline':>12}"
+    )
+    for name in args.cases or CASES:
+        result = results[name] = run_case(CASES[name](), unit)
+        previous = baseline.get("results", {}).get(name)
+        change = speed_change(result, previous, same_host) if previous else None
+        change = "" if change is None else f"{change:+.1%}"
+        case_problems = regressions(
+            name, result, baseline, args.tolerance, same_host
+        )
+        problems.extend(case_problems)
+        print(
+            f"{name:<30} {result['ops_per_sec']:>12,.0f} {result['us_per_call']:>10.2f} "
+            f"{result['stdev_pct']:>6.1f} {result['peak_alloc_bytes']:>12,} "
+            f"{change:>12}{'  REGRESSION' if case_problems else ''}"
+        )
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "host": host_id(),
+        "calibration_us": round(unit * 1e6, 3),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        if args.cases and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                saved = json.load(f)
+            saved.update(
+                {key: report[key] for key in report if key != "results"}
+            )
+            saved["results"].update(results)
+            report = saved
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if problems:
+        print("\nRegressions against baseline:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
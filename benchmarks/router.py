@@ -0,0 +1,71 @@
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.router import Router
+
+ROUTE_COUNTS = (16, 256, 4096)
+LOOKUPS = 20000
+
+
+def handler(request, **params):
+    return params
+
+
+def build_router(count):
+    router = Router()
+    for index in range(count):
+        router.add("GET", f"/static{index}/page", handler)
+        router.add("GET", f"/things{index}/{{item_id:int}}/detail", handler)
+    return router
+
+
+def build_chain(count):
+    chain = []
+    for index in range(count):
+        chain.append((f"/static{index}/page", None))
+        chain.append((f"/things{index}/", "/detail"))
+    return chain
+
+
+def match_chain(chain, path):
+    for prefix, suffix in chain:
+        if suffix is None:
+            if path == prefix:
+                return {}
+        elif path.startswith(prefix) and path.endswith(suffix):
+            item_id = path.split("/")[2]
+            if item_id.isdigit():
+                return {"item_id": int(item_id)}
+    return None
+
+
+def time_lookups(fn, paths):
+    per_call = timeit.timeit(
+        lambda: [fn(path) for path in paths], number=LOOKUPS // len(paths)
+    )
+    return per_call / LOOKUPS * 1e9
+
+
+def main():
+    print(f"{'routes':>7} {'kind':<8} {'router ns':>10} {'if-chain ns':>12}")
+    for count in ROUTE_COUNTS:
+        router = build_router(count)
+        chain = build_chain(count)
+        last = count - 1
+        cases = {
+            "static": [f"/static{last}/page", "/static0/page"],
+            "param": [f"/things{last}/42/detail", "/things0/7/detail"],
+            "miss": ["/nowhere/at/all", "/things0/x/detail"],
+        }
+        for kind, paths in cases.items():
+            routed = time_lookups(lambda path: router.match("GET", path), paths)
+            chained = time_lookups(lambda path: match_chain(chain, path), paths)
+            print(f"{count * 2:>7} {kind:<8} {routed:>10.0f} {chained:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.template import TEMPLATE_DIR, TemplateEngine
+
+ROWS = "".join(
+    f"<tr><td>{index}</td><td>Stage {index}</td><td>2001</td><td>3</td></tr>"
+    for index in range(50)
+)
+CONTEXT = {
+    "rows": ROWS,
+    "create_form": "<form></form>",
+    "csv_controls": "",
+    "pagination": '<div class="pagination"></div>',
+    "alert_html": "",
+}
+
+
+def legacy_render_template(template_name, **context):
+    file_path = os.path.join(TEMPLATE_DIR, template_name)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    for key, value in context.items():
+        content = content.replace(f"{{{{{key}}}}}", str(value))
+        content = content.replace(f"{{{{ {key} }}}}", str(value))
+
+    return content
+
+
+def render_page(render):
+    table = render("artists_table.html", **CONTEXT)
+    content = render("dashboard.html", table=table)
+    return render(
+        "base.html",
+        title="Dashboard",
+        content=content,
+        users_tab="",
+        artists_tab="",
+        user_info="Bench User (ARTIST_MANAGER)",
+    )
+
+
+def main(number=5000):
+    engine = TemplateEngine()
+    reloading_engine = TemplateEngine(auto_reload=True)
+    assert render_page(legacy_render_template) == render_page(engine.render)
+
+    candidates = [
+        ("legacy str.replace", legacy_render_template),
+        ("compiled", engine.render),
+        ("compiled (mtime reload)", reloading_engine.render),
+    ]
+    baseline = None
+    for label, render in candidates:
+        seconds = min(
+            timeit.repeat(lambda: render_page(render), number=number, repeat=3)
+        )
+        per_call = seconds / number * 1e6
+        baseline = baseline or per_call
+        print(f"{label:<26} {per_call:8.1f} us/page  {baseline / per_call:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
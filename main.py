@@ -1,26 +1,149 @@
+import argparse
+import asyncio
+import signal
+import threading
 from http.server import ThreadingHTTPServer
 
-from src.database.database import AMSDatabase
-from src.server import AMSRequestHandler
+from src.prefork import LISTEN_BACKLOG, Supervisor, create_listener
 
 PORT = 8000
+ENGINES = ("threaded", "asyncio")
+WORKER_KEEPALIVE_TIMEOUT = 15
 
 
-def run_server():
-    db = AMSDatabase()
-    db.init_db()
-    server_address = ("", PORT)
-    server = ThreadingHTTPServer(server_address, AMSRequestHandler)
-    print(f"Application is running at http://localhost:{PORT}/login")
+class AMSHTTPServer(ThreadingHTTPServer):
+    request_queue_size = LISTEN_BACKLOG
+
+
+def run_threaded(port=PORT, sock=None):
+    from src.server import AMSRequestHandler
+
+    if sock is None:
+        server = AMSHTTPServer(("", port), AMSRequestHandler)
+    else:
+        handler = type(
+            "WorkerRequestHandler",
+            (AMSRequestHandler,),
+            {"timeout": WORKER_KEEPALIVE_TIMEOUT},
+        )
+        server = AMSHTTPServer(
+            sock.getsockname()[:2], handler, bind_and_activate=False
+        )
+        server.socket.close()
+        server.socket = sock
+        server.daemon_threads = False
+        signal.signal(
+            signal.SIGTERM,
+            lambda signum, frame: threading.Thread(target=server.shutdown).start(),
+        )
 
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
-
     server.server_close()
+
+
+def run_asyncio(port=PORT, sock=None):
+    from src.aio_server import AsyncAMSServer
+
+    async def serve():
+        server = await AsyncAMSServer("", port, sock=sock).start()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def init_database():
+    from src.database.database import AMSDatabase
+
+    AMSDatabase().init_db()
+
+
+def shutdown_app():
+    from src.database.database import AMSDatabase
+    from src.utils.password import shutdown_hasher
+    from src.utils.session_store import close_session_store
+
+    shutdown_hasher()
+    close_session_store()
+    AMSDatabase.shutdown()
+
+
+def run_job_service():
+    from src.worker import start_job_workers, stop_job_workers
+
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+    start_job_workers()
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    stop_job_workers()
+    shutdown_app()
+
+
+def run_prefork(engine, port, workers):
+    sock = create_listener(port)
+    serve = run_asyncio if engine == "asyncio" else run_threaded
+
+    def prepare_workers():
+        init_database()
+        shutdown_app()
+
+    def serve_worker():
+        from src.utils.fragment_cache import use_shared_table_versions
+
+        use_shared_table_versions()
+        serve(sock=sock)
+        shutdown_app()
+
+    def serve_jobs():
+        from src.utils.fragment_cache import use_shared_table_versions
+
+        use_shared_table_versions()
+        run_job_service()
+
+    Supervisor(
+        serve_worker,
+        workers,
+        service_targets=[serve_jobs],
+        prepare_target=prepare_workers,
+    ).run()
+    sock.close()
+
+
+def run_server(engine="threaded", port=PORT, workers=0):
+    print(f"Application is running at http://localhost:{port}/login ({engine})")
+
+    if workers > 0:
+        run_prefork(engine, port, workers)
+        print("Server stopped.")
+        return
+
+    from src.worker import start_job_workers, stop_job_workers
+
+    init_database()
+    start_job_workers()
+    if engine == "asyncio":
+        run_asyncio(port)
+    else:
+        run_threaded(port)
+
+    stop_job_workers()
+    shutdown_app()
     print("Server stopped.")
 
 
 if __name__ == "__main__":
-    run_server()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=ENGINES, default="threaded")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+    run_server(args.engine, args.port, args.workers)
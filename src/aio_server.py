@@ -0,0 +1,245 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from src.server import AMSRequestHandler
+
+MAX_HEADER_SIZE = 64 * 1024
+MAX_CONNECTIONS = 1024
+HANDLER_WORKERS = 16
+KEEPALIVE_TIMEOUT = 15.0
+READ_TIMEOUT = 30.0
+BODY_SPOOL_SIZE = 1024 * 1024
+MAX_BODY_SIZE = int(os.environ.get("AMS_MAX_BODY_SIZE", str(100 * 1024 * 1024)))
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+class TransportWriter:
+
+    def __init__(self, loop, writer, buffer_size=WRITE_BUFFER_SIZE):
+        self.loop = loop
+        self.writer = writer
+        self.buffer_size = buffer_size
+        self.delay = 0.0
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        return len(data)
+
+    def defer(self, seconds):
+        self.delay += seconds
+
+    def flush(self):
+        if not self._buffer or self.delay:
+            return
+        asyncio.run_coroutine_threadsafe(self.drain(), self.loop).result()
+
+    async def drain(self):
+        if not self._buffer:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        await self._send(data)
+
+    def sendfile(self, f, count):
+        self.flush()
+        transport = self.writer.transport
+        return asyncio.run_coroutine_threadsafe(
+            self.loop.sendfile(transport, f, 0, count), self.loop
+        ).result()
+
+    async def _send(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+
+
+class AsyncAMSServer:
+
+    def __init__(
+        self,
+        host,
+        port,
+        handler_class=AMSRequestHandler,
+        workers=HANDLER_WORKERS,
+        max_connections=MAX_CONNECTIONS,
+        max_body_size=MAX_BODY_SIZE,
+        sock=None,
+    ):
+        self.server_address = (host, port)
+        self.sock = sock
+        self.handler_class = handler_class
+        self.workers = workers
+        self.max_connections = max_connections
+        self.max_body_size = max_body_size
+        self.connections = 0
+        self._closing = False
+        self._executor = None
+        self._server = None
+
+    async def start(self):
+        self._executor = ThreadPoolExecutor(
+            self.workers, thread_name_prefix="ams-aio-handler"
+        )
+        if self.sock is not None:
+            self._server = await asyncio.start_server(
+                self.handle_connection,
+                sock=self.sock,
+                limit=MAX_HEADER_SIZE,
+                backlog=self.max_connections,
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle_connection,
+                *self.server_address,
+                limit=MAX_HEADER_SIZE,
+                backlog=self.max_connections,
+            )
+        self.server_address = self._server.sockets[0].getsockname()[:2]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            if not self._closing:
+                raise
+        finally:
+            await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+    def close(self):
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+
+    async def handle_connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        peer = writer.get_extra_info("peername") or ("", 0)
+        self.connections += 1
+        try:
+            if self.connections > self.max_connections:
+                await self.send_error(writer, HTTPStatus.SERVICE_UNAVAILABLE)
+                return
+            while True:
+                rfile = await self.read_request(reader, writer)
+                if rfile is None:
+                    return
+                if self._closing:
+                    rfile.close()
+                    return
+                wfile = TransportWriter(loop, writer)
+                keep_alive, delay = await loop.run_in_executor(
+                    self._executor, self.dispatch, rfile, wfile, peer
+                )
+                if delay:
+                    await asyncio.sleep(delay)
+                    await wfile.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def read_request(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT
+            )
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.LimitOverrunError:
+            await self.send_error(
+                writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+            )
+            return None
+
+        head = head.lstrip(b"\r\n")
+        if not head:
+            return await self.read_request(reader, writer)
+
+        headers = {}
+        for line in head.decode("iso-8859-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            await self.send_error(writer, HTTPStatus.LENGTH_REQUIRED)
+            return None
+        try:
+            remaining = int(headers.get("content-length", "0"))
+        except ValueError:
+            remaining = -1
+        if remaining < 0:
+            await self.send_error(writer, HTTPStatus.BAD_REQUEST)
+            return None
+        if remaining > self.max_body_size:
+            await self.send_error(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return None
+
+        if remaining and headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            await writer.drain()
+
+        rfile = tempfile.SpooledTemporaryFile(BODY_SPOOL_SIZE)
+        rfile.write(head)
+        while remaining > 0:
+            chunk = await asyncio.wait_for(
+                reader.read(min(remaining, READ_CHUNK_SIZE)), READ_TIMEOUT
+            )
+            if not chunk:
+                rfile.close()
+                return None
+            rfile.write(chunk)
+            remaining -= len(chunk)
+        rfile.seek(0)
+        return rfile
+
+    def dispatch(self, rfile, wfile, peer):
+        handler = self.handler_class.__new__(self.handler_class)
+        handler.server = self
+        handler.client_address = peer
+        handler.request = None
+        handler.rfile = rfile
+        handler.wfile = wfile
+        handler.handle_expect_100 = lambda: True
+        handler.close_connection = True
+        try:
+            handler.handle_one_request()
+            wfile.flush()
+        except ConnectionError:
+            return False, 0.0
+        except Exception:
+            traceback.print_exc()
+            return False, 0.0
+        finally:
+            rfile.close()
+        return not handler.close_connection, wfile.delay
+
+    async def send_error(self, writer, status):
+        body = f"{status.value} {status.phrase}".encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("iso-8859-1")
+            + body
+        )
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
@@ -1,36 +1,103 @@
+import sqlite3
 from datetime import datetime
 
 from src.database.database import AMSDatabase
-from src.utils.password import hash_password
+from src.utils.fragment_cache import bump_table_versions
+from src.utils.pagination import MAX_ROW_ID, fetch_id_desc_page
+from src.utils.password import hash_password, hash_passwords
+from src.utils.rate_limit import forget_unknown_email
+from src.utils.session import destroy_user_sessions
+from src.utils.validate import (
+    GENDERS,
+    Rule,
+    Schema,
+    check_email,
+    check_int,
+    check_required,
+    fallback,
+)
+
+IMPORT_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = {
+    "first_name": "u.first_name",
+    "last_name": "u.last_name",
+    "email": "u.email",
+    "phone": "u.phone",
+    "dob": "u.dob",
+    "gender": "u.gender",
+    "address": "u.address",
+    "stage_name": "a.stage_name",
+    "first_release_year": "a.first_release_year",
+    "no_of_albums_released": "a.no_of_albums_released",
+}
+IMPORT_SCHEMA = Schema(
+    (
+        Rule(
+            ("stage_name", "first_release_year", "no_of_albums_released"),
+            check_required,
+            "stage_name, first_release_year and no_of_albums_released are required.",
+        ),
+        Rule(
+            ("first_release_year", "no_of_albums_released"),
+            check_int,
+            "first_release_year and no_of_albums_released must be numbers.",
+        ),
+        Rule("email", check_email, "Invalid email format."),
+        Rule("gender", fallback(GENDERS, "o")),
+    ),
+    fields=("first_name", "last_name", "password", "phone", "dob", "address"),
+    defaults={"first_name": "Artist", "last_name": "Artist", "password": "Import123"},
+    unique="email",
+    duplicate_message="Duplicate email in file.",
+)
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, line_number, message):
+        self.errors.append((line_number, message))
+
+    def summary(self, limit=5):
+        message = f"Imported {self.created} artist(s)."
+        if not self.errors:
+            return message
+        details = "; ".join(
+            f"line {line_number}: {error}"
+            for line_number, error in sorted(self.errors)[:limit]
+        )
+        more = len(self.errors) - limit
+        if more > 0:
+            details += f"; and {more} more"
+        return f"{message} Skipped {len(self.errors)} row(s): {details}"
 
 
 class ArtistController:
 
     @staticmethod
-    def list_artists(page=1, page_size=5):
-        conn = AMSDatabase.get_connection()
-        offset = (page - 1) * page_size
-        rows = conn.execute(
-            "SELECT * FROM artists ORDER BY id DESC LIMIT ? OFFSET ?",
-            (page_size, offset),
-        ).fetchall()
-        total = conn.execute("SELECT COUNT(*) as count FROM artists").fetchone()[
-            "count"
-        ]
-        conn.close()
-        return rows, total
+    def list_artists(after=None, before=None, page_size=5):
+        with AMSDatabase.connection() as conn:
+            total = AMSDatabase.row_count(conn, "artists")
+            return fetch_id_desc_page(
+                conn, "artists", total, after=after, before=before, page_size=page_size
+            )
 
     @staticmethod
     def get_artist_by_id(artist_id):
-        conn = AMSDatabase.get_connection()
-        row = conn.execute("SELECT * from artists where id=?", (artist_id,)).fetchone()
-        conn.close()
-        return row
+        with AMSDatabase.connection() as conn:
+            return conn.execute(
+                "SELECT * from artists where id=?", (artist_id,)
+            ).fetchone()
 
     @staticmethod
     def create_artist(data):
-        conn = AMSDatabase.get_connection()
-        try:
+        password_hash = hash_password(data["password"])
+
+        def _create(conn):
             cursor = conn.execute(
                 """
                 INSERT INTO users
@@ -41,7 +108,7 @@ class ArtistController:
                     data["first_name"],
                     data["last_name"],
                     data["email"],
-                    hash_password(data["password"]),
+                    password_hash,
                     data["phone"],
                     data["dob"],
                     data["gender"],
@@ -68,139 +135,192 @@ class ArtistController:
                 ),
             )
 
-            conn.commit()
-
-        except Exception as e:
-            conn.rollback()
-            raise e
-
-        finally:
-            conn.close()
+        AMSDatabase.write(_create)
+        bump_table_versions("users", "artists")
+        forget_unknown_email(data["email"])
 
     @staticmethod
     def update_artist(data):
-        conn = AMSDatabase.get_connection()
-
-        conn.execute(
-            """
-            UPDATE artists
-            SET stage_name=?, first_release_year=?, no_of_albums_released=?, updated_at=datetime('now')
-            WHERE id=?
-            """,
-            (
-                data.get("stage_name"),
-                data.get("first_release_year"),
-                data.get("no_of_albums_released"),
-                data.get("id"),
-            ),
-        )
+        def _update(conn):
+            conn.execute(
+                """
+                UPDATE artists
+                SET stage_name=?, first_release_year=?, no_of_albums_released=?, updated_at=datetime('now')
+                WHERE id=?
+                """,
+                (
+                    data.get("stage_name"),
+                    data.get("first_release_year"),
+                    data.get("no_of_albums_released"),
+                    data.get("id"),
+                ),
+            )
 
-        conn.commit()
-        conn.close()
+        AMSDatabase.write(_update)
+        bump_table_versions("artists")
 
     @staticmethod
     def delete_artist(artist_id):
-        conn = AMSDatabase.get_connection()
-        conn.execute("DELETE FROM artists WHERE id=?", (artist_id,))
-        conn.commit()
-        conn.close()
+        def _delete(conn):
+            row = conn.execute(
+                "SELECT user_id FROM artists WHERE id=?", (artist_id,)
+            ).fetchone()
+            conn.execute("DELETE FROM artists WHERE id=?", (artist_id,))
+            return row["user_id"] if row else None
+
+        user_id = AMSDatabase.write(_delete)
+        bump_table_versions("artists", "songs")
+        destroy_user_sessions(user_id)
 
     @staticmethod
     def get_artist_by_user_id(user_id):
-        conn = AMSDatabase.get_connection()
-        row = conn.execute(
-            "SELECT * FROM artists WHERE user_id=?", (user_id,)
-        ).fetchone()
-        conn.close()
-        return row
+        with AMSDatabase.connection() as conn:
+            return conn.execute(
+                "SELECT * FROM artists WHERE user_id=?", (user_id,)
+            ).fetchone()
+
+    @staticmethod
+    def iter_export_batches(columns=None, batch_size=EXPORT_BATCH_SIZE):
+        columns = list(columns or EXPORT_COLUMNS)
+        select = ", ".join(EXPORT_COLUMNS[column] for column in columns)
+        last_id = MAX_ROW_ID
+        while True:
+            with AMSDatabase.connection() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT a.id, {select}
+                    FROM artists a
+                    JOIN users u ON u.id = a.user_id
+                    WHERE a.id < ?
+                    ORDER BY a.id DESC
+                    LIMIT ?
+                    """,
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [tuple(row)[1:] for row in rows]
+            if len(rows) < batch_size:
+                return
+
+    @staticmethod
+    def import_artists(rows, batch_size=IMPORT_BATCH_SIZE, on_batch=None):
+        report = ImportReport()
+        batch = []
+        processed = 0
+
+        for processed, (prepared, error) in enumerate(
+            IMPORT_SCHEMA.clean_rows(rows), start=1
+        ):
+            line_number = processed + 1
+            if error is not None:
+                report.add_error(line_number, error)
+                continue
+
+            prepared["line_number"] = line_number
+            batch.append(prepared)
+            if len(batch) >= batch_size:
+                ArtistController.import_batch(batch, report)
+                batch = []
+                if on_batch:
+                    on_batch(processed)
+
+        if batch:
+            ArtistController.import_batch(batch, report)
+        if on_batch:
+            on_batch(processed)
+        return report
 
     @staticmethod
-    def export_artists_csv_rows():
-        conn = AMSDatabase.get_connection()
+    def existing_emails(conn, emails):
+        placeholders = ",".join("?" for _ in emails)
         rows = conn.execute(
-            """
-            SELECT u.first_name, u.last_name, u.email, u.phone, u.dob, u.gender, u.address,
-                   a.stage_name, a.first_release_year, a.no_of_albums_released
-            FROM artists a
-            JOIN users u ON u.id = a.user_id
-            ORDER BY a.id DESC
-            """
+            f"SELECT email FROM users WHERE email IN ({placeholders})", emails
         ).fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return {row["email"] for row in rows}
 
     @staticmethod
-    def import_artists(rows):
-        if not rows:
-            return 0
+    def import_batch(batch, report):
+        with AMSDatabase.connection() as conn:
+            taken = ArtistController.existing_emails(
+                conn, [item["email"] for item in batch]
+            )
 
-        conn = AMSDatabase.get_connection()
-        created_count = 0
+        pending = []
+        for item in batch:
+            if item["email"] in taken:
+                report.add_error(item["line_number"], "Email already exists.")
+            else:
+                pending.append(item)
+        if not pending:
+            return
 
-        try:
-            for _, row in enumerate(rows, start=1):
-                first_name = (row.get("first_name") or "").strip()
-                last_name = (row.get("last_name") or "").strip()
-                email = (row.get("email") or "").strip()
-                password = (row.get("password") or "").strip()
-                phone = (row.get("phone") or "").strip()
-                dob = (row.get("dob") or "").strip()
-                gender = (row.get("gender") or "").strip()
-                gender = gender if gender in ["m", "f", "o"] else "o"
-                address = (row.get("address") or "").strip()
-                stage_name = (row.get("stage_name") or "").strip()
-                release_year = (row.get("first_release_year") or "").strip()
-                album_count = (row.get("no_of_albums_released") or "").strip()
-
-                if not stage_name or not release_year or not album_count:
-                    continue
+        hashes = hash_passwords(item["password"] for item in pending)
 
-                try:
-                    release_year = int(release_year)
-                    album_count = int(album_count)
-                except ValueError:
+        def _insert(conn):
+            taken = ArtistController.existing_emails(
+                conn, [item["email"] for item in pending]
+            )
+            now = datetime.now()
+            users = []
+            artists = []
+            duplicates = []
+            for item, password_hash in zip(pending, hashes):
+                if item["email"] in taken:
+                    duplicates.append(item)
                     continue
-
-                cursor = conn.execute(
-                    """
-                    INSERT INTO users
-                    (first_name, last_name, email, password_hash, phone, dob, gender, address, role, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                users.append(
                     (
-                        first_name or "Artist",
-                        last_name or "Artist",
-                        email,
-                        hash_password(password or "Import123"),
-                        phone,
-                        dob,
-                        gender,
-                        address,
+                        item["first_name"],
+                        item["last_name"],
+                        item["email"],
+                        password_hash,
+                        item["phone"],
+                        item["dob"],
+                        item["gender"],
+                        item["address"],
                         "artist",
-                        datetime.now(),
-                        datetime.now(),
-                    ),
+                        now,
+                        now,
+                    )
                 )
-
-                conn.execute(
-                    """
-                    INSERT INTO artists
-                    (user_id, stage_name, first_release_year, no_of_albums_released, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, datetime('now'), datetime('now'))
-                    """,
+                artists.append(
                     (
-                        cursor.lastrowid,
-                        stage_name,
-                        release_year,
-                        album_count,
-                    ),
+                        item["stage_name"],
+                        item["first_release_year"],
+                        item["no_of_albums_released"],
+                        item["email"],
+                    )
                 )
-                created_count += 1
-
-            conn.commit()
-            return created_count
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+
+            conn.executemany(
+                """
+                INSERT INTO users
+                (first_name, last_name, email, password_hash, phone, dob, gender, address, role, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                users,
+            )
+            conn.executemany(
+                """
+                INSERT INTO artists
+                (user_id, stage_name, first_release_year, no_of_albums_released, created_at, updated_at)
+                SELECT id, ?, ?, ?, datetime('now'), datetime('now') FROM users WHERE email = ?
+                """,
+                artists,
+            )
+            return [artist[3] for artist in artists], duplicates
+
+        try:
+            inserted, duplicates = AMSDatabase.write(_insert)
+        except sqlite3.Error as e:
+            for item in pending:
+                report.add_error(item["line_number"], f"Insert failed: {e}")
+            return
+        for item in duplicates:
+            report.add_error(item["line_number"], "Email already exists.")
+        report.created += len(inserted)
+        bump_table_versions("users", "artists")
+        for email in inserted:
+            forget_unknown_email(email)
@@ -1,83 +1,162 @@
+import time
 from datetime import datetime
 
 from src.database.database import AMSDatabase
-from src.utils.password import hash_password, verify_password
-from src.utils.validate import valid_email, valid_dob, valid_password, valid_phone
+from src.utils.fragment_cache import bump_table_versions, current_table_versions
+from src.utils.password import (
+    HashingBusyError,
+    hash_password,
+    needs_rehash,
+    rehash_password,
+    simulate_verify,
+    verify_password,
+)
+from src.utils.rate_limit import (
+    forget_unknown_email,
+    is_unknown_email,
+    remember_unknown_email,
+)
+from src.utils.validate import (
+    Rule,
+    Schema,
+    check_dob,
+    check_email,
+    check_password,
+    check_phone,
+    check_required,
+)
+
+
+LOGIN_BUSY_MESSAGE = "Too many login attempts right now. Please try again."
+INVALID_CREDENTIALS_MESSAGE = "Invalid credentials."
+REGISTRATION_SCHEMA = Schema(
+    (
+        Rule(
+            ("email", "password"), check_required, "Email and password are required."
+        ),
+        Rule("email", check_email, "Invalid email format."),
+        Rule(
+            "password",
+            check_password,
+            "Password must be 8+ chars with uppercase, lowercase, and number.",
+        ),
+        Rule("phone", check_phone, "Phone number must be exactly 10 digits."),
+        Rule("dob", check_dob, "You must be at least 15 years old to register."),
+    )
+)
+
+
+class DelayedRejection(str):
+
+    def __new__(cls, message, delay):
+        rejection = super().__new__(cls, message)
+        rejection.delay = delay
+        return rejection
 
 
 class AuthController:
 
     def register_user(self, data):
-        conn = AMSDatabase.get_connection()
-        email = data.get("email", "").strip().lower()
-        password = data.get("password", "").strip()
-        phone = data.get("phone", "").strip()
-        dob = data.get("dob")
+        values, error = REGISTRATION_SCHEMA.clean(data)
+        if error:
+            return False, error
+        email = values["email"]
+        password = values["password"]
 
-        if not email or not password:
-            return False, "Email and password are required."
+        with AMSDatabase.connection() as conn:
+            existing = conn.execute(
+                "SELECT id FROM users WHERE email = ?", (email,)
+            ).fetchone()
 
-        if not valid_email(email):
-            return False, "Invalid email format."
+        if existing:
+            return False, "Email already exists."
 
-        if not valid_password(password):
-            return (
-                False,
-                "Password must be 8+ chars with uppercase, lowercase, and number.",
+        password_hash = hash_password(password)
+
+        def _register(conn):
+            existing = conn.execute(
+                "SELECT id FROM users WHERE email = ?", (email,)
+            ).fetchone()
+
+            if existing:
+                return False
+
+            conn.execute(
+                """
+                INSERT INTO users
+                (first_name, last_name, email, password_hash, phone, dob, gender, address, role, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    data.get("first_name"),
+                    data.get("last_name"),
+                    email,
+                    password_hash,
+                    data.get("phone"),
+                    data.get("dob"),
+                    data.get("gender"),
+                    data.get("address"),
+                    data.get("role"),
+                    datetime.now(),
+                    datetime.now(),
+                ),
             )
+            return True
 
-        if phone:
-            if not valid_phone(phone):
-                return False, "Phone number must be exactly 10 digits."
-
-        if not valid_dob(dob):
-            return False, "You must be at least 15 years old to register."
-
-        existing = conn.execute(
-            "SELECT id FROM users WHERE email = ?", (email,)
-        ).fetchone()
-
-        if existing:
+        if not AMSDatabase.write(_register):
             return False, "Email already exists."
-
-        conn.execute(
-            """
-            INSERT INTO users
-            (first_name, last_name, email, password_hash, phone, dob, gender, address, role, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data.get("first_name"),
-                data.get("last_name"),
-                email,
-                hash_password(password),
-                data.get("phone"),
-                data.get("dob"),
-                data.get("gender"),
-                data.get("address"),
-                data.get("role"),
-                datetime.now(),
-                datetime.now(),
-            ),
-        )
-
-        conn.commit()
-        conn.close()
+        bump_table_versions("users")
+        forget_unknown_email(email)
         return True, "Registration successful."
 
     def login_user(self, data):
-        conn = AMSDatabase.get_connection()
         email = data.get("email", "").strip().lower()
         password = data.get("password", "").strip()
+        started = time.perf_counter()
+        users_version = current_table_versions("users")
+
+        if is_unknown_email(email, users_version):
+            return self.reject_unknown_email(started)
+
+        with AMSDatabase.connection() as conn:
+            user = conn.execute(
+                """
+                SELECT u.*, a.id AS artist_id
+                FROM users u
+                LEFT JOIN artists a ON a.user_id = u.id
+                WHERE u.email = ?
+                """,
+                (email,),
+            ).fetchone()
 
-        user = conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        if not user:
+            remember_unknown_email(email, users_version)
+            return self.reject_unknown_email(started)
 
-        conn.close()
+        try:
+            valid = verify_password(password, user["password_hash"])
+        except HashingBusyError:
+            return False, LOGIN_BUSY_MESSAGE
 
-        if not user:
-            return False, "Invalid credentials."
+        if not valid:
+            return False, INVALID_CREDENTIALS_MESSAGE
 
-        if not verify_password(password, user["password_hash"]):
-            return False, "Invalid credentials."
+        if needs_rehash(user["password_hash"]):
+            password_hash = rehash_password(password)
+
+            def _rehash(conn):
+                conn.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?",
+                    (password_hash, user["id"]),
+                )
+
+            AMSDatabase.write(_rehash)
 
         return True, dict(user)
+
+    def reject_unknown_email(self, started):
+        try:
+            delay = simulate_verify(time.perf_counter() - started)
+        except HashingBusyError:
+            return False, LOGIN_BUSY_MESSAGE
+        return False, DelayedRejection(INVALID_CREDENTIALS_MESSAGE, delay)
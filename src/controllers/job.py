@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+
+from src.database.database import AMSDatabase
+from src.utils.enums import JobStatus
+
+
+class JobController:
+
+    @staticmethod
+    def create_job(kind, owner_id, params=None):
+        def _create(conn):
+            cursor = conn.execute(
+                """
+                INSERT INTO jobs (kind, owner_id, status, params, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    kind,
+                    owner_id,
+                    JobStatus.QUEUED.value,
+                    json.dumps(params or {}),
+                    datetime.now(),
+                ),
+            )
+            return cursor.lastrowid
+
+        return AMSDatabase.write(_create)
+
+    @staticmethod
+    def get_job(job_id):
+        with AMSDatabase.connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return JobController.to_dict(row)
+
+    @staticmethod
+    def to_dict(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"] or "{}")
+        return job
+
+    @staticmethod
+    def claim_next_job():
+        def _claim(conn):
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1",
+                (JobStatus.QUEUED.value,),
+            ).fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                (
+                    JobStatus.RUNNING.value,
+                    datetime.now(),
+                    row["id"],
+                    JobStatus.QUEUED.value,
+                ),
+            ).rowcount
+            if not claimed:
+                return None
+            return conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (row["id"],)
+            ).fetchone()
+
+        return JobController.to_dict(AMSDatabase.write(_claim))
+
+    @staticmethod
+    def update_progress(job_id, progress, total=None):
+        def _update(conn):
+            conn.execute(
+                "UPDATE jobs SET progress = ?, total = COALESCE(?, total) WHERE id = ?",
+                (progress, total, job_id),
+            )
+
+        AMSDatabase.write(_update)
+
+    @staticmethod
+    def finish_job(job_id, result_path=None, message=None):
+        def _finish(conn):
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = ?, result_path = ?, message = ?, finished_at = ?
+                WHERE id = ?
+                """,
+                (JobStatus.DONE.value, result_path, message, datetime.now(), job_id),
+            )
+
+        AMSDatabase.write(_finish)
+
+    @staticmethod
+    def fail_job(job_id, message):
+        def _fail(conn):
+            conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, finished_at = ? WHERE id = ?",
+                (JobStatus.FAILED.value, message, datetime.now(), job_id),
+            )
+
+        AMSDatabase.write(_fail)
+
+    @staticmethod
+    def requeue_interrupted_jobs():
+        def _requeue(conn):
+            return conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).rowcount
+
+        return AMSDatabase.write(_requeue)
+
+    @staticmethod
+    def delete_finished_jobs(finished_before):
+        def _delete(conn):
+            params = (JobStatus.DONE.value, JobStatus.FAILED.value, finished_before)
+            rows = conn.execute(
+                """
+                SELECT result_path FROM jobs
+                WHERE status IN (?, ?) AND finished_at < ?
+                """,
+                params,
+            ).fetchall()
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", params
+            )
+            return [row["result_path"] for row in rows if row["result_path"]]
+
+        return AMSDatabase.write(_delete)
@@ -1,86 +1,160 @@
 from src.database.database import AMSDatabase
+from src.utils.fragment_cache import bump_table_versions
+from src.utils.pagination import Page, encode_cursor
+
+SONG_SORTS = {
+    "newest": ("id", True),
+    "oldest": ("id", False),
+    "title": ("title", False),
+    "title_desc": ("title", True),
+}
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class SongController:
 
     @staticmethod
-    def list_songs():
-        conn = AMSDatabase.get_connection()
-        rows = conn.execute(
-            """
-            SELECT s.*, a.stage_name
-            FROM songs s
-            JOIN artists a ON s.artist_id = a.id
-        """
-        ).fetchall()
-        conn.close()
-        return rows
+    def list_artist_songs(
+        artist_id,
+        genre=None,
+        album=None,
+        title_prefix=None,
+        sort="newest",
+        after=None,
+        before=None,
+        page_size=10,
+    ):
+        column, descending = SONG_SORTS.get(sort, SONG_SORTS["newest"])
+        key_size = 1 if column == "id" else 2
+
+        filters = ["s.artist_id = ?"]
+        params = [artist_id]
+        if genre:
+            filters.append("s.genre = ?")
+            params.append(genre)
+        if album:
+            filters.append("s.album_name = ?")
+            params.append(album)
+        if title_prefix:
+            filters.append("s.title LIKE ? ESCAPE '\\'")
+            params.append(escape_like(title_prefix) + "%")
+        count_sql = f"SELECT COUNT(*) AS count FROM songs s WHERE {' AND '.join(filters)}"
+        count_params = list(params)
+
+        backwards = before is not None
+        key = before if backwards else after
+        if key is not None and len(key) != key_size:
+            key, backwards = None, False
+        ordered_desc = descending != backwards
+        op = "<" if ordered_desc else ">"
+        direction = "DESC" if ordered_desc else "ASC"
+
+        if column == "id":
+            if key is not None:
+                filters.append(f"s.id {op} ?")
+                params.append(key[0])
+            order_by = f"s.id {direction}"
+        else:
+            if key is not None:
+                filters.append(
+                    f"s.title COLLATE NOCASE {op}= ? "
+                    f"AND (s.title COLLATE NOCASE {op} ? OR s.id {op} ?)"
+                )
+                params.extend([key[0], key[0], key[1]])
+            order_by = f"s.title COLLATE NOCASE {direction}, s.id {direction}"
+
+        with AMSDatabase.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT s.*, a.stage_name
+                FROM songs s
+                JOIN artists a ON s.artist_id = a.id
+                WHERE {' AND '.join(filters)}
+                ORDER BY {order_by}
+                LIMIT ?
+                """,
+                (*params, page_size + 1),
+            ).fetchall()
+            total = conn.execute(count_sql, count_params).fetchone()["count"]
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, key is not None
+
+        def cursor_for(row):
+            if column == "id":
+                return encode_cursor(row["id"])
+            return encode_cursor(row["title"], row["id"])
+
+        next_cursor = cursor_for(rows[-1]) if rows and has_next else None
+        prev_cursor = cursor_for(rows[0]) if rows and has_prev else None
+        return Page(rows, total, next_cursor, prev_cursor)
 
     @staticmethod
-    def list_artist_song(artist_id):
-        conn = AMSDatabase.get_connection()
-        rows = conn.execute(
-            """
-            SELECT s.*, a.stage_name
-            FROM songs s
-            JOIN artists a ON s.artist_id = a.id
-            where s.artist_id=?
-        """,
-            (artist_id,),
-        ).fetchall()
-        conn.close()
-        return rows
+    def list_artist_albums(artist_id):
+        with AMSDatabase.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT album_name FROM songs WHERE artist_id = ? ORDER BY album_name",
+                (artist_id,),
+            ).fetchall()
+        return [row["album_name"] for row in rows]
 
     @staticmethod
     def create_song(data):
-        conn = AMSDatabase.get_connection()
-        conn.execute(
-            """
-            INSERT INTO songs
-            (artist_id,title,album_name,genre,created_at,updated_at)
-            VALUES (?,?,?,?,datetime('now'),datetime('now'))
-        """,
-            (
-                data["artist_id"],
-                data["title"],
-                data["album_name"],
-                data["genre"],
-            ),
-        )
-        conn.commit()
-        conn.close()
+        def _create(conn):
+            conn.execute(
+                """
+                INSERT INTO songs
+                (artist_id,title,album_name,genre,created_at,updated_at)
+                VALUES (?,?,?,?,datetime('now'),datetime('now'))
+            """,
+                (
+                    data["artist_id"],
+                    data["title"],
+                    data["album_name"],
+                    data["genre"],
+                ),
+            )
+
+        AMSDatabase.write(_create)
+        bump_table_versions("songs")
 
     @staticmethod
     def update_song(data):
-        conn = AMSDatabase.get_connection()
+        def _update(conn):
+            conn.execute(
+                """
+                UPDATE songs
+                SET title=?, album_name=?, genre=?, updated_at=datetime('now')
+                WHERE id=?
+                """,
+                (
+                    data.get("title"),
+                    data.get("album_name"),
+                    data.get("genre"),
+                    data.get("id"),
+                ),
+            )
 
-        conn.execute(
-            """
-            UPDATE songs
-            SET title=?, album_name=?, genre=?, updated_at=datetime('now')
-            WHERE id=?
-            """,
-            (
-                data.get("title"),
-                data.get("album_name"),
-                data.get("genre"),
-                data.get("id"),
-            ),
-        )
-
-        conn.commit()
-        conn.close()
+        AMSDatabase.write(_update)
+        bump_table_versions("songs")
 
     @staticmethod
     def delete_song(song_id):
-        conn = AMSDatabase.get_connection()
-        conn.execute("DELETE FROM songs WHERE id=?", (song_id,))
-        conn.commit()
-        conn.close()
+        def _delete(conn):
+            conn.execute("DELETE FROM songs WHERE id=?", (song_id,))
+
+        AMSDatabase.write(_delete)
+        bump_table_versions("songs")
 
     @staticmethod
     def get_song_by_id(song_id):
-        conn = AMSDatabase.get_connection()
-        row = conn.execute("SELECT * FROM songs WHERE id=?", (song_id,)).fetchone()
-        conn.close()
-        return row
+        with AMSDatabase.connection() as conn:
+            return conn.execute("SELECT * FROM songs WHERE id=?", (song_id,)).fetchone()
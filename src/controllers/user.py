@@ -1,26 +1,30 @@
 from src.database.database import AMSDatabase
 from datetime import datetime
+from src.utils.fragment_cache import bump_table_versions
+from src.utils.pagination import fetch_id_desc_page
 from src.utils.password import hash_password
+from src.utils.rate_limit import forget_unknown_email
+from src.utils.session import destroy_user_sessions, refresh_user_sessions
+
+SESSION_FIELDS = ("email", "role", "first_name", "last_name", "artist_id")
 
 
 class UserController:
 
     @staticmethod
-    def list_users(page=1, page_size=5):
-        conn = AMSDatabase.get_connection()
-        offset = (page - 1) * page_size
-        rows = conn.execute(
-            "SELECT * FROM users ORDER BY id DESC LIMIT ? OFFSET ?",
-            (page_size, offset),
-        ).fetchall()
-        total = conn.execute("SELECT COUNT(*) as count FROM users").fetchone()["count"]
-        conn.close()
-        return [dict(row) for row in rows], total
+    def list_users(after=None, before=None, page_size=5):
+        with AMSDatabase.connection() as conn:
+            total = AMSDatabase.row_count(conn, "users")
+            page = fetch_id_desc_page(
+                conn, "users", total, after=after, before=before, page_size=page_size
+            )
+        return page._replace(rows=[dict(row) for row in page.rows])
 
     @staticmethod
     def create_user(data):
-        conn = AMSDatabase.get_connection()
-        try:
+        password_hash = hash_password(data["password"])
+
+        def _create(conn):
             cursor = conn.execute(
                 """
                 INSERT INTO users
@@ -31,7 +35,7 @@ class UserController:
                     data["first_name"],
                     data["last_name"],
                     data["email"],
-                    hash_password(data["password"]),
+                    password_hash,
                     data["phone"],
                     data["dob"],
                     data["gender"],
@@ -59,44 +63,58 @@ class UserController:
                     ),
                 )
 
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            conn.rollback()
-            raise e
-
-        finally:
-            conn.close()
+        AMSDatabase.write(_create)
+        bump_table_versions("users", "artists")
+        forget_unknown_email(data["email"])
 
     @staticmethod
     def update_user(data):
-        conn = AMSDatabase.get_connection()
-
-        conn.execute(
-            """
-            UPDATE users
-            SET first_name=?, last_name=?, email=?, phone=?, dob=?, gender=?, address=?, role=?, updated_at=datetime('now')
-            WHERE id=?
-            """,
-            (
-                data.get("first_name"),
-                data.get("last_name"),
-                data.get("email"),
-                data.get("phone"),
-                data.get("dob"),
-                data.get("gender"),
-                data.get("address"),
-                data.get("role"),
-                data.get("id"),
-            ),
-        )
+        def _update(conn):
+            before = conn.execute(
+                """
+                SELECT u.*, a.id AS artist_id
+                FROM users u
+                LEFT JOIN artists a ON a.user_id = u.id
+                WHERE u.id = ?
+                """,
+                (data.get("id"),),
+            ).fetchone()
+            conn.execute(
+                """
+                UPDATE users
+                SET first_name=?, last_name=?, email=?, phone=?, dob=?, gender=?, address=?, role=?, updated_at=datetime('now')
+                WHERE id=?
+                """,
+                (
+                    data.get("first_name"),
+                    data.get("last_name"),
+                    data.get("email"),
+                    data.get("phone"),
+                    data.get("dob"),
+                    data.get("gender"),
+                    data.get("address"),
+                    data.get("role"),
+                    data.get("id"),
+                ),
+            )
+            if before is None:
+                return {}
+            return {
+                field: data.get(field)
+                for field in SESSION_FIELDS
+                if field in data and data.get(field) != before[field]
+            }
 
-        conn.commit()
-        conn.close()
+        changes = AMSDatabase.write(_update)
+        bump_table_versions("users")
+        forget_unknown_email(data.get("email"))
+        refresh_user_sessions(data.get("id"), changes)
 
     @staticmethod
     def delete_user(user_id):
-        conn = AMSDatabase.get_connection()
-        conn.execute("DELETE FROM users WHERE id=?", (user_id,))
-        conn.commit()
-        conn.close()
+        def _delete(conn):
+            conn.execute("DELETE FROM users WHERE id=?", (user_id,))
+
+        AMSDatabase.write(_delete)
+        bump_table_versions("users", "artists", "songs")
+        destroy_user_sessions(user_id)
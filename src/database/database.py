@@ -1,5 +1,391 @@
+import contextvars
 import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from src.database.query_trace import TracedConnection
+
+PERFORMANCE_PROFILES = {
+    "default": {
+        "pragmas": {},
+        "write_queue": False,
+    },
+    "wal": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 268435456,
+            "cache_size": -16000,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+        },
+        "write_queue": True,
+    },
+}
+
+DATABASE_PRAGMAS = {"journal_mode"}
+
+SCHEMA_MIGRATIONS = [
+    (
+        1,
+        """
+        CREATE INDEX IF NOT EXISTS idx_songs_artist_id ON songs(artist_id);
+        CREATE INDEX IF NOT EXISTS idx_songs_genre ON songs(genre);
+        CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+        """,
+    ),
+    (
+        2,
+        """
+        CREATE TABLE IF NOT EXISTS row_counts (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL DEFAULT 0
+        );
+
+        INSERT OR REPLACE INTO row_counts (table_name, row_count)
+        SELECT 'users', COUNT(*) FROM users
+        UNION ALL SELECT 'artists', COUNT(*) FROM artists
+        UNION ALL SELECT 'songs', COUNT(*) FROM songs;
+
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_insert AFTER INSERT ON users
+        BEGIN UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'users'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_users_count_delete AFTER DELETE ON users
+        BEGIN UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'users'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_artists_count_insert AFTER INSERT ON artists
+        BEGIN UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'artists'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_artists_count_delete AFTER DELETE ON artists
+        BEGIN UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'artists'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_songs_count_insert AFTER INSERT ON songs
+        BEGIN UPDATE row_counts SET row_count = row_count + 1 WHERE table_name = 'songs'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_songs_count_delete AFTER DELETE ON songs
+        BEGIN UPDATE row_counts SET row_count = row_count - 1 WHERE table_name = 'songs'; END;
+        """,
+    ),
+    (
+        3,
+        """
+        CREATE INDEX IF NOT EXISTS idx_songs_artist_genre ON songs(artist_id, genre);
+        CREATE INDEX IF NOT EXISTS idx_songs_artist_album ON songs(artist_id, album_name);
+        CREATE INDEX IF NOT EXISTS idx_songs_artist_title ON songs(artist_id, title COLLATE NOCASE);
+        """,
+    ),
+    (
+        4,
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            owner_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'done', 'failed')),
+            params TEXT NOT NULL DEFAULT '{}',
+            progress INTEGER NOT NULL DEFAULT 0,
+            total INTEGER,
+            result_path TEXT,
+            message TEXT,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started_at TEXT,
+            finished_at TEXT,
+            FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+        """,
+    ),
+    (
+        5,
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID;
+        """,
+    ),
+    (
+        6,
+        """
+        ALTER TABLE sessions ADD COLUMN expires_at REAL NOT NULL DEFAULT 0;
+        UPDATE sessions SET expires_at = CAST(strftime('%s', 'now') AS INTEGER) + 28800;
+        CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
+        """,
+    ),
+    (
+        7,
+        """
+        CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
+        """,
+    ),
+    (
+        8,
+        """
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+
+        INSERT OR IGNORE INTO table_versions (table_name)
+        VALUES ('users'), ('artists'), ('songs');
+
+        CREATE TRIGGER IF NOT EXISTS trg_users_version_insert AFTER INSERT ON users
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'users'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_users_version_update AFTER UPDATE ON users
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'users'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_users_version_delete AFTER DELETE ON users
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'users'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_artists_version_insert AFTER INSERT ON artists
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'artists'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_artists_version_update AFTER UPDATE ON artists
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'artists'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_artists_version_delete AFTER DELETE ON artists
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'artists'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_songs_version_insert AFTER INSERT ON songs
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'songs'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_songs_version_update AFTER UPDATE ON songs
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'songs'; END;
+        CREATE TRIGGER IF NOT EXISTS trg_songs_version_delete AFTER DELETE ON songs
+        BEGIN UPDATE table_versions SET version = version + 1 WHERE table_name = 'songs'; END;
+        """,
+    ),
+    (
+        9,
+        """
+        INSERT OR IGNORE INTO table_versions (table_name) VALUES ('sessions');
+        """,
+    ),
+]
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, max_connections=16, timeout=10.0, health_check_interval=30.0):
+        self._connect = connect
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "reused": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "discarded": 0,
+        }
+
+    @contextmanager
+    def connection(self):
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            local.depth += 1
+            try:
+                yield conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self._acquire()
+        local.conn = conn
+        local.depth = 1
+        try:
+            yield conn
+        finally:
+            local.conn = None
+            local.depth = 0
+            self._release(conn)
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.timeout
+        preferred = getattr(self._local, "last", None)
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed.")
+
+                if self._idle:
+                    entry = self._take_idle(preferred)
+                    self._stats["checkouts"] += 1
+                    self._stats["reused"] += 1
+                    break
+
+                if self._size < self.max_connections:
+                    self._size += 1
+                    entry = None
+                    self._stats["checkouts"] += 1
+                    self._stats["created"] += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s."
+                    )
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+        if entry is None:
+            conn = self._open()
+        else:
+            conn = self._ensure_healthy(*entry)
+
+        self._local.last = conn
+        return conn
+
+    def _take_idle(self, preferred):
+        if preferred is not None:
+            for index, entry in enumerate(self._idle):
+                if entry[0] is preferred:
+                    return self._idle.pop(index)
+        return self._idle.pop()
+
+    def _open(self):
+        try:
+            return self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _ensure_healthy(self, conn, last_used):
+        if time.monotonic() - last_used < self.health_check_interval:
+            return conn
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return conn
+        except sqlite3.Error:
+            self._discard(conn)
+            with self._cond:
+                self._size += 1
+                self._stats["created"] += 1
+            return self._open()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def _release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            return self._discard(conn)
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                conn.close()
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+            stats["max_connections"] = self.max_connections
+        return stats
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            conn.close()
+
+
+class WriteQueue:
+
+    def __init__(self, connect):
+        self._connect = connect
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"writes": 0, "failures": 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ams-db-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, fn):
+        future = Future()
+        if threading.current_thread() is self._thread:
+            future.set_result(fn(self._conn))
+            return future
+        self.start()
+        self._queue.put((contextvars.copy_context(), fn, future))
+        return future
+
+    def _run(self):
+        self._conn = self._connect()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            context, fn, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = context.run(self._apply, fn)
+                self.count("writes")
+                future.set_result(result)
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                self.count("failures")
+                future.set_exception(e)
+        self._conn.close()
+
+    def _apply(self, fn):
+        self._conn.execute("BEGIN IMMEDIATE")
+        result = fn(self._conn)
+        self._conn.commit()
+        return result
+
+    def count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
 
 
 class AMSDatabase:
@@ -7,14 +393,121 @@ class AMSDatabase:
     DB_PATH = os.path.join(BASE_DIR, "ams.db")
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+    POOL_SIZE = 16
+    POOL_TIMEOUT = 10.0
+    PROFILE = "wal"
+
+    _pool = None
+    _pool_lock = threading.Lock()
+    _writer = None
+    _connection_hooks = []
+
+    @classmethod
+    def get_profile(cls):
+        return PERFORMANCE_PROFILES[cls.PROFILE]
+
     @classmethod
     def get_connection(cls):
-        conn = sqlite3.connect(cls.DB_PATH)
+        conn = sqlite3.connect(
+            cls.DB_PATH, check_same_thread=False, factory=TracedConnection
+        )
         conn.row_factory = sqlite3.Row
+        for name, value in cls.get_profile()["pragmas"].items():
+            if name not in DATABASE_PRAGMAS:
+                conn.execute(f"PRAGMA {name}={value}")
+        for hook in cls._connection_hooks:
+            hook(conn)
         return conn
 
-    def init_db(self):
-        with self.get_connection() as conn:
+    @classmethod
+    def add_connection_hook(cls, hook):
+        cls._connection_hooks.append(hook)
+
+    @classmethod
+    def remove_connection_hook(cls, hook):
+        cls._connection_hooks.remove(hook)
+
+    @classmethod
+    def get_pool(cls):
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    cls._pool = ConnectionPool(
+                        cls.get_connection,
+                        max_connections=cls.POOL_SIZE,
+                        timeout=cls.POOL_TIMEOUT,
+                    )
+        return cls._pool
+
+    @classmethod
+    def connection(cls):
+        return cls.get_pool().connection()
+
+    @classmethod
+    def pool_stats(cls):
+        return cls.get_pool().stats()
+
+    @classmethod
+    def close_pool(cls):
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.close()
+
+    @staticmethod
+    def row_count(conn, table):
+        row = conn.execute(
+            "SELECT row_count FROM row_counts WHERE table_name = ?", (table,)
+        ).fetchone()
+        return row["row_count"] if row else 0
+
+    @classmethod
+    def write(cls, fn):
+        if not cls.get_profile()["write_queue"]:
+            with cls.connection() as conn:
+                try:
+                    result = fn(conn)
+                    conn.commit()
+                    return result
+                except Exception as e:
+                    conn.rollback()
+                    raise e
+
+        if cls._writer is None:
+            with cls._pool_lock:
+                if cls._writer is None:
+                    cls._writer = WriteQueue(cls.get_connection)
+        return cls._writer.submit(fn).result()
+
+    @classmethod
+    def write_stats(cls):
+        if cls._writer is None:
+            return {"writes": 0, "failures": 0, "queued": 0}
+        return cls._writer.stats()
+
+    @classmethod
+    def reset_after_fork(cls):
+        cls._pool = None
+        cls._pool_lock = threading.Lock()
+        cls._writer = None
+
+    @classmethod
+    def shutdown(cls):
+        with cls._pool_lock:
+            writer, cls._writer = cls._writer, None
+        if writer is not None:
+            writer.stop()
+        cls.close_pool()
+
+    def init_db(self, profile=None):
+        if profile is not None:
+            AMSDatabase.PROFILE = profile
+            AMSDatabase.close_pool()
+
+        pragmas = self.get_profile()["pragmas"]
+        with self.connection() as conn:
+            for name in DATABASE_PRAGMAS & pragmas.keys():
+                conn.execute(f"PRAGMA {name}={pragmas[name]}")
             cursor = conn.cursor()
             cursor.executescript(
                 """
@@ -57,3 +550,18 @@ class AMSDatabase:
 
             """
             )
+            self.migrate(conn)
+
+    def migrate(self, conn):
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, script in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            conn.executescript(
+                f"BEGIN; {script} PRAGMA user_version = {target}; COMMIT;"
+            )
+            version = target
+        return version
+
+
+os.register_at_fork(after_in_child=AMSDatabase.reset_after_fork)
@@ -0,0 +1,297 @@
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+
+from src.utils.metrics import current_request, record_sql
+
+SLOW_QUERY_MS = float(os.environ.get("AMS_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.environ.get("AMS_SLOW_QUERY_LOG", "")
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("AMS_N_PLUS_ONE_THRESHOLD", "5"))
+MAX_TRACKED_STATEMENTS = 1000
+OTHER_STATEMENTS = "(other)"
+TOP_STATEMENTS = 20
+TRACE_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "database.py"),
+)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(sql):
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = WHITESPACE.sub(" ", sql).strip()
+    return PLACEHOLDER_LIST.sub("?, ...", sql)
+
+
+def find_caller():
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in TRACE_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class Execution:
+    __slots__ = ("statement", "sql", "parameters", "elapsed", "rows", "logged")
+
+    def __init__(self, statement, sql, parameters):
+        self.statement = statement
+        self.sql = sql
+        self.parameters = parameters
+        self.elapsed = 0.0
+        self.rows = 0
+        self.logged = False
+
+
+class QueryTracer:
+
+    def __init__(
+        self,
+        slow_query_ms=SLOW_QUERY_MS,
+        n_plus_one_threshold=N_PLUS_ONE_THRESHOLD,
+        log_path=SLOW_QUERY_LOG,
+        max_statements=MAX_TRACKED_STATEMENTS,
+    ):
+        self.slow_query_time = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.log_path = log_path
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._plans = {}
+        self._stats = {"slow_queries": 0, "n_plus_one": 0}
+
+    def executed(self, conn, sql, parameters, elapsed, many=False):
+        statement = normalize_statement(sql)
+        execution = Execution(statement, sql, None if many else parameters)
+        record_sql(elapsed)
+        self.update(statement, elapsed, executions=1)
+
+        request = current_request()
+        if request is not None and statement.startswith("SELECT"):
+            count = request.statements.get(statement, 0) + 1
+            request.statements[statement] = count
+            if count == self.n_plus_one_threshold:
+                self.report_n_plus_one(statement, count, request)
+
+        self.add_time(conn, execution, elapsed)
+        return execution
+
+    def fetched(self, conn, execution, rows, elapsed):
+        if execution is None:
+            return
+        record_sql(elapsed, queries=0)
+        execution.rows += rows
+        self.update(execution.statement, elapsed, rows=rows)
+        self.add_time(conn, execution, elapsed)
+
+    def add_time(self, conn, execution, elapsed):
+        execution.elapsed += elapsed
+        if execution.elapsed >= self.slow_query_time and not execution.logged:
+            execution.logged = True
+            self.report_slow(conn, execution)
+
+    def update(self, statement, elapsed, executions=0, rows=0):
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    statement = OTHER_STATEMENTS
+                stats = self._statements.setdefault(statement, [0, 0.0, 0.0, 0])
+            stats[0] += executions
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            stats[3] += rows
+
+    def explain(self, conn, execution):
+        plan = self._plans.get(execution.statement)
+        if plan is not None or execution.parameters is None:
+            return plan
+        try:
+            rows = sqlite3.Connection.execute(
+                conn, f"EXPLAIN QUERY PLAN {execution.sql}", execution.parameters
+            ).fetchall()
+        except sqlite3.Error as e:
+            return [f"unavailable: {e}"]
+        plan = [row[3] for row in rows]
+        with self._lock:
+            if len(self._plans) < self.max_statements:
+                self._plans[execution.statement] = plan
+        return plan
+
+    def report_slow(self, conn, execution):
+        with self._lock:
+            self._stats["slow_queries"] += 1
+        request = current_request()
+        where = f" in {request.method} {request.route}" if request is not None else ""
+        lines = [
+            f"[slow query] {execution.elapsed * 1000:.1f} ms, {execution.rows} rows"
+            f"{where}: {execution.statement}"
+        ]
+        for detail in self.explain(conn, execution) or ():
+            lines.append(f"    plan: {detail}")
+        self.log(lines)
+
+    def report_n_plus_one(self, statement, count, request):
+        with self._lock:
+            self._stats["n_plus_one"] += 1
+        caller = find_caller()
+        source = f" from {caller}" if caller else ""
+        self.log(
+            [
+                f"[n+1 query] {request.method} {request.route} ran {count}+ times"
+                f"{source}: {statement}"
+            ]
+        )
+
+    def log(self, lines):
+        text = "\n".join(lines) + "\n"
+        if not self.log_path:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def stats(self):
+        with self._lock:
+            statements = [
+                (statement, list(values))
+                for statement, values in self._statements.items()
+            ]
+            stats = dict(self._stats)
+        statements.sort(key=lambda item: item[1][1], reverse=True)
+        stats["statements"] = len(statements)
+        stats["executions"] = sum(values[0] for _, values in statements)
+        stats["rows"] = sum(values[3] for _, values in statements)
+        stats["top"] = [
+            {
+                "sql": statement,
+                "executions": executions,
+                "total_ms": round(total * 1000, 2),
+                "max_ms": round(slowest * 1000, 2),
+                "rows": rows,
+            }
+            for statement, (executions, total, slowest, rows) in statements[
+                :TOP_STATEMENTS
+            ]
+        ]
+        return stats
+
+
+class TracedCursor(sqlite3.Cursor):
+    execution = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.execution = query_tracer.executed(
+                self.connection, sql, parameters, time.perf_counter() - started
+            )
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.execution = query_tracer.executed(
+                self.connection,
+                sql,
+                None,
+                time.perf_counter() - started,
+                many=True,
+            )
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            query_tracer.fetched(
+                self.connection, self.execution, 0, time.perf_counter() - started
+            )
+            raise
+        query_tracer.fetched(
+            self.connection, self.execution, 1, time.perf_counter() - started
+        )
+        return row
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        query_tracer.fetched(
+            self.connection,
+            self.execution,
+            0 if row is None else 1,
+            time.perf_counter() - started,
+        )
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        query_tracer.fetched(
+            self.connection, self.execution, len(rows), time.perf_counter() - started
+        )
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        query_tracer.fetched(
+            self.connection, self.execution, len(rows), time.perf_counter() - started
+        )
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        cursor = self.cursor()
+        cursor.execute(sql, parameters)
+        return cursor
+
+    def executemany(self, sql, seq_of_parameters):
+        cursor = self.cursor()
+        cursor.executemany(sql, seq_of_parameters)
+        return cursor
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            record_sql(time.perf_counter() - started, queries=0)
+
+
+query_tracer = None
+
+
+def query_stats():
+    return query_tracer.stats()
+
+
+def reset_query_tracer():
+    global query_tracer
+    query_tracer = QueryTracer()
+
+
+reset_query_tracer()
+os.register_at_fork(after_in_child=reset_query_tracer)
@@ -0,0 +1,186 @@
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+GRACEFUL_TIMEOUT = 30.0
+MIN_WORKER_UPTIME = 2.0
+RESPAWN_DELAY = 1.0
+SUPERVISOR_TICK = 0.5
+PARENT_CHECK_INTERVAL = 1.0
+LISTEN_BACKLOG = 1024
+SUPERVISOR_SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+
+
+def watch_parent(parent_pid, interval=PARENT_CHECK_INTERVAL):
+    def check():
+        while os.getppid() == parent_pid:
+            time.sleep(interval)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    threading.Thread(target=check, name="ams-parent-watch", daemon=True).start()
+
+
+def create_listener(port, host=""):
+    sock = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+
+    def __init__(
+        self,
+        worker_target,
+        workers,
+        service_targets=(),
+        prepare_target=None,
+        graceful_timeout=GRACEFUL_TIMEOUT,
+    ):
+        self.worker_target = worker_target
+        self.workers = workers
+        self.service_targets = list(service_targets)
+        self.prepare_target = prepare_target
+        self.graceful_timeout = graceful_timeout
+        self.children = {}
+        self.retiring = set()
+        self.deadlines = {}
+        self._signals = []
+        self._stopping = False
+
+    def slots(self):
+        return [("http", index) for index in range(self.workers)] + [
+            ("service", index) for index in range(len(self.service_targets))
+        ]
+
+    def target_for(self, slot):
+        kind, index = slot
+        if kind == "service":
+            return self.service_targets[index]
+        return self.worker_target
+
+    def run(self):
+        for signum in SUPERVISOR_SIGNALS:
+            signal.signal(signum, self._on_signal)
+        if not self.prepare():
+            print("Prepare step failed, not starting workers.")
+            return
+        for slot in self.slots():
+            self.spawn(slot)
+
+        while self.children or self.retiring:
+            self.handle_signals()
+            self.reap()
+            self.kill_overdue()
+            time.sleep(SUPERVISOR_TICK)
+
+    def _on_signal(self, signum, frame):
+        self._signals.append(signum)
+
+    def handle_signals(self):
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum == signal.SIGHUP and not self._stopping:
+                self.reload()
+            elif signum in (signal.SIGTERM, signal.SIGINT):
+                self.stop()
+
+    def fork(self, target):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        parent_pid = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            for signum in SUPERVISOR_SIGNALS:
+                signal.signal(signum, signal.SIG_DFL)
+            watch_parent(parent_pid)
+            code = 0
+            try:
+                target()
+            except KeyboardInterrupt:
+                pass
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        return pid
+
+    def prepare(self):
+        if self.prepare_target is None:
+            return True
+        pid = self.fork(self.prepare_target)
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) == 0
+
+    def spawn(self, slot):
+        pid = self.fork(self.target_for(slot))
+        self.children[pid] = (slot, time.monotonic())
+        print(f"Started {slot[0]} worker {slot[1]} (pid {pid})")
+        return pid
+
+    def terminate(self, pid):
+        self.deadlines[pid] = time.monotonic() + self.graceful_timeout
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def reload(self):
+        if not self.prepare():
+            print("Prepare step failed, keeping the current workers.")
+            return
+        print("Reloading workers.")
+        for pid, (slot, _) in list(self.children.items()):
+            if slot[0] == "http":
+                self.spawn(slot)
+                del self.children[pid]
+                self.retiring.add(pid)
+            self.terminate(pid)
+
+    def stop(self):
+        if self._stopping:
+            return
+        print("Stopping workers.")
+        self._stopping = True
+        for pid in list(self.children) + list(self.retiring):
+            self.terminate(pid)
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            self.deadlines.pop(pid, None)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                continue
+            slot, started = self.children.pop(pid, (None, 0))
+            if slot is None or self._stopping:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            print(f"{slot[0]} worker {slot[1]} (pid {pid}) exited with {code}, restarting.")
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(RESPAWN_DELAY)
+            self.spawn(slot)
+
+    def kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self.deadlines.items()):
+            if now < deadline:
+                continue
+            del self.deadlines[pid]
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
@@ -1,56 +1,253 @@
 import cgi
-import csv
 import html
+import json
+import math
 import os
+import shutil
+import socket
+import threading
+import time
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler
-from io import StringIO
 from urllib.parse import parse_qs, urlencode, urlparse
 
-from src.controllers.artist import ArtistController
-from src.controllers.auth import AuthController
-from src.controllers.song import SongController
+from src.controllers.artist import EXPORT_COLUMNS, ArtistController
+from src.controllers.auth import LOGIN_BUSY_MESSAGE, AuthController
+from src.controllers.job import JobController
+from src.controllers.song import SONG_SORTS, SongController
 from src.controllers.user import UserController
-from src.utils.enums import Role
+from src.database.database import AMSDatabase
+from src.database.query_trace import query_stats
+from src.utils.compression import (
+    compress_responses,
+    compression_stats,
+    default_compressor,
+)
+from src.utils.enums import Genre, JobKind, JobStatus, Role
+from src.utils.fragment_cache import cached_fragments, fragment_stats
+from src.utils.metrics import (
+    metrics_authorized,
+    profiling_stats,
+    record_response_delay,
+    render_metrics,
+    track_request,
+)
+from src.utils.pagination import decode_cursor, decode_id_cursor
+from src.utils.password import hashing_stats
+from src.utils.rate_limit import throttle_login, throttle_register, throttle_stats
 from src.utils.session import (
     SESSION_COOKIE_NAME,
     create_session,
     destroy_session,
     get_session_id,
     get_user_from_session,
-    require_login,
 )
-from src.utils.template import parse_post_body, render_template
+from src.utils.router import Router
+from src.utils.static import default_static
+from src.utils.stream import gzip_stream, iter_csv
+from src.utils.template import (
+    FLUSH,
+    parse_post_body,
+    render_template,
+    stream_template,
+)
 from src.utils.validate import (
     validate_artist_create_form,
     validate_user_create_form,
 )
+from src.worker import enqueue_job, save_job_upload
 
 artist_controller = ArtistController()
 auth_controller = AuthController()
+job_controller = JobController()
 song_controller = SongController()
 user_controller = UserController()
 
 PAGE_SIZE = 2
+SONG_PAGE_SIZE = 10
+STREAM_CHUNK_SIZE = 16 * 1024
+MAX_INLINE_DELAYS = 32
+
+inline_delay_slots = threading.BoundedSemaphore(MAX_INLINE_DELAYS)
+
+router = Router(middleware=[compress_responses])
+
+
+def login_required(handler):
+    def guarded(request, **params):
+        if not request.user:
+            request.discard_unread_body()
+            return request.redirect("/login")
+        return handler(request, **params)
+
+    return guarded
+
+
+def anonymous_only(handler):
+    def guarded(request, **params):
+        if request.user:
+            request.discard_unread_body()
+            return request.redirect("/dashboard")
+        return handler(request, **params)
+
+    return guarded
+
+
+def role_required(*roles, message="Forbidden"):
+    def middleware(handler):
+        def guarded(request, **params):
+            if not request.has_role(request.user, *roles):
+                request.discard_unread_body()
+                return request.forbidden(message)
+            return handler(request, **params)
+
+        return guarded
+
+    return middleware
 
 
 class AMSRequestHandler(BaseHTTPRequestHandler):
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    response_encoding = None
+    request_metrics = None
+
+    def send_response(self, code, message=None):
+        if self.request_metrics is not None:
+            self.request_metrics.status = int(code)
+        super().send_response(code, message)
+
+    def send_body(
+        self, body, status=HTTPStatus.OK, content_type="text/html; charset=utf-8"
+    ):
+        encoding = None
+        compressible = default_compressor.compressible(content_type)
+        if compressible and self.response_encoding:
+            compressed = default_compressor.compress(body, self.response_encoding)
+            if compressed is not None:
+                body, encoding = compressed, self.response_encoding
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def send_html(self, html_text, status=HTTPStatus.OK):
+        self.send_body(html_text.encode("utf-8"), status)
+
+    def send_stream(
+        self,
+        chunks,
+        status=HTTPStatus.OK,
+        content_type="text/html; charset=utf-8",
+        headers=None,
+    ):
+        chunked = self.request_version != "HTTP/1.0"
+        compressible = default_compressor.compressible(content_type)
+        if compressible and self.response_encoding:
+            chunks = default_compressor.compress_stream(chunks, self.response_encoding)
         self.send_response(status)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Type", content_type)
+        if compressible:
+            self.send_header("Vary", "Accept-Encoding")
+            if self.response_encoding:
+                self.send_header("Content-Encoding", self.response_encoding)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
         self.end_headers()
-        self.wfile.write(html_text.encode("utf-8"))
+
+        def write(data, last=False):
+            if chunked:
+                data = b"%X\r\n%s\r\n" % (len(data), data) if data else b""
+                if last:
+                    data += b"0\r\n\r\n"
+            if data:
+                self.wfile.write(data)
+
+        buffer = []
+        buffered = 0
+        try:
+            for piece in chunks:
+                if piece is FLUSH:
+                    write(b"".join(buffer))
+                    buffer, buffered = [], 0
+                    self.wfile.flush()
+                    continue
+                data = piece.encode("utf-8") if isinstance(piece, str) else piece
+                buffer.append(data)
+                buffered += len(data)
+                if buffered >= STREAM_CHUNK_SIZE:
+                    write(b"".join(buffer))
+                    buffer, buffered = [], 0
+            write(b"".join(buffer), last=True)
+        except Exception:
+            self.close_connection = True
+            raise
+
+    def send_file(self, f, size):
+        sendfile = getattr(self.wfile, "sendfile", None)
+        if sendfile is not None:
+            return sendfile(f, size)
+        if isinstance(self.request, socket.socket):
+            self.wfile.flush()
+            return self.request.sendfile(f, 0, size)
+        shutil.copyfileobj(f, self.wfile, STREAM_CHUNK_SIZE)
 
     def redirect(self, target):
         self.send_response(HTTPStatus.SEE_OTHER)
         self.send_header("Location", target)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
+    def redirect_permanently(self, target):
+        self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+        self.send_header("Location", target)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def delay_response(self, seconds):
+        record_response_delay(seconds)
+        defer = getattr(self.wfile, "defer", None)
+        if defer is not None:
+            defer(seconds)
+            return True
+        if not inline_delay_slots.acquire(blocking=False):
+            return False
+        try:
+            time.sleep(seconds)
+        finally:
+            inline_delay_slots.release()
+        return True
+
     def forbidden(self, message="Forbidden"):
         self.send_html(f"<h3>{message}</h3>", status=HTTPStatus.FORBIDDEN)
 
+    def too_many_requests(self, retry_after):
+        body = b"<h3>Too many attempts. Please wait a moment and try again.</h3>"
+        self.send_response(HTTPStatus.TOO_MANY_REQUESTS)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Retry-After", str(math.ceil(retry_after)))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def throttled(self, throttle, form):
+        email = form.get("email", "").strip().lower()
+        retry_after = throttle(self.client_address[0], email)
+        if retry_after:
+            self.too_many_requests(retry_after)
+        return retry_after
+
     def not_found(self, message="Nothing matches the given URI.", path=None):
         user = get_user_from_session(self)
         back_href = "/dashboard" if user else "/login"
@@ -74,6 +271,13 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
             return 1
         return max(1, page)
 
+    def get_page_cursor(self, qs, decode=decode_id_cursor):
+        after = decode(self.get_query_value(qs, "after"))
+        before = decode(self.get_query_value(qs, "before"))
+        if after is None and before is None:
+            return 1, None, None
+        return self.get_page(qs), after, before
+
     def get_query_value(self, qs, key):
         value = qs.get(key, [""])[0]
         return value.strip()
@@ -96,18 +300,118 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
         separator = "&" if "?" in path else "?"
         return self.redirect(f"{path}{separator}{urlencode(params)}")
 
-    def build_pagination(self, base_path, page, total_count):
-        total_pages = max(1, (total_count + PAGE_SIZE - 1) // PAGE_SIZE)
+    def get_song_filters(self, qs):
+        genre = self.get_query_value(qs, "genre")
+        sort = self.get_query_value(qs, "sort")
+        return {
+            "genre": genre if genre in Genre._value2member_map_ else "",
+            "album": self.get_query_value(qs, "album"),
+            "q": self.get_query_value(qs, "q"),
+            "sort": sort if sort in SONG_SORTS else "newest",
+        }
+
+    def get_export_columns(self, requested):
+        columns = list(
+            dict.fromkeys(name.strip() for name in requested.split(",") if name.strip())
+        ) or list(EXPORT_COLUMNS)
+        unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+        return columns, unknown
+
+    def can_access_job(self, user, job):
+        return bool(
+            job
+            and (
+                job["owner_id"] == user.get("id")
+                or user.get("role") == Role.SUPER_ADMIN.value
+            )
+        )
+
+    def wants_json(self, qs):
+        return self.get_query_value(
+            qs, "format"
+        ) == "json" or "application/json" in self.headers.get("Accept", "")
+
+    def send_json(self, payload, status=HTTPStatus.OK):
+        self.send_body(
+            json.dumps(payload).encode("utf-8"), status, content_type="application/json"
+        )
+
+    def render_job_status(self, user, job):
+        finished = job["status"] in (JobStatus.DONE.value, JobStatus.FAILED.value)
+        message = ""
+        if job["message"]:
+            level = "error" if job["status"] == JobStatus.FAILED.value else "success"
+            message = self.build_alert_html(job["message"], level)
+        download = ""
+        if job["status"] == JobStatus.DONE.value and job["result_path"]:
+            download = f'<a href="/jobs/{job["id"]}/download" class="btn btn-update">Download</a>'
+        content = render_template(
+            "job_status.html",
+            refresh="" if finished else '<meta http-equiv="refresh" content="2">',
+            job_id=job["id"],
+            kind=html.escape(job["kind"]),
+            status=job["status"],
+            progress=job["progress"],
+            total=job["total"] or 0,
+            message=message,
+            download=download,
+        )
+        return self.render_base(user, content, artists_active="active")
+
+    def build_song_filter_form(self, artist_id, filters, albums):
+        def options(values, selected, blank_label=None):
+            items = []
+            if blank_label is not None:
+                items.append(f'<option value="">{blank_label}</option>')
+            for value in values:
+                is_selected = "selected" if value == selected else ""
+                safe_value = html.escape(value)
+                items.append(
+                    f'<option value="{safe_value}" {is_selected}>{safe_value}</option>'
+                )
+            return "".join(items)
+
+        return f"""
+        <form method="get" action="/artists/{artist_id}/songs" class="song-filter-form">
+            <input type="text" name="q" class="form-input" placeholder="Title starts with" value="{html.escape(filters['q'])}">
+            <select name="genre" class="form-select">{options([g.value for g in Genre], filters['genre'], "All genres")}</select>
+            <select name="album" class="form-select">{options(albums, filters['album'], "All albums")}</select>
+            <select name="sort" class="form-select">{options(list(SONG_SORTS), filters['sort'])}</select>
+            <button type="submit" class="btn btn-update">Filter</button>
+        </form>
+        """
+
+    def build_pagination(
+        self,
+        base_path,
+        page,
+        total_count,
+        next_cursor=None,
+        prev_cursor=None,
+        page_size=PAGE_SIZE,
+    ):
+        total_pages = max(1, (total_count + page_size - 1) // page_size)
+        page = min(page, total_pages)
         prev_page = max(1, page - 1)
         next_page = min(total_pages, page + 1)
-        prev_disabled = "disabled" if page <= 1 else ""
-        next_disabled = "disabled" if page >= total_pages else ""
+        prev_disabled = "disabled" if not prev_cursor else ""
+        next_disabled = "disabled" if not next_cursor else ""
+        prev_href = (
+            f"{base_path}&before={prev_cursor}&page={prev_page}"
+            if prev_cursor
+            else base_path
+        )
+        next_href = (
+            f"{base_path}&after={next_cursor}&page={next_page}"
+            if next_cursor
+            else base_path
+        )
 
         return f"""
         <div class="pagination">
-            <a class="page-btn {prev_disabled}" href="{base_path}&page={prev_page}">Previous</a>
+            <a class="page-btn {prev_disabled}" href="{prev_href}">Previous</a>
             <span class="page-meta">Page {page} of {total_pages}</span>
-            <a class="page-btn {next_disabled}" href="{base_path}&page={next_page}">Next</a>
+            <a class="page-btn {next_disabled}" href="{next_href}">Next</a>
         </div>
         """
 
@@ -121,11 +425,17 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
         if role in (Role.SUPER_ADMIN.value, Role.ARTIST_MANAGER.value):
             return True
         if role == Role.ARTIST.value:
-            artist = artist_controller.get_artist_by_user_id(user.get("id"))
-            return bool(artist and str(artist["id"]) == str(artist_id))
+            own_artist_id = self.get_own_artist_id(user)
+            return own_artist_id is not None and str(own_artist_id) == str(artist_id)
         return False
 
-    def render_base(self, user, content, users_active="", artists_active=""):
+    def get_own_artist_id(self, user):
+        if "artist_id" in user:
+            return user["artist_id"]
+        artist = artist_controller.get_artist_by_user_id(user.get("id"))
+        return artist["id"] if artist else None
+
+    def base_context(self, user, content, users_active="", artists_active=""):
         role = user.get("role")
 
         users_tab = ""
@@ -142,60 +452,96 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
 
         user_info = f"{full_name} ({full_role})"
 
+        return {
+            "title": "Dashboard",
+            "content": content,
+            "users_tab": users_tab,
+            "artists_tab": artists_tab,
+            "user_info": user_info,
+        }
+
+    def render_base(self, user, content, users_active="", artists_active=""):
         return render_template(
             "base.html",
-            title="Dashboard",
-            content=content,
-            users_tab=users_tab,
-            artists_tab=artists_tab,
-            user_info=user_info,
+            **self.base_context(user, content, users_active, artists_active),
         )
 
-    def render_users_tab(self, user, page, error_message="", success_message=""):
+    def stream_base(self, user, content, users_active="", artists_active=""):
+        return stream_template(
+            "base.html",
+            **self.base_context(user, content, users_active, artists_active),
+        )
+
+    def render_user_row(self, index, u):
+        return f"""
+        <tr>
+            <form method="post" action="/users/update" style="display: inline;">
+                <input type="hidden" name="id" value="{u['id']}">
+                <td>{index}</td>
+                <td><input type="text" class="table-input" value="{u['first_name']}" name="first_name"></td>
+                <td><input type="text" class="table-input" value="{u['last_name']}" name="last_name"></td>
+                <td><input type="text" class="table-input" value="{u['email']}" name="email"></td>
+                <td><input type="text" class="table-input" value="{u['phone']}" name="phone"></td>
+                <td><input type="date" class="table-input" value="{u['dob']}" name="dob"></td>
+                <td>
+                    <select class="table-select" name="gender">
+                        <option value="m" {'selected' if u['gender'] == 'm' else ''}>m</option>
+                        <option value="f" {'selected' if u['gender'] == 'f' else ''}>f</option>
+                        <option value="o" {'selected' if u['gender'] == 'o' else ''}>o</option>
+                    </select>
+                </td>
+                <td><input type="text" class="table-input" value="{u['address']}" name="address"></td>
+                <td>
+                    <select class="table-select" name="role">
+                        <option value="super_admin" {'selected' if u['role'] == 'super_admin' else ''}>super_admin</option>
+                        <option value="artist_manager" {'selected' if u['role'] == 'artist_manager' else ''}>artist_manager</option>
+                        <option value="artist" {'selected' if u['role'] == 'artist' else ''}>artist</option>
+                    </select>
+                </td>
+                <td>
+                    <button type="submit" class="btn btn-update">Update</button>
+                </td>
+            </form>
+            <td>
+                <form method='post' action='/users/delete' style="display: inline;">
+                    <input type='hidden' name='id' value='{u['id']}'>
+                    <button type="submit" class="btn btn-delete">Delete</button>
+                </form>
+            </td>
+        </tr>
+        """
+
+    def render_users_tab(
+        self,
+        user,
+        page,
+        error_message="",
+        success_message="",
+        after=None,
+        before=None,
+    ):
         if not self.has_role(user, Role.SUPER_ADMIN.value):
             return self.forbidden("Only super_admin can access users tab.")
 
-        users, total_count = user_controller.list_users(page=page, page_size=PAGE_SIZE)
+        listing = {}
 
-        rows = ""
-        for index, u in enumerate(users, start=((page - 1) * PAGE_SIZE) + 1):
-            rows += f"""
-            <tr>
-                <form method="post" action="/users/update" style="display: inline;">
-                    <input type="hidden" name="id" value="{u['id']}">
-                    <td>{index}</td>
-                    <td><input type="text" class="table-input" value="{u['first_name']}" name="first_name"></td>
-                    <td><input type="text" class="table-input" value="{u['last_name']}" name="last_name"></td>
-                    <td><input type="text" class="table-input" value="{u['email']}" name="email"></td>
-                    <td><input type="text" class="table-input" value="{u['phone']}" name="phone"></td>
-                    <td><input type="date" class="table-input" value="{u['dob']}" name="dob"></td>
-                    <td>
-                        <select class="table-select" name="gender">
-                            <option value="m" {'selected' if u['gender'] == 'm' else ''}>m</option>
-                            <option value="f" {'selected' if u['gender'] == 'f' else ''}>f</option>
-                            <option value="o" {'selected' if u['gender'] == 'o' else ''}>o</option>
-                        </select>
-                    </td>
-                    <td><input type="text" class="table-input" value="{u['address']}" name="address"></td>
-                    <td>
-                        <select class="table-select" name="role">
-                            <option value="super_admin" {'selected' if u['role'] == 'super_admin' else ''}>super_admin</option>
-                            <option value="artist_manager" {'selected' if u['role'] == 'artist_manager' else ''}>artist_manager</option>
-                            <option value="artist" {'selected' if u['role'] == 'artist' else ''}>artist</option>
-                        </select>
-                    </td>
-                    <td>
-                        <button type="submit" class="btn btn-update">Update</button>
-                    </td>
-                </form>
-                <td>
-                    <form method='post' action='/users/delete' style="display: inline;">
-                        <input type='hidden' name='id' value='{u['id']}'>
-                        <button type="submit" class="btn btn-delete">Delete</button>
-                    </form>
-                </td>
-            </tr>
-            """
+        def rows():
+            listing["page"] = user_controller.list_users(
+                after=after, before=before, page_size=PAGE_SIZE
+            )
+            start = ((page - 1) * PAGE_SIZE) + 1
+            for index, u in enumerate(listing["page"].rows, start=start):
+                yield self.render_user_row(index, u)
+
+        def pagination():
+            result = listing["page"]
+            yield self.build_pagination(
+                "/dashboard?tab=users",
+                page,
+                result.total,
+                result.next_cursor,
+                result.prev_cursor,
+            )
 
         create_form = """
         <div class="content-section">
@@ -237,69 +583,159 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
             </form>
         </div>
         """
-        pagination = self.build_pagination("/dashboard?tab=users", page, total_count)
-
         alert_html = self.build_alert_html(
             error_message, "error"
         ) or self.build_alert_html(success_message, "success")
 
-        table = render_template(
+        table_rows, table_pagination = cached_fragments(
+            ("users",),
+            ("users", user.get("role"), page, after, before),
+            lambda: (rows(), pagination()),
+        )
+        table = stream_template(
             "users_table.html",
-            rows=rows,
+            rows=table_rows,
             create_form=create_form,
-            pagination=pagination,
+            pagination=table_pagination,
             alert_html=alert_html,
         )
-        content = render_template("dashboard.html", table=table)
-        page_html = self.render_base(user, content, users_active="active")
-        return self.send_html(page_html)
+        content = stream_template("dashboard.html", table=table)
+        return self.send_stream(self.stream_base(user, content, users_active="active"))
 
-    def render_artists_tab(self, user, page, error_message="", success_message=""):
+    def render_artist_row(self, index, a, is_manager):
+        artist_id = a["id"]
+        if is_manager:
+            return f"""
+            <tr>
+                <form method='post' action='/artists/update' style="display: inline;">
+                    <input type="hidden" name="id" value="{a['id']}">
+                    <td>{index}</td>
+                    <td><input type="text" class="table-input" value="{a['stage_name']}" name="stage_name"></td>
+                    <td><input type="number" class="table-input" value="{a['first_release_year']}" name="first_release_year"></td>
+                    <td><input type="number" class="table-input" value="{a['no_of_albums_released']}" name="no_of_albums_released"></td>
+                    <td><a class="btn btn-update songs-link" href="/artists/{artist_id}/songs">Songs</a></td>
+                    <td><button type="submit" class="btn btn-update">Update</button></td>
+                </form>
+                <td>
+                    <form method='post' action='/artists/delete' style="display: inline;">
+                        <input type='hidden' name='id' value='{a['id']}'>
+                        <button type="submit" class="btn btn-delete">Delete</button>
+                    </form>
+                </td>
+            </tr>
+            """
+        return f"""
+            <tr>
+                <td>{index}</td>
+                <td>{a['stage_name']}</td>
+                <td>{a['first_release_year']}</td>
+                <td>{a['no_of_albums_released']}</td>
+                <td><a class="btn btn-update songs-link" href="/artists/{artist_id}/songs">Songs</a></td>
+                <td><button type="button" class="btn btn-update" disabled>Update</button></td>
+                <td><button type="button" class="btn btn-delete" disabled>Delete</button></td>
+            </tr>
+            """
+
+    def render_song_row(self, index, s, artist_id, can_mutate_songs):
+        if can_mutate_songs:
+            return f"""
+            <tr>
+                <form method="post" action="/songs/update">
+                    <td>{index}</td>
+
+                    <td>
+                        <input type="text" name="title" value="{s['title']}" class="table-input">
+                    </td>
+
+                    <td>
+                        <input type="text" name="album_name" value="{s['album_name']}" class="table-input">
+                    </td>
+
+                    <td>
+                        <select name="genre" class="table-input">
+                            <option value="rnb" {"selected" if s['genre']=="rnb" else ""}>rnb</option>
+                            <option value="country" {"selected" if s['genre']=="country" else ""}>country</option>
+                            <option value="classic" {"selected" if s['genre']=="classic" else ""}>classic</option>
+                            <option value="rock" {"selected" if s['genre']=="rock" else ""}>rock</option>
+                            <option value="jazz" {"selected" if s['genre']=="jazz" else ""}>jazz</option>
+                        </select>
+                    </td>
+
+                    <td>
+                        <input type="hidden" name="id" value="{s['id']}">
+                        <input type="hidden" name="artist_id" value="{artist_id}">
+                        <button type="submit" class="btn btn-update">Update</button>
+                    </td>
+                </form>
+
+                <td>
+                    <form method="post" action="/songs/delete">
+                        <input type="hidden" name="id" value="{s['id']}">
+                        <input type="hidden" name="artist_id" value="{artist_id}">
+                        <button type="submit" class="btn btn-delete">Delete</button>
+                    </form>
+                </td>
+            </tr>
+            """
+
+        return f"""
+            <tr>
+                <td>{index}</td>
+                <td>{s['title']}</td>
+                <td>{s['album_name']}</td>
+                <td>{s['genre']}</td>
+                <td><button type="button" class="btn btn-update" disabled>Update</button></td>
+                <td><button type="button" class="btn btn-delete" disabled>Delete</button></td>
+            </tr>
+            """
+
+    def iter_song_rows(self, songs, artist_id, can_mutate_songs, start=1):
+        index = 0
+        for index, s in enumerate(songs, start=start):
+            yield self.render_song_row(index, s, artist_id, can_mutate_songs)
+        if not index:
+            yield """
+            <tr>
+                <td colspan="6" style="text-align: center; padding: 2rem; color: #999;">
+                    No songs found for this artist
+                </td>
+            </tr>
+            """
+
+    def render_artists_tab(
+        self,
+        user,
+        page,
+        error_message="",
+        success_message="",
+        after=None,
+        before=None,
+    ):
         if not self.has_role(user, Role.SUPER_ADMIN.value, Role.ARTIST_MANAGER.value):
             return self.forbidden(
                 "Only super_admin and artist_manager can access artists tab."
             )
 
-        artists, total_count = artist_controller.list_artists(
-            page=page, page_size=PAGE_SIZE
-        )
         is_manager = user.get("role") == Role.ARTIST_MANAGER.value
+        listing = {}
 
-        rows = ""
-        for index, a in enumerate(artists, start=((page - 1) * PAGE_SIZE) + 1):
-            artist_id = a["id"]
-            if is_manager:
-                rows += f"""
-                <tr>
-                    <form method='post' action='/artists/update' style="display: inline;">
-                        <input type="hidden" name="id" value="{a['id']}">
-                        <td>{index}</td>
-                        <td><input type="text" class="table-input" value="{a['stage_name']}" name="stage_name"></td>
-                        <td><input type="number" class="table-input" value="{a['first_release_year']}" name="first_release_year"></td>
-                        <td><input type="number" class="table-input" value="{a['no_of_albums_released']}" name="no_of_albums_released"></td>
-                        <td><a class="btn btn-update songs-link" href="/artists/{artist_id}/songs">Songs</a></td>
-                        <td><button type="submit" class="btn btn-update">Update</button></td>
-                    </form>
-                    <td>
-                        <form method='post' action='/artists/delete' style="display: inline;">
-                            <input type='hidden' name='id' value='{a['id']}'>
-                            <button type="submit" class="btn btn-delete">Delete</button>
-                        </form>
-                    </td>
-                </tr>
-                """
-            else:
-                rows += f"""
-                <tr>
-                    <td>{index}</td>
-                    <td>{a['stage_name']}</td>
-                    <td>{a['first_release_year']}</td>
-                    <td>{a['no_of_albums_released']}</td>
-                    <td><a class="btn btn-update songs-link" href="/artists/{artist_id}/songs">Songs</a></td>
-                    <td><button type="button" class="btn btn-update" disabled>Update</button></td>
-                    <td><button type="button" class="btn btn-delete" disabled>Delete</button></td>
-                </tr>
-                """
+        def rows():
+            listing["page"] = artist_controller.list_artists(
+                after=after, before=before, page_size=PAGE_SIZE
+            )
+            start = ((page - 1) * PAGE_SIZE) + 1
+            for index, a in enumerate(listing["page"].rows, start=start):
+                yield self.render_artist_row(index, a, is_manager)
+
+        def pagination():
+            result = listing["page"]
+            yield self.build_pagination(
+                "/dashboard?tab=artists",
+                page,
+                result.total,
+                result.next_cursor,
+                result.prev_cursor,
+            )
 
         create_form = ""
         csv_controls = ""
@@ -340,6 +776,10 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
                 <h2 class="section-title">Artist CSV</h2>
                 <div class="csv-export-wrapper">
                     <a href="/artists/export" class="btn btn-update export-btn">Export CSV</a>
+                    <form method="post" action="/artists/export" class="csv-export-form">
+                        <label><input type="checkbox" name="gzip" value="1"> gzip</label>
+                        <button type="submit" class="btn btn-update">Export in background</button>
+                    </form>
                 </div>
                 <form method="post" action="/artists/import" enctype="multipart/form-data" class="csv-import-form">
                     <input type="file" name="file" accept=".csv" required>
@@ -347,527 +787,727 @@ class AMSRequestHandler(BaseHTTPRequestHandler):
                 </form>
             </div>
             """
-        pagination = self.build_pagination("/dashboard?tab=artists", page, total_count)
         alert_html = self.build_alert_html(
             error_message, "error"
         ) or self.build_alert_html(success_message, "success")
 
-        table = render_template(
+        table_rows, table_pagination = cached_fragments(
+            ("artists",),
+            ("artists", user.get("role"), page, after, before),
+            lambda: (rows(), pagination()),
+        )
+        table = stream_template(
             "artists_table.html",
-            rows=rows,
+            rows=table_rows,
             create_form=create_form,
             csv_controls=csv_controls,
-            pagination=pagination,
+            pagination=table_pagination,
             alert_html=alert_html,
         )
-        content = render_template("dashboard.html", table=table)
-        page_html = self.render_base(user, content, artists_active="active")
-        return self.send_html(page_html)
+        content = stream_template("dashboard.html", table=table)
+        return self.send_stream(
+            self.stream_base(user, content, artists_active="active")
+        )
 
-    def do_GET(self):
+    def discard_unread_body(self):
+        if self.command == "POST" and self.form is None:
+            self.close_connection = True
+
+    def method_not_allowed(self, allowed):
+        self.discard_unread_body()
+        body = b"<h3>Method Not Allowed</h3>"
+        self.send_response(HTTPStatus.METHOD_NOT_ALLOWED)
+        self.send_header("Allow", ", ".join(allowed))
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route_request(self, method):
+        with track_request(method) as self.request_metrics:
+            try:
+                return self.dispatch_request(method)
+            finally:
+                self.request_metrics = None
+
+    def dispatch_request(self, method):
         parsed = urlparse(self.path)
-        path = parsed.path
-        qs = parse_qs(parsed.query)
-        user = get_user_from_session(self)
+        self.query = parse_qs(parsed.query)
+        self.form = None
+        self.response_encoding = None
+        self.user = get_user_from_session(self)
+
+        match = router.match(method, parsed.path)
+        if match is None:
+            self.discard_unread_body()
+            canonical = parsed.path.rstrip("/")
+            if method == "GET" and canonical and router.match(method, canonical):
+                return self.redirect_permanently(
+                    f"{canonical}?{parsed.query}" if parsed.query else canonical
+                )
+            return self.not_found(path=parsed.path)
+        if match.route is None:
+            return self.method_not_allowed(match.allowed)
+        self.request_metrics.route = match.route.pattern
+        if method == "POST" and not match.route.raw_body:
+            self.form = parse_post_body(self)
+        return match.route(self, match.params)
 
-        if path == "/static/style.css":
-            css_path = os.path.join(self.BASE_DIR, "static", "style.css")
+    def do_GET(self):
+        return self.route_request("GET")
 
-            if not os.path.exists(css_path):
-                return self.not_found()
-            with open(css_path, "r", encoding="utf-8") as f:
-                css = f.read()
+    def do_POST(self):
+        return self.route_request("POST")
+
+    @router.get("/static/{path:path}")
+    def static_file(self, path):
+        asset = default_static.get_asset(path)
+        if asset is None:
+            return self.not_found()
+
+        body, etag, encoding = asset.variant(self.headers.get("Accept-Encoding"))
+        not_modified = asset.not_modified(self.headers, etag)
+        self.send_response(HTTPStatus.NOT_MODIFIED if not_modified else HTTPStatus.OK)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", asset.last_modified)
+        self.send_header("Cache-Control", default_static.cache_control())
+        if asset.compressible:
+            self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
 
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "text/css; charset=utf-8")
+        self.send_header("Content-Type", asset.content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if body is not None:
+            self.send_header("Content-Length", str(len(body)))
             self.end_headers()
-            self.wfile.write(css.encode("utf-8"))
+            self.wfile.write(body)
             return
 
-        if path == "/":
-            if user:
-                return self.redirect("/dashboard")
-            return self.redirect("/login")
+        with open(asset.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            self.send_file(f, size)
 
-        if path == "/login":
-            if user:
-                return self.redirect("/dashboard")
-            error_message = self.get_query_value(qs, "error")
-            success_message = self.get_query_value(qs, "success")
-            return self.send_html(
-                render_template(
-                    "login.html",
-                    error_html=self.build_alert_html(error_message, "error"),
-                    success_html=self.build_alert_html(success_message, "success"),
-                )
+    @router.get("/")
+    def home(self):
+        if self.user:
+            return self.redirect("/dashboard")
+        return self.redirect("/login")
+
+    @router.get("/login", anonymous_only)
+    def login_page(self):
+        error_message = self.get_query_value(self.query, "error")
+        success_message = self.get_query_value(self.query, "success")
+        return self.send_html(
+            render_template(
+                "login.html",
+                error_html=self.build_alert_html(error_message, "error"),
+                success_html=self.build_alert_html(success_message, "success"),
             )
+        )
 
-        if path == "/register":
-            if user:
-                return self.redirect("/dashboard")
-            error_message = self.get_query_value(qs, "error")
-            return self.send_html(
-                render_template(
-                    "register.html",
-                    error_html=self.build_alert_html(error_message, "error"),
-                )
+    @router.get("/register", anonymous_only)
+    def register_page(self):
+        error_message = self.get_query_value(self.query, "error")
+        return self.send_html(
+            render_template(
+                "register.html",
+                error_html=self.build_alert_html(error_message, "error"),
             )
+        )
 
-        if path == "/dashboard":
-            if not require_login(self):
-                return
+    @router.get("/dashboard", login_required)
+    def dashboard(self):
+        user = self.user
+        qs = self.query
+        role = user.get("role")
 
-            role = user.get("role")
+        if role == Role.ARTIST.value:
+            own_artist_id = self.get_own_artist_id(user)
+            if own_artist_id is None:
+                return self.forbidden("Artist profile not found for current user.")
+            return self.redirect(f"/artists/{own_artist_id}/songs")
+
+        default_tab = "users" if role == Role.SUPER_ADMIN.value else "artists"
+        tab = qs.get("tab", [default_tab])[0]
+        page, after, before = self.get_page_cursor(qs)
+        error_message = self.get_query_value(qs, "error")
+        success_message = self.get_query_value(qs, "success")
+
+        if tab == "users":
+            return self.render_users_tab(
+                user, page, error_message, success_message, after, before
+            )
+        if tab == "artists":
+            return self.render_artists_tab(
+                user, page, error_message, success_message, after, before
+            )
 
-            if role == Role.ARTIST.value:
-                own_artist = artist_controller.get_artist_by_user_id(user.get("id"))
-                if not own_artist:
-                    return self.forbidden("Artist profile not found for current user.")
-                return self.redirect(f"/artists/{own_artist['id']}/songs")
+        return self.redirect("/dashboard")
 
-            default_tab = "users" if role == Role.SUPER_ADMIN.value else "artists"
-            tab = qs.get("tab", [default_tab])[0]
-            page = self.get_page(qs)
-            error_message = self.get_query_value(qs, "error")
-            success_message = self.get_query_value(qs, "success")
+    @router.get("/artists/{artist_id:int}/songs", login_required)
+    def artist_songs(self, artist_id):
+        user = self.user
+        qs = self.query
 
-            if tab == "users":
-                return self.render_users_tab(user, page, error_message, success_message)
-            if tab == "artists":
-                return self.render_artists_tab(
-                    user, page, error_message, success_message
-                )
+        if not self.can_access_artist_songs(user, artist_id):
+            return self.forbidden("You do not have access to this artist's songs.")
 
-            return self.redirect("/dashboard")
+        error_message = self.get_query_value(qs, "error")
+        success_message = self.get_query_value(qs, "success")
 
-        if path.startswith("/artists/") and path.endswith("/songs"):
-            if not require_login(self):
-                return
-            artist_id = path.split("/")[2]
+        can_mutate_songs = user.get(
+            "role"
+        ) == Role.ARTIST.value and self.can_access_artist_songs(user, artist_id)
 
-            if not self.can_access_artist_songs(user, artist_id):
-                return self.forbidden("You do not have access to this artist's songs.")
+        filters = self.get_song_filters(qs)
+        page, after, before = self.get_page_cursor(qs, decode=decode_cursor)
+        listing = {}
 
+        def header():
             artist = artist_controller.get_artist_by_id(artist_id)
-            if not artist:
-                self.send_error(HTTPStatus.NOT_FOUND, "Artist not found")
-                return
-
-            artist_name = artist["stage_name"]
-            error_message = self.get_query_value(qs, "error")
-            success_message = self.get_query_value(qs, "success")
-
-            songs = song_controller.list_artist_song(artist_id)
-
-            can_mutate_songs = user.get(
-                "role"
-            ) == Role.ARTIST.value and self.can_access_artist_songs(user, artist_id)
-
-            rows = ""
-            if songs:
-                for index, s in enumerate(songs, start=1):
-                    if can_mutate_songs:
-                        rows += f"""
-                            <tr>
-                                <form method="post" action="/songs/update">
-                                    <td>{index}</td>
-
-                                    <td>
-                                        <input type="text" name="title" value="{s['title']}" class="table-input">
-                                    </td>
-
-                                    <td>
-                                        <input type="text" name="album_name" value="{s['album_name']}" class="table-input">
-                                    </td>
-
-                                    <td>
-                                        <select name="genre" class="table-input">
-                                            <option value="rnb" {"selected" if s['genre']=="rnb" else ""}>rnb</option>
-                                            <option value="country" {"selected" if s['genre']=="country" else ""}>country</option>
-                                            <option value="classic" {"selected" if s['genre']=="classic" else ""}>classic</option>
-                                            <option value="rock" {"selected" if s['genre']=="rock" else ""}>rock</option>
-                                            <option value="jazz" {"selected" if s['genre']=="jazz" else ""}>jazz</option>
-                                        </select>
-                                    </td>
-
-                                    <td>
-                                        <input type="hidden" name="id" value="{s['id']}">
-                                        <input type="hidden" name="artist_id" value="{artist_id}">
-                                        <button type="submit" class="btn btn-update">Update</button>
-                                    </td>
-                                </form>
-
-                                <td>
-                                    <form method="post" action="/songs/delete">
-                                        <input type="hidden" name="id" value="{s['id']}">
-                                        <input type="hidden" name="artist_id" value="{artist_id}">
-                                        <button type="submit" class="btn btn-delete">Delete</button>
-                                    </form>
-                                </td>
-                            </tr>
-                            """
-
-                    else:
-                        rows += f"""
-                        <tr>
-                            <td>{index}</td>
-                            <td>{s['title']}</td>
-                            <td>{s['album_name']}</td>
-                            <td>{s['genre']}</td>
-                            <td><button type="button" class="btn btn-update" disabled>Update</button></td>
-                            <td><button type="button" class="btn btn-delete" disabled>Delete</button></td>
-                        </tr>
-                        """
-            else:
-                rows = """
-                <tr>
-                    <td colspan="6" style="text-align: center; padding: 2rem; color: #999;">
-                        No songs found for this artist
-                    </td>
-                </tr>
-                """
-
-            create_song_form = ""
-            if can_mutate_songs:
-                create_song_form = f"""
-                <div class="content-section">
-                    <h2 class="section-title">Create Song for Artist: {artist_name}</h2>
-                    <form method="post" action="/songs/create" class="create-user-form">
-                        <input type="hidden" name="artist_id" value="{artist_id}">
-                        <div class="form-grid">
-                            <div class="form-group"><input type="text" name="title" class="form-input" placeholder="title" required></div>
-                            <div class="form-group"><input type="text" name="album_name" class="form-input" placeholder="album_name" required></div>
-                            <div class="form-group">
-                                <select name="genre" class="form-select" required>
-                                    <option value="">Select Genre</option>
-                                    <option value="rnb">rnb</option>
-                                    <option value="country">country</option>
-                                    <option value="classic">classic</option>
-                                    <option value="rock">rock</option>
-                                    <option value="jazz">jazz</option>
-                                </select>
-                            </div>
-                        </div>
-                        <button type="submit" class="submit-btn">Create Song</button>
-                    </form>
-                </div>
-                """
+            if artist:
+                yield artist["stage_name"]
 
-            content = render_template(
-                "songs_table.html",
-                rows=rows,
-                artist_name=artist_name,
-                artist_id=artist_id,
-                create_song_form=create_song_form,
-                alert_html=self.build_alert_html(error_message, "error")
-                or self.build_alert_html(success_message, "success"),
+        def filter_fields():
+            yield self.build_song_filter_form(
+                artist_id, filters, song_controller.list_artist_albums(artist_id)
             )
-            html_page = self.render_base(user, content, artists_active="active")
 
-            self.send_html(html_page)
-            return
+        def songs():
+            listing["page"] = song_controller.list_artist_songs(
+                artist_id,
+                genre=filters["genre"],
+                album=filters["album"],
+                title_prefix=filters["q"],
+                sort=filters["sort"],
+                after=after,
+                before=before,
+                page_size=SONG_PAGE_SIZE,
+            )
+            yield from listing["page"].rows
+
+        def pagination():
+            result = listing["page"]
+            query = urlencode({k: v for k, v in filters.items() if v})
+            yield self.build_pagination(
+                html.escape(f"/artists/{artist_id}/songs?{query}"),
+                page,
+                result.total,
+                result.next_cursor,
+                result.prev_cursor,
+                page_size=SONG_PAGE_SIZE,
+            )
 
-        if path == "/artists/export":
-            if not require_login(self):
-                return
-
-            if not self.has_role(user, Role.ARTIST_MANAGER.value):
-                return self.forbidden("Only artist_manager can export artists.")
-
-            rows = artist_controller.export_artists_csv_rows()
-
-            output = StringIO()
-            writer = csv.DictWriter(
-                output,
-                fieldnames=[
-                    "first_name",
-                    "last_name",
-                    "email",
-                    "phone",
-                    "dob",
-                    "gender",
-                    "address",
-                    "stage_name",
-                    "first_release_year",
-                    "no_of_albums_released",
-                ],
-            )
-            writer.writeheader()
-            writer.writerows(rows)
-            csv_data = output.getvalue()
-            output.close()
-
-            self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "text/csv")
-            self.send_header("Content-Disposition", "attachment; filename=artists.csv")
-            self.end_headers()
-            self.wfile.write(csv_data.encode("utf-8"))
+        artist_header, rows, song_pagination, filter_form = cached_fragments(
+            ("artists", "songs"),
+            (
+                "songs",
+                artist_id,
+                can_mutate_songs,
+                page,
+                repr(after),
+                repr(before),
+                tuple(sorted(filters.items())),
+            ),
+            lambda: (
+                header(),
+                self.iter_song_rows(
+                    songs(),
+                    artist_id,
+                    can_mutate_songs,
+                    start=((page - 1) * SONG_PAGE_SIZE) + 1,
+                ),
+                pagination(),
+                filter_fields(),
+            ),
+        )
+        artist_name = "".join(artist_header)
+        if not artist_name:
+            self.send_error(HTTPStatus.NOT_FOUND, "Artist not found")
             return
 
-        return self.not_found(path=path)
+        create_song_form = ""
+        if can_mutate_songs:
+            create_song_form = f"""
+            <div class="content-section">
+                <h2 class="section-title">Create Song for Artist: {artist_name}</h2>
+                <form method="post" action="/songs/create" class="create-user-form">
+                    <input type="hidden" name="artist_id" value="{artist_id}">
+                    <div class="form-grid">
+                        <div class="form-group"><input type="text" name="title" class="form-input" placeholder="title" required></div>
+                        <div class="form-group"><input type="text" name="album_name" class="form-input" placeholder="album_name" required></div>
+                        <div class="form-group">
+                            <select name="genre" class="form-select" required>
+                                <option value="">Select Genre</option>
+                                <option value="rnb">rnb</option>
+                                <option value="country">country</option>
+                                <option value="classic">classic</option>
+                                <option value="rock">rock</option>
+                                <option value="jazz">jazz</option>
+                            </select>
+                        </div>
+                    </div>
+                    <button type="submit" class="submit-btn">Create Song</button>
+                </form>
+            </div>
+            """
 
-    def do_POST(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-        user = get_user_from_session(self)
+        content = stream_template(
+            "songs_table.html",
+            rows=rows,
+            artist_name=artist_name,
+            artist_id=artist_id,
+            create_song_form=create_song_form,
+            filter_form=filter_form,
+            pagination=song_pagination,
+            alert_html=self.build_alert_html(error_message, "error")
+            or self.build_alert_html(success_message, "success"),
+        )
+        return self.send_stream(
+            self.stream_base(user, content, artists_active="active")
+        )
 
-        if path == "/artists/import":
-            if not require_login(self):
-                return
-            if not self.has_role(user, Role.ARTIST_MANAGER.value):
-                return self.forbidden("Only artist_manager can import artists.")
+    @router.get(
+        "/admin/stats",
+        login_required,
+        role_required(
+            Role.SUPER_ADMIN.value, message="Only super_admin can view server stats."
+        ),
+    )
+    def admin_stats(self):
+        return self.send_json(self.server_stats())
+
+    def server_stats(self):
+        return {
+            "db_pool": AMSDatabase.pool_stats(),
+            "db_writes": AMSDatabase.write_stats(),
+            "sql": query_stats(),
+            "hashing": hashing_stats(),
+            "throttling": throttle_stats(),
+            "compression": compression_stats(),
+            "fragments": fragment_stats(),
+            "profiling": profiling_stats(),
+        }
+
+    @router.get("/metrics")
+    def metrics(self):
+        authorized = metrics_authorized(self.headers.get("Authorization"))
+        if not authorized and not self.has_role(self.user, Role.SUPER_ADMIN.value):
+            return self.forbidden("Only super_admin can view metrics.")
+        return self.send_body(
+            render_metrics(self.server_stats()).encode("utf-8"),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
 
-            multipart_form = cgi.FieldStorage(
-                fp=self.rfile,
-                headers=self.headers,
-                environ={
-                    "REQUEST_METHOD": "POST",
-                    "CONTENT_TYPE": self.headers.get("Content-Type", ""),
-                },
+    def get_accessible_job(self, job_id):
+        job = job_controller.get_job(job_id)
+        if not self.can_access_job(self.user, job):
+            self.not_found("Job not found.")
+            return None
+        return job
+
+    @router.get("/jobs/{job_id:int}", login_required)
+    def job_status(self, job_id):
+        job = self.get_accessible_job(job_id)
+        if job is None:
+            return
+        if self.wants_json(self.query):
+            return self.send_json(
+                {
+                    key: job[key]
+                    for key in (
+                        "id",
+                        "kind",
+                        "status",
+                        "progress",
+                        "total",
+                        "message",
+                        "created_at",
+                        "started_at",
+                        "finished_at",
+                    )
+                }
             )
+        return self.send_html(self.render_job_status(self.user, job))
 
-            if "file" not in multipart_form:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error="Please select a CSV file."
-                )
-
-            file_item = multipart_form["file"]
-
-            if not getattr(file_item, "filename", ""):
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error="Please select a CSV file."
-                )
-
-            csv_bytes = file_item.file.read()
-            if not csv_bytes:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error="Uploaded CSV file is empty."
-                )
+    @router.get("/jobs/{job_id:int}/download", login_required)
+    def job_download(self, job_id):
+        job = self.get_accessible_job(job_id)
+        if job is None:
+            return
+        result_path = job["result_path"]
+        if (
+            job["status"] != JobStatus.DONE.value
+            or not result_path
+            or not os.path.exists(result_path)
+        ):
+            return self.not_found("Job result is not available.")
+
+        filename = os.path.basename(result_path)
+        self.send_response(HTTPStatus.OK)
+        self.send_header(
+            "Content-Type",
+            "application/gzip" if filename.endswith(".gz") else "text/csv",
+        )
+        self.send_header("Content-Disposition", f"attachment; filename={filename}")
+        with open(result_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            self.send_file(f, size)
+
+    @router.get(
+        "/artists/export",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can export artists."
+        ),
+    )
+    def export_artists(self):
+        qs = self.query
+        columns, unknown = self.get_export_columns(qs.get("columns", [""])[0])
+        if unknown:
+            return self.send_html(
+                f"<h3>Unknown export column(s): {html.escape(', '.join(unknown))}</h3>",
+                status=HTTPStatus.BAD_REQUEST,
+            )
 
-            try:
-                csv_text = csv_bytes.decode("utf-8-sig", errors="ignore")
-                rows = list(csv.DictReader(StringIO(csv_text)))
-                artist_controller.import_artists(rows)
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists",
-                    success="Artists imported successfully.",
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error=f"Artist import failed: {e}"
-                )
+        chunks = iter_csv(columns, artist_controller.iter_export_batches(columns))
+        if qs.get("gzip", [""])[0] == "1":
+            return self.send_stream(
+                gzip_stream(chunks),
+                content_type="application/gzip",
+                headers={"Content-Disposition": "attachment; filename=artists.csv.gz"},
+            )
+        return self.send_stream(
+            chunks,
+            content_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": "attachment; filename=artists.csv"},
+        )
 
-        form = parse_post_body(self)
+    @router.post(
+        "/artists/import",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can import artists."
+        ),
+        raw_body=True,
+    )
+    def import_artists(self):
+        multipart_form = cgi.FieldStorage(
+            fp=self.rfile,
+            headers=self.headers,
+            environ={
+                "REQUEST_METHOD": "POST",
+                "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            },
+        )
 
-        if path == "/register":
-            if user:
-                return self.redirect("/dashboard")
-            success, result = auth_controller.register_user(form)
-            if not success:
-                return self.redirect_with_message("/register", error=f"{result}")
+        if "file" not in multipart_form:
             return self.redirect_with_message(
-                "/login", success="Registration successful. Please login."
+                "/dashboard?tab=artists", error="Please select a CSV file."
             )
 
-        if path == "/login":
-            if user:
-                return self.redirect("/dashboard")
-            success, result = auth_controller.login_user(form)
+        file_item = multipart_form["file"]
 
-            if not success:
-                return self.redirect_with_message("/login", error=f"{result}")
+        if not getattr(file_item, "filename", ""):
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error="Please select a CSV file."
+            )
 
-            session_id = create_session(result)
-            self.send_response(HTTPStatus.SEE_OTHER)
-            self.send_header("Location", "/dashboard")
-            self.send_header(
-                "Set-Cookie",
-                f"{SESSION_COOKIE_NAME}={session_id}; Path=/; HttpOnly; SameSite=Lax",
+        upload = file_item.file
+        upload.seek(0, os.SEEK_END)
+        if not upload.tell():
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error="Uploaded CSV file is empty."
             )
-            self.end_headers()
-            return
 
-        if path == "/logout":
-            session_id = get_session_id(self)
-            destroy_session(session_id)
-            self.send_response(HTTPStatus.SEE_OTHER)
-            self.send_header("Location", "/login")
-            self.send_header(
-                "Set-Cookie",
-                f"{SESSION_COOKIE_NAME}=; Path=/; Max-Age=0; HttpOnly; SameSite=Lax",
+        job_id = enqueue_job(
+            JobKind.ARTIST_IMPORT.value,
+            self.user["id"],
+            {"path": save_job_upload(upload)},
+        )
+        return self.redirect(f"/jobs/{job_id}")
+
+    @router.post(
+        "/artists/export",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can export artists."
+        ),
+    )
+    def queue_artist_export(self):
+        form = self.form
+        columns, unknown = self.get_export_columns(form.get("columns", ""))
+        if unknown:
+            return self.redirect_with_message(
+                "/dashboard?tab=artists",
+                error=f"Unknown export column(s): {', '.join(unknown)}",
             )
-            self.end_headers()
+        job_id = enqueue_job(
+            JobKind.ARTIST_EXPORT.value,
+            self.user["id"],
+            {"columns": columns, "gzip": form.get("gzip") == "1"},
+        )
+        return self.redirect(f"/jobs/{job_id}")
+
+    @router.post("/register", anonymous_only)
+    def register(self):
+        if self.throttled(throttle_register, self.form):
             return
+        success, result = auth_controller.register_user(self.form)
+        if not success:
+            return self.redirect_with_message("/register", error=f"{result}")
+        return self.redirect_with_message(
+            "/login", success="Registration successful. Please login."
+        )
 
-        if not require_login(self):
+    @router.post("/login", anonymous_only)
+    def login(self):
+        if self.throttled(throttle_login, self.form):
             return
+        success, result = auth_controller.login_user(self.form)
 
-        if path == "/users/create":
-            if not self.has_role(user, Role.SUPER_ADMIN.value):
-                return self.forbidden("Only super_admin can create users.")
+        if not success:
+            delay = getattr(result, "delay", 0)
+            if delay and not self.delay_response(delay):
+                result = LOGIN_BUSY_MESSAGE
+            return self.redirect_with_message("/login", error=f"{result}")
 
-            validation_error = validate_user_create_form(form)
-            if validation_error:
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", error=validation_error
-                )
+        session_id = create_session(result)
+        self.send_response(HTTPStatus.SEE_OTHER)
+        self.send_header("Location", "/dashboard")
+        self.send_header(
+            "Set-Cookie",
+            f"{SESSION_COOKIE_NAME}={session_id}; Path=/; HttpOnly; SameSite=Lax",
+        )
+        self.send_header("Content-Length", "0")
+        self.end_headers()
 
-            try:
-                user_controller.create_user(form)
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", success="User created successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", error=f"User creation failed: {e}"
-                )
+    @router.post("/logout")
+    def logout(self):
+        session_id = get_session_id(self)
+        destroy_session(session_id)
+        self.send_response(HTTPStatus.SEE_OTHER)
+        self.send_header("Location", "/login")
+        self.send_header(
+            "Set-Cookie",
+            f"{SESSION_COOKIE_NAME}=; Path=/; Max-Age=0; HttpOnly; SameSite=Lax",
+        )
+        self.send_header("Content-Length", "0")
+        self.end_headers()
 
-        if path == "/users/delete":
-            if not self.has_role(user, Role.SUPER_ADMIN.value):
-                return self.forbidden("Only super_admin can delete users.")
-            try:
-                user_controller.delete_user(form["id"])
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", success="User deleted successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", error=f"User delete failed: {e}"
-                )
+    @router.post(
+        "/users/create",
+        login_required,
+        role_required(
+            Role.SUPER_ADMIN.value, message="Only super_admin can create users."
+        ),
+    )
+    def create_user(self):
+        form = self.form
+        validation_error = validate_user_create_form(form)
+        if validation_error:
+            return self.redirect_with_message(
+                "/dashboard?tab=users", error=validation_error
+            )
 
-        if path == "/users/update":
-            if not self.has_role(user, Role.SUPER_ADMIN.value):
-                return self.forbidden("Only super_admin can update users.")
-            try:
-                user_controller.update_user(form)
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", success="User updated successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=users", error=f"User update failed: {e}"
-                )
+        try:
+            user_controller.create_user(form)
+            return self.redirect_with_message(
+                "/dashboard?tab=users", success="User created successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=users", error=f"User creation failed: {e}"
+            )
 
-        if path == "/artists/create":
-            if not self.has_role(user, Role.ARTIST_MANAGER.value):
-                return self.forbidden("Only artist_manager can create artists.")
+    @router.post(
+        "/users/delete",
+        login_required,
+        role_required(
+            Role.SUPER_ADMIN.value, message="Only super_admin can delete users."
+        ),
+    )
+    def delete_user(self):
+        try:
+            user_controller.delete_user(self.form["id"])
+            return self.redirect_with_message(
+                "/dashboard?tab=users", success="User deleted successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=users", error=f"User delete failed: {e}"
+            )
 
-            validation_error = validate_artist_create_form(form)
-            if validation_error:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error=validation_error
-                )
+    @router.post(
+        "/users/update",
+        login_required,
+        role_required(
+            Role.SUPER_ADMIN.value, message="Only super_admin can update users."
+        ),
+    )
+    def update_user(self):
+        try:
+            user_controller.update_user(self.form)
+            return self.redirect_with_message(
+                "/dashboard?tab=users", success="User updated successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=users", error=f"User update failed: {e}"
+            )
 
-            try:
-                artist_controller.create_artist(form)
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", success="Artist created successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error=f"Artist creation failed: {e}"
-                )
+    @router.post(
+        "/artists/create",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can create artists."
+        ),
+    )
+    def create_artist(self):
+        form = self.form
+        validation_error = validate_artist_create_form(form)
+        if validation_error:
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error=validation_error
+            )
 
-        if path == "/artists/update":
-            if not self.has_role(user, Role.ARTIST_MANAGER.value):
-                return self.forbidden("Only artist_manager can update artists.")
-            try:
-                artist_controller.update_artist(form)
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", success="Artist updated successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error=f"Artist update failed: {e}"
-                )
+        try:
+            artist_controller.create_artist(form)
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", success="Artist created successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error=f"Artist creation failed: {e}"
+            )
 
-        if path == "/artists/delete":
-            if not self.has_role(user, Role.ARTIST_MANAGER.value):
-                return self.forbidden("Only artist_manager can delete artists.")
-            try:
-                artist_controller.delete_artist(form["id"])
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", success="Artist deleted successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    "/dashboard?tab=artists", error=f"Artist delete failed: {e}"
-                )
+    @router.post(
+        "/artists/update",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can update artists."
+        ),
+    )
+    def update_artist(self):
+        try:
+            artist_controller.update_artist(self.form)
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", success="Artist updated successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error=f"Artist update failed: {e}"
+            )
 
-        if path == "/songs/create":
-            artist_id = form.get("artist_id")
+    @router.post(
+        "/artists/delete",
+        login_required,
+        role_required(
+            Role.ARTIST_MANAGER.value, message="Only artist_manager can delete artists."
+        ),
+    )
+    def delete_artist(self):
+        try:
+            artist_controller.delete_artist(self.form["id"])
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", success="Artist deleted successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                "/dashboard?tab=artists", error=f"Artist delete failed: {e}"
+            )
 
-            if not artist_id or not self.has_role(user, Role.ARTIST.value):
-                return self.forbidden("Only artist can create songs.")
+    @router.post(
+        "/songs/create",
+        login_required,
+        role_required(Role.ARTIST.value, message="Only artist can create songs."),
+    )
+    def create_song(self):
+        form = self.form
+        artist_id = form.get("artist_id")
 
-            if not self.can_access_artist_songs(user, artist_id):
-                return self.forbidden(
-                    "You can only create songs for your own artist profile."
-                )
+        if not artist_id:
+            return self.forbidden("Only artist can create songs.")
 
-            required_fields = ["artist_id", "title", "album_name", "genre"]
+        if not self.can_access_artist_songs(self.user, artist_id):
+            return self.forbidden(
+                "You can only create songs for your own artist profile."
+            )
 
-            for field in required_fields:
-                if not form.get(field):
-                    return self.redirect_with_message(
-                        f"/artists/{artist_id}/songs",
-                        error=f"{field} is required to create song.",
-                    )
+        required_fields = ["artist_id", "title", "album_name", "genre"]
 
-            try:
-                song_controller.create_song(form)
+        for field in required_fields:
+            if not form.get(field):
                 return self.redirect_with_message(
-                    f"/artists/{artist_id}/songs", success="Song created successfully."
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    f"/artists/{artist_id}/songs", error=f"Song creation failed: {e}"
-                )
-
-        if path == "/songs/update":
-            if not self.has_role(user, Role.ARTIST.value):
-                return self.forbidden("Only artist can update songs.")
-
-            song = song_controller.get_song_by_id(form.get("id"))
-            if not song or not self.can_access_artist_songs(user, song["artist_id"]):
-                return self.forbidden(
-                    "You can only update songs for your own artist profile."
+                    f"/artists/{artist_id}/songs",
+                    error=f"{field} is required to create song.",
                 )
 
-            form["artist_id"] = str(song["artist_id"])
-            try:
-                song_controller.update_song(form)
-                return self.redirect_with_message(
-                    f"/artists/{form['artist_id']}/songs",
-                    success="Song updated successfully.",
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    f"/artists/{form['artist_id']}/songs",
-                    error=f"Song update failed: {e}",
-                )
+        try:
+            song_controller.create_song(form)
+            return self.redirect_with_message(
+                f"/artists/{artist_id}/songs", success="Song created successfully."
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                f"/artists/{artist_id}/songs", error=f"Song creation failed: {e}"
+            )
 
-        if path == "/songs/delete":
-            if not self.has_role(user, Role.ARTIST.value):
-                return self.forbidden("Only artist can delete songs.")
+    @router.post(
+        "/songs/update",
+        login_required,
+        role_required(Role.ARTIST.value, message="Only artist can update songs."),
+    )
+    def update_song(self):
+        form = self.form
+        song = song_controller.get_song_by_id(form.get("id"))
+        if not song or not self.can_access_artist_songs(self.user, song["artist_id"]):
+            return self.forbidden(
+                "You can only update songs for your own artist profile."
+            )
 
-            song = song_controller.get_song_by_id(form.get("id"))
-            if not song or not self.can_access_artist_songs(user, song["artist_id"]):
-                return self.forbidden(
-                    "You can only delete songs for your own artist profile."
-                )
+        form["artist_id"] = str(song["artist_id"])
+        try:
+            song_controller.update_song(form)
+            return self.redirect_with_message(
+                f"/artists/{form['artist_id']}/songs",
+                success="Song updated successfully.",
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                f"/artists/{form['artist_id']}/songs",
+                error=f"Song update failed: {e}",
+            )
 
-            artist_id = song["artist_id"]
-            try:
-                song_controller.delete_song(form["id"])
-                return self.redirect_with_message(
-                    f"/artists/{artist_id}/songs",
-                    success="Song deleted successfully.",
-                )
-            except Exception as e:
-                return self.redirect_with_message(
-                    f"/artists/{artist_id}/songs",
-                    error=f"Song delete failed: {e}",
-                )
+    @router.post(
+        "/songs/delete",
+        login_required,
+        role_required(Role.ARTIST.value, message="Only artist can delete songs."),
+    )
+    def delete_song(self):
+        form = self.form
+        song = song_controller.get_song_by_id(form.get("id"))
+        if not song or not self.can_access_artist_songs(self.user, song["artist_id"]):
+            return self.forbidden(
+                "You can only delete songs for your own artist profile."
+            )
 
-        return self.not_found(path=path)
+        artist_id = song["artist_id"]
+        try:
+            song_controller.delete_song(form["id"])
+            return self.redirect_with_message(
+                f"/artists/{artist_id}/songs",
+                success="Song deleted successfully.",
+            )
+        except Exception as e:
+            return self.redirect_with_message(
+                f"/artists/{artist_id}/songs",
+                error=f"Song delete failed: {e}",
+            )
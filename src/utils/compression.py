@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+
+from src.utils.stream import compress_bytes, compress_stream, negotiate_encoding
+from src.utils.template import FLUSH
+
+COMPRESSION_LEVEL = int(os.environ.get("AMS_COMPRESSION_LEVEL", "6"))
+MIN_COMPRESS_SIZE = int(os.environ.get("AMS_COMPRESSION_MIN_SIZE", "1024"))
+MAX_LOAD_PER_CPU = float(os.environ.get("AMS_COMPRESSION_MAX_LOAD", "1.5"))
+LOAD_CHECK_INTERVAL = 1.0
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+
+class ResponseCompressor:
+
+    def __init__(
+        self,
+        level=COMPRESSION_LEVEL,
+        min_size=MIN_COMPRESS_SIZE,
+        max_load_per_cpu=MAX_LOAD_PER_CPU,
+        encodings=("gzip", "deflate"),
+    ):
+        self.level = level
+        self.min_size = min_size
+        self.max_load_per_cpu = max_load_per_cpu
+        self.encodings = encodings
+        self._cpus = os.cpu_count() or 1
+        self._saturated = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "compressed": 0,
+            "skipped_small": 0,
+            "skipped_busy": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def cpu_saturated(self):
+        now = time.monotonic()
+        if now - self._checked_at >= LOAD_CHECK_INTERVAL:
+            self._checked_at = now
+            try:
+                load = os.getloadavg()[0]
+            except OSError:
+                load = 0.0
+            self._saturated = load / self._cpus > self.max_load_per_cpu
+        return self._saturated
+
+    def negotiate(self, accept_encoding):
+        if self.level <= 0:
+            return None
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            return None
+        if self.cpu_saturated():
+            self.count("skipped_busy")
+            return None
+        return encoding
+
+    def compressible(self, content_type):
+        return self.level > 0 and content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def compress(self, body, encoding):
+        if len(body) < self.min_size:
+            self.count("skipped_small")
+            return None
+        compressed = compress_bytes(body, encoding, self.level)
+        with self._lock:
+            self._stats["compressed"] += 1
+            self._stats["bytes_in"] += len(body)
+            self._stats["bytes_out"] += len(compressed)
+        return compressed
+
+    def compress_stream(self, chunks, encoding):
+        self.count("compressed")
+
+        def measured():
+            for piece in chunks:
+                if piece is not FLUSH:
+                    if isinstance(piece, str):
+                        piece = piece.encode("utf-8")
+                    self.count("bytes_in", len(piece))
+                yield piece
+
+        for piece in compress_stream(measured(), encoding, self.level):
+            if piece is not FLUSH:
+                self.count("bytes_out", len(piece))
+            yield piece
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["level"] = self.level
+        stats["min_size"] = self.min_size
+        stats["cpu_saturated"] = self._saturated
+        if stats["bytes_in"]:
+            stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 3)
+        return stats
+
+
+default_compressor = ResponseCompressor()
+
+
+def compress_responses(handler):
+    def negotiated(request, **params):
+        request.response_encoding = default_compressor.negotiate(
+            request.headers.get("Accept-Encoding")
+        )
+        return handler(request, **params)
+
+    return negotiated
+
+
+def compression_stats():
+    return default_compressor.stats()
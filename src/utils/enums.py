@@ -19,3 +19,15 @@ class Genre(str, Enum):
     CLASSIC = "classic"
     ROCK = "rock"
     JAZZ = "jazz"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobKind(str, Enum):
+    ARTIST_IMPORT = "artist_import"
+    ARTIST_EXPORT = "artist_export"
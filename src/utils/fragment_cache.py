@@ -0,0 +1,109 @@
+import os
+import threading
+
+from src.database.database import AMSDatabase
+from src.utils.ttl_cache import TTLCache
+
+FRAGMENT_CACHE_SIZE = 512
+FRAGMENT_TTL = 300.0
+VERSIONED_TABLES = ("users", "artists", "songs")
+
+
+class TableVersions:
+
+    def __init__(self, shared=False):
+        self.shared = shared
+        self._versions = dict.fromkeys(VERSIONED_TABLES, 0)
+        self._lock = threading.Lock()
+
+    def get(self, tables):
+        if not self.shared:
+            return tuple(self._versions[table] for table in tables)
+        with AMSDatabase.connection() as conn:
+            rows = conn.execute("SELECT table_name, version FROM table_versions")
+            versions = {row["table_name"]: row["version"] for row in rows}
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+
+class FragmentCache:
+
+    def __init__(self, versions, max_entries=FRAGMENT_CACHE_SIZE, ttl=FRAGMENT_TTL):
+        self.versions = versions
+        self.store = TTLCache(ttl, max_entries)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def key(self, tables, *parts):
+        return (tables, self.versions.get(tables)) + parts
+
+    def fragments(self, key, render):
+        cached = self.store.get(key)
+        if cached is not None:
+            self.count("hits")
+            return [[fragment] for fragment in cached]
+        self.count("misses")
+        return self.capture(key, render())
+
+    def capture(self, key, streams):
+        captured = [[] for _ in streams]
+        done = []
+
+        def tee(index, pieces):
+            for piece in pieces:
+                captured[index].append(piece)
+                yield piece
+            done.append(index)
+            if len(done) == len(streams):
+                self.store.set(key, tuple("".join(parts) for parts in captured))
+                self.count("stores")
+
+        return [tee(index, pieces) for index, pieces in enumerate(streams)]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["entries"] = len(self.store)
+        stats["shared_versions"] = self.versions.shared
+        return stats
+
+
+table_versions = TableVersions()
+fragment_cache = FragmentCache(table_versions)
+
+
+def cached_fragments(tables, key, render):
+    return fragment_cache.fragments(fragment_cache.key(tables, *key), render)
+
+
+def current_table_versions(*tables):
+    return table_versions.get(tables)
+
+
+def bump_table_versions(*tables):
+    table_versions.bump(*tables)
+
+
+def use_shared_table_versions(shared=True):
+    table_versions.shared = shared
+
+
+def fragment_stats():
+    return fragment_cache.stats()
+
+
+def reset_fragment_cache():
+    global fragment_cache
+    fragment_cache = FragmentCache(table_versions)
+    table_versions._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=reset_fragment_cache)
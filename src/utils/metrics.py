@@ -0,0 +1,335 @@
+import contextvars
+import cProfile
+import heapq
+import hmac
+import itertools
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_TOKEN = os.environ.get("AMS_METRICS_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("AMS_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.environ.get(
+    "AMS_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "ams-profiles")
+)
+PROFILE_KEEP = int(os.environ.get("AMS_PROFILE_KEEP", "20"))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+METRIC_NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_]+")
+
+_current = contextvars.ContextVar("ams_request_metrics", default=None)
+
+
+class RequestMetrics:
+
+    def __init__(self, method):
+        self.method = method
+        self.route = UNMATCHED_ROUTE
+        self.status = None
+        self.sql_time = 0.0
+        self.sql_queries = 0
+        self.template_time = 0.0
+        self.hash_time = 0.0
+        self.delay_time = 0.0
+        self.statements = {}
+
+    def nested_time(self):
+        return self.sql_time + self.template_time + self.hash_time
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield format_value(bound), cumulative
+        yield "+Inf", self.count
+
+
+HISTOGRAMS = (
+    (
+        "ams_http_request_duration_seconds",
+        "Request latency by route.",
+        LATENCY_BUCKETS,
+        lambda request, elapsed: elapsed,
+    ),
+    (
+        "ams_sql_duration_seconds",
+        "Time spent executing SQL per request.",
+        LATENCY_BUCKETS,
+        lambda request, elapsed: request.sql_time,
+    ),
+    (
+        "ams_sql_queries_per_request",
+        "SQL statements executed per request.",
+        QUERY_COUNT_BUCKETS,
+        lambda request, elapsed: request.sql_queries,
+    ),
+    (
+        "ams_template_duration_seconds",
+        "Time spent rendering templates per request.",
+        LATENCY_BUCKETS,
+        lambda request, elapsed: request.template_time,
+    ),
+    (
+        "ams_password_hash_duration_seconds",
+        "Time spent waiting on bcrypt per request.",
+        LATENCY_BUCKETS,
+        lambda request, elapsed: request.hash_time,
+    ),
+    (
+        "ams_response_delay_seconds",
+        "Deliberate delay added to failed logins for unknown emails per request.",
+        LATENCY_BUCKETS,
+        lambda request, elapsed: request.delay_time,
+    ),
+)
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else f"{value:.1f}"
+    return str(value)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+
+def metric_name(*parts):
+    return METRIC_NAME_PATTERN.sub("_", "_".join(parts)).lower()
+
+
+def flatten_stats(prefix, stats):
+    for key, value in stats.items():
+        name = metric_name(prefix, key)
+        if isinstance(value, dict):
+            yield from flatten_stats(name, value)
+        elif isinstance(value, (bool, int, float)):
+            yield name, float(value) if isinstance(value, bool) else value
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._histograms = {}
+
+    def observe(self, request, elapsed):
+        labels = (("method", request.method), ("route", request.route))
+        with self._lock:
+            key = labels + (("status", request.status or 500),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histograms = self._histograms.get(labels)
+            if histograms is None:
+                histograms = [Histogram(buckets) for _, _, buckets, _ in HISTOGRAMS]
+                self._histograms[labels] = histograms
+            for histogram, (_, _, _, value) in zip(histograms, HISTOGRAMS):
+                histogram.observe(value(request, elapsed))
+
+    def render(self, sections=None):
+        lines = [
+            "# HELP ams_http_requests_total Requests served by route and status.",
+            "# TYPE ams_http_requests_total counter",
+        ]
+        with self._lock:
+            requests = sorted(self._requests.items())
+            histograms = sorted(
+                (labels, [(h.total, h.count, list(h.samples())) for h in values])
+                for labels, values in self._histograms.items()
+            )
+        for labels, count in requests:
+            lines.append(f"ams_http_requests_total{format_labels(labels)} {count}")
+
+        for index, (name, help_text, _, _) in enumerate(HISTOGRAMS):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, values in histograms:
+                total, count, samples = values[index]
+                for bound, cumulative in samples:
+                    bucket_labels = format_labels(labels + (("le", bound),))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {format_value(total)}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+        for section, stats in (sections or {}).items():
+            for name, value in flatten_stats(f"ams_{section}", stats):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestProfiler:
+
+    def __init__(
+        self, sample_rate=PROFILE_SAMPLE_RATE, directory=PROFILE_DIR, keep=PROFILE_KEEP
+    ):
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._slowest = []
+        self._sequence = itertools.count()
+        self._stats = {"sampled": 0, "dumped": 0}
+
+    def start(self):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def finish(self, profile, request, elapsed):
+        profile.disable()
+        with self._lock:
+            self._stats["sampled"] += 1
+            if len(self._slowest) >= self.keep and elapsed <= self._slowest[0][0]:
+                return None
+            slug = metric_name(f"{request.method} {request.route}").strip("_")
+            filename = f"{elapsed * 1000:09.1f}ms-{slug}-{os.getpid()}"
+            path = os.path.join(
+                self.directory, f"{filename}-{next(self._sequence)}.prof"
+            )
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+            self._stats["dumped"] += 1
+            heapq.heappush(self._slowest, (elapsed, path))
+            if len(self._slowest) > self.keep:
+                _, evicted = heapq.heappop(self._slowest)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+        return path
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            slowest = max(self._slowest, default=None)
+        stats["sample_rate"] = self.sample_rate
+        stats["kept"] = len(self._slowest)
+        if slowest is not None:
+            stats["slowest_ms"] = round(slowest[0] * 1000, 1)
+        return stats
+
+
+def current_request():
+    return _current.get()
+
+
+def record_sql(elapsed, queries=1):
+    request = _current.get()
+    if request is not None:
+        request.sql_time += elapsed
+        request.sql_queries += queries
+
+
+def record_template(elapsed):
+    request = _current.get()
+    if request is not None:
+        request.template_time += elapsed
+
+
+def record_hash(elapsed):
+    request = _current.get()
+    if request is not None:
+        request.hash_time += elapsed
+
+
+def record_response_delay(elapsed):
+    request = _current.get()
+    if request is not None:
+        request.delay_time += elapsed
+
+
+def timed_stream(pieces):
+    request = _current.get()
+    if request is None:
+        yield from pieces
+        return
+    iterator = iter(pieces)
+    done = object()
+    while True:
+        started = time.perf_counter()
+        nested = request.nested_time()
+        piece = next(iterator, done)
+        elapsed = time.perf_counter() - started
+        request.template_time += elapsed - (request.nested_time() - nested)
+        if piece is done:
+            return
+        yield piece
+
+
+@contextmanager
+def track_request(method):
+    request = RequestMetrics(method)
+    token = _current.set(request)
+    profile = request_profiler.start()
+    started = time.perf_counter()
+    try:
+        yield request
+    finally:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if profile is not None:
+            request_profiler.finish(profile, request, elapsed)
+        registry.observe(request, elapsed)
+
+
+def metrics_authorized(authorization):
+    if not METRICS_TOKEN or not authorization:
+        return False
+    scheme, _, token = authorization.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(
+        token.strip().encode(), METRICS_TOKEN.encode()
+    )
+
+
+def render_metrics(sections=None):
+    return registry.render(sections)
+
+
+def profiling_stats():
+    return request_profiler.stats()
+
+
+registry = None
+request_profiler = None
+
+
+def reset_metrics():
+    global registry, request_profiler
+    registry = MetricsRegistry()
+    request_profiler = RequestProfiler()
+
+
+reset_metrics()
+os.register_at_fork(after_in_child=reset_metrics)
@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+MAX_ROW_ID = 2**63 - 1
+
+Page = namedtuple("Page", ["rows", "total", "next_cursor", "prev_cursor"])
+
+
+def encode_cursor(*values):
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if not isinstance(values, list) or not values:
+        return None
+    if len(values) == 1 and is_row_id(values[0]):
+        return values
+    if len(values) == 2 and isinstance(values[0], str) and is_row_id(values[1]):
+        return values
+    return None
+
+
+def is_row_id(value):
+    return type(value) is int and -MAX_ROW_ID - 1 <= value <= MAX_ROW_ID
+
+
+def decode_id_cursor(token):
+    values = decode_cursor(token)
+    if not values or len(values) != 1:
+        return None
+    return values[0]
+
+
+def fetch_id_desc_page(conn, table, total, after=None, before=None, page_size=5):
+    if before is not None:
+        rows = conn.execute(
+            f"SELECT * FROM {table} WHERE id > ? ORDER BY id ASC LIMIT ?",
+            (before, page_size + 1),
+        ).fetchall()
+        has_prev = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next = True
+    else:
+        rows = conn.execute(
+            f"SELECT * FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (MAX_ROW_ID if after is None else after, page_size + 1),
+        ).fetchall()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = after is not None
+
+    next_cursor = encode_cursor(rows[-1]["id"]) if rows and has_next else None
+    prev_cursor = encode_cursor(rows[0]["id"]) if rows and has_prev else None
+    return Page(rows, total, next_cursor, prev_cursor)
@@ -1,10 +1,243 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import bcrypt
 
+from src.prefork import watch_parent
+from src.utils.metrics import record_hash
+
+HASH_WORKERS = int(os.environ.get("AMS_HASH_WORKERS", "0")) or os.cpu_count() or 1
+BCRYPT_ROUNDS = int(os.environ.get("AMS_BCRYPT_ROUNDS", "12"))
+MAX_CONCURRENT_VERIFICATIONS = HASH_WORKERS * 4
+VERIFY_TIMEOUT = 10.0
+LATENCY_WINDOW = 1024
+DUMMY_PASSWORD = "ams-dummy-password"
+
+
+class HashingBusyError(Exception):
+    pass
+
+
+def bcrypt_hash(password, rounds=BCRYPT_ROUNDS):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds))
+
+
+def bcrypt_verify(password, hashed):
+    return bcrypt.checkpw(password.encode("utf-8"), hashed)
+
+
+def hash_rounds(hashed):
+    if isinstance(hashed, str):
+        hashed = hashed.encode("utf-8")
+    try:
+        return int(hashed.split(b"$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+
+    def __init__(
+        self,
+        rounds=BCRYPT_ROUNDS,
+        workers=HASH_WORKERS,
+        max_concurrent_verifications=MAX_CONCURRENT_VERIFICATIONS,
+        verify_timeout=VERIFY_TIMEOUT,
+    ):
+        self.rounds = rounds
+        self.workers = workers
+        self.verify_timeout = verify_timeout
+        self._verify_slots = threading.BoundedSemaphore(max_concurrent_verifications)
+        self._executor = None
+        self._dummy_hash = None
+        self._lock = threading.Lock()
+        self._latencies = {
+            "hash": deque(maxlen=LATENCY_WINDOW),
+            "verify": deque(maxlen=LATENCY_WINDOW),
+        }
+        self._stats = {
+            "hashes": 0,
+            "verifications": 0,
+            "rehashes": 0,
+            "rejected": 0,
+            "pending": 0,
+            "verifying": 0,
+        }
+
+    def get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=watch_parent,
+                        initargs=(os.getpid(),),
+                    )
+        return self._executor
+
+    def _run(self, kind, fn, *args):
+        with self._lock:
+            self._stats["pending"] += 1
+        started = time.perf_counter()
+        try:
+            return self.get_executor().submit(fn, *args).result()
+        finally:
+            elapsed = time.perf_counter() - started
+            record_hash(elapsed)
+            with self._lock:
+                self._stats["pending"] -= 1
+                self._latencies[kind].append(elapsed)
+
+    def hash(self, password):
+        result = self._run("hash", bcrypt_hash, password, self.rounds)
+        with self._lock:
+            self._stats["hashes"] += 1
+        return result
+
+    def hash_many(self, passwords):
+        passwords = list(passwords)
+        if len(passwords) <= 1:
+            return [self.hash(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        with self._lock:
+            self._stats["pending"] += len(passwords)
+        started = time.perf_counter()
+        try:
+            return list(
+                self.get_executor().map(
+                    bcrypt_hash,
+                    passwords,
+                    [self.rounds] * len(passwords),
+                    chunksize=chunksize,
+                )
+            )
+        finally:
+            elapsed = time.perf_counter() - started
+            record_hash(elapsed)
+            per_hash = elapsed / len(passwords)
+            with self._lock:
+                self._stats["pending"] -= len(passwords)
+                self._stats["hashes"] += len(passwords)
+                self._latencies["hash"].append(per_hash)
+
+    def verify(self, password, hashed):
+        if not self._verify_slots.acquire(timeout=self.verify_timeout):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise HashingBusyError("Too many concurrent password checks.")
+        with self._lock:
+            self._stats["verifying"] += 1
+        try:
+            return self._run("verify", bcrypt_verify, password, hashed)
+        finally:
+            with self._lock:
+                self._stats["verifying"] -= 1
+                self._stats["verifications"] += 1
+            self._verify_slots.release()
+
+    def typical_verify_time(self):
+        with self._lock:
+            values = sorted(self._latencies["verify"])
+        return values[len(values) // 2] if values else None
+
+    def simulate_verify(self, elapsed=0.0):
+        typical = self.typical_verify_time()
+        if typical is not None:
+            return max(typical - elapsed, 0)
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(DUMMY_PASSWORD)
+        self.verify(DUMMY_PASSWORD + "!", self._dummy_hash)
+        return 0.0
+
+    def needs_rehash(self, hashed):
+        return hash_rounds(hashed) != self.rounds
+
+    def rehash(self, password):
+        result = self.hash(password)
+        with self._lock:
+            self._stats["rehashes"] += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = {
+                kind: sorted(values) for kind, values in self._latencies.items()
+            }
+        stats["queue_depth"] = max(stats["pending"] - self.workers, 0)
+        stats["rounds"] = self.rounds
+        stats["workers"] = self.workers
+        for kind, values in latencies.items():
+            for label, quantile in (("p50", 0.5), ("p99", 0.99)):
+                value = values[int(len(values) * quantile)] if values else 0
+                stats[f"{kind}_{label}_ms"] = round(value * 1000, 1)
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher():
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher()
+    return _hasher
+
 
 def hash_password(password):
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode("utf-8"), salt)
+    return get_hasher().hash(password)
+
+
+def hash_passwords(passwords):
+    return get_hasher().hash_many(passwords)
 
 
 def verify_password(password, hashed):
-    return bcrypt.checkpw(password.encode("utf-8"), hashed)
+    return get_hasher().verify(password, hashed)
+
+
+def simulate_verify(elapsed=0.0):
+    return get_hasher().simulate_verify(elapsed)
+
+
+def needs_rehash(hashed):
+    return get_hasher().needs_rehash(hashed)
+
+
+def rehash_password(password):
+    return get_hasher().rehash(password)
+
+
+def hashing_stats():
+    return get_hasher().stats()
+
+
+def reset_hasher():
+    global _hasher, _hasher_lock
+    _hasher = None
+    _hasher_lock = threading.Lock()
+
+
+def shutdown_hasher():
+    global _hasher
+    with _hasher_lock:
+        hasher, _hasher = _hasher, None
+    if hasher is not None:
+        hasher.shutdown()
+
+
+os.register_at_fork(after_in_child=reset_hasher)
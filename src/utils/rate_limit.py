@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.utils.ttl_cache import TTLCache
+
+MAX_TRACKED_KEYS = 100000
+LOGIN_IP_LIMIT = (20, 10)
+LOGIN_EMAIL_LIMIT = (5, 5)
+REGISTER_IP_LIMIT = (5, 2)
+REGISTER_EMAIL_LIMIT = (3, 1)
+UNKNOWN_EMAIL_TTL = 60.0
+UNKNOWN_EMAIL_CACHE_SIZE = 100000
+
+
+class TokenBucketLimiter:
+
+    def __init__(self, burst, per_minute, max_keys=MAX_TRACKED_KEYS):
+        self.capacity = burst
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / self.rate
+                self.rejected += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def stats(self):
+        with self._lock:
+            return {"tracked": len(self._buckets), "rejected": self.rejected}
+
+
+class Throttle:
+
+    def __init__(self, ip_limit, email_limit, max_keys=MAX_TRACKED_KEYS):
+        self.by_ip = TokenBucketLimiter(*ip_limit, max_keys=max_keys)
+        self.by_email = TokenBucketLimiter(*email_limit, max_keys=max_keys)
+
+    def acquire(self, ip, email):
+        retry_after = self.by_ip.acquire(ip)
+        if retry_after or not email:
+            return retry_after
+        return self.by_email.acquire(email)
+
+    def stats(self):
+        return {"ip": self.by_ip.stats(), "email": self.by_email.stats()}
+
+
+login_throttle = None
+register_throttle = None
+unknown_emails = None
+
+
+def reset_throttles():
+    global login_throttle, register_throttle, unknown_emails
+    login_throttle = Throttle(LOGIN_IP_LIMIT, LOGIN_EMAIL_LIMIT)
+    register_throttle = Throttle(REGISTER_IP_LIMIT, REGISTER_EMAIL_LIMIT)
+    unknown_emails = TTLCache(UNKNOWN_EMAIL_TTL, UNKNOWN_EMAIL_CACHE_SIZE)
+
+
+def throttle_login(ip, email):
+    return login_throttle.acquire(ip, email)
+
+
+def throttle_register(ip, email):
+    return register_throttle.acquire(ip, email)
+
+
+def is_unknown_email(email, version):
+    return unknown_emails.get(email) == version
+
+
+def remember_unknown_email(email, version):
+    unknown_emails.set(email, version)
+
+
+def forget_unknown_email(email):
+    if email:
+        unknown_emails.delete(email.strip().lower())
+
+
+def throttle_stats():
+    return {
+        "login": login_throttle.stats(),
+        "register": register_throttle.stats(),
+        "unknown_emails": len(unknown_emails),
+    }
+
+
+reset_throttles()
+os.register_at_fork(after_in_child=reset_throttles)
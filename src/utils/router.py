@@ -0,0 +1,157 @@
+from collections import namedtuple
+
+RouteMatch = namedtuple("RouteMatch", ["route", "params", "allowed"])
+
+
+def parse_int_param(value):
+    if value.isascii() and value.isdigit():
+        return int(value)
+    return None
+
+
+def parse_str_param(value):
+    return value or None
+
+
+PARAM_TYPES = {
+    "int": parse_int_param,
+    "str": parse_str_param,
+    "path": parse_str_param,
+}
+
+
+def split_path(path):
+    return path.removeprefix("/").split("/")
+
+
+def parse_param(segment):
+    if not (segment.startswith("{") and segment.endswith("}")):
+        return None
+    name, _, kind = segment[1:-1].partition(":")
+    kind = kind or "str"
+    if kind not in PARAM_TYPES:
+        raise ValueError(f"Unknown path parameter type: {kind}")
+    return name, kind
+
+
+class Route:
+
+    def __init__(self, method, pattern, handler, middleware=(), raw_body=False):
+        self.method = method
+        self.pattern = pattern
+        self.handler = handler
+        self.raw_body = raw_body
+        endpoint = handler
+        for wrap in reversed(middleware):
+            endpoint = wrap(endpoint)
+        self.endpoint = endpoint
+
+    def __call__(self, request, params):
+        return self.endpoint(request, **params)
+
+
+class RouteNode:
+
+    def __init__(self):
+        self.children = {}
+        self.params = []
+        self.routes = {}
+
+    def child(self, segment):
+        param = parse_param(segment)
+        if param is None:
+            return self.children.setdefault(segment, RouteNode())
+        name, kind = param
+        for existing_name, existing_kind, node in self.params:
+            if existing_kind == kind:
+                if existing_name != name:
+                    raise ValueError(
+                        f"Conflicting parameter names {{{existing_name}}} and {{{name}}}"
+                    )
+                return node
+        node = RouteNode()
+        self.params.append((name, kind, node))
+        return node
+
+    def find(self, segments, index, params):
+        if index == len(segments):
+            return (self.routes, params) if self.routes else None
+
+        segment = segments[index]
+        child = self.children.get(segment)
+        if child is not None:
+            found = child.find(segments, index + 1, params)
+            if found is not None:
+                return found
+
+        for name, kind, node in self.params:
+            if kind == "path":
+                if "" in segments[index:]:
+                    continue
+                value = "/".join(segments[index:])
+                next_index = len(segments)
+            else:
+                value = PARAM_TYPES[kind](segment)
+                next_index = index + 1
+            if value is None:
+                continue
+            found = node.find(segments, next_index, {**params, name: value})
+            if found is not None:
+                return found
+        return None
+
+
+class Router:
+
+    def __init__(self, middleware=()):
+        self.middleware = list(middleware)
+        self.static_routes = {}
+        self.root = RouteNode()
+
+    def add(self, method, pattern, handler, middleware=(), **options):
+        route = Route(
+            method, pattern, handler, self.middleware + list(middleware), **options
+        )
+        segments = split_path(pattern)
+        if not any(parse_param(segment) for segment in segments):
+            routes = self.static_routes.setdefault(pattern, {})
+        else:
+            node = self.root
+            for position, segment in enumerate(segments):
+                param = parse_param(segment)
+                if param and param[1] == "path" and position != len(segments) - 1:
+                    raise ValueError(f"{{{param[0]}:path}} must be the last segment")
+                node = node.child(segment)
+            routes = node.routes
+        if method in routes:
+            raise ValueError(f"Duplicate route: {method} {pattern}")
+        routes[method] = route
+        return route
+
+    def get(self, pattern, *middleware, **options):
+        return self.route("GET", pattern, *middleware, **options)
+
+    def post(self, pattern, *middleware, **options):
+        return self.route("POST", pattern, *middleware, **options)
+
+    def route(self, method, pattern, *middleware, **options):
+        def register(handler):
+            self.add(method, pattern, handler, middleware, **options)
+            return handler
+
+        return register
+
+    def resolve(self, path):
+        routes = self.static_routes.get(path)
+        if routes is not None:
+            return routes, {}
+        return self.root.find(split_path(path), 0, {}) or (None, None)
+
+    def match(self, method, path):
+        routes, params = self.resolve(path)
+        if routes is None:
+            return None
+        route = routes.get(method)
+        if route is None:
+            return RouteMatch(None, params, sorted(routes))
+        return RouteMatch(route, params, None)
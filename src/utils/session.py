@@ -1,8 +1,8 @@
 import secrets
-from http import HTTPStatus
+
+from src.utils.session_store import get_session_store
 
 SESSION_COOKIE_NAME = "ams_session_id"
-_SESSIONS = {}
 
 
 def parse_cookies(cookie_header):
@@ -29,30 +29,35 @@ def get_user_from_session(handler):
     session_id = get_session_id(handler)
     if not session_id:
         return None
-    return _SESSIONS.get(session_id)
+    return get_session_store().get(session_id)
 
 
 def create_session(user):
     session_id = secrets.token_urlsafe(32)
-    _SESSIONS[session_id] = {
-        "id": user.get("id"),
-        "email": user.get("email"),
-        "role": user.get("role"),
-        "first_name": user.get("first_name"),
-        "last_name": user.get("last_name"),
-    }
+    get_session_store().create(
+        session_id,
+        {
+            "id": user.get("id"),
+            "email": user.get("email"),
+            "role": user.get("role"),
+            "first_name": user.get("first_name"),
+            "last_name": user.get("last_name"),
+            "artist_id": user.get("artist_id"),
+        },
+    )
     return session_id
 
 
 def destroy_session(session_id):
     if session_id:
-        _SESSIONS.pop(session_id, None)
+        get_session_store().delete(session_id)
+
+
+def destroy_user_sessions(user_id):
+    if user_id:
+        get_session_store().delete_user(int(user_id))
 
 
-def require_login(handler):
-    if get_user_from_session(handler):
-        return True
-    handler.send_response(HTTPStatus.SEE_OTHER)
-    handler.send_header("Location", "/login")
-    handler.end_headers()
-    return False
+def refresh_user_sessions(user_id, changes):
+    if user_id and changes:
+        get_session_store().update_user(int(user_id), changes)
@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from src.database.database import AMSDatabase
+from src.utils.ttl_cache import TTLCache
+
+SESSION_TTL = 8 * 60 * 60
+SESSION_MAX_ENTRIES = 10000
+SESSION_CACHE_SIZE = 1024
+SESSION_CACHE_TTL = 5.0
+SESSION_SWEEP_INTERVAL = 60.0
+SESSION_BACKEND = os.environ.get("AMS_SESSION_BACKEND", "sqlite")
+SESSIONS_VERSION_SQL = "SELECT version FROM table_versions WHERE table_name = 'sessions'"
+BUMP_SESSIONS_VERSION_SQL = (
+    "UPDATE table_versions SET version = version + 1 WHERE table_name = 'sessions'"
+)
+
+
+class SessionStore(ABC):
+
+    @abstractmethod
+    def get(self, session_id):
+        ...
+
+    @abstractmethod
+    def create(self, session_id, data):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id):
+        ...
+
+    @abstractmethod
+    def delete_user(self, user_id):
+        ...
+
+    @abstractmethod
+    def update_user(self, user_id, changes):
+        ...
+
+    def sweep(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+
+    def __init__(self, ttl=SESSION_TTL, max_entries=SESSION_MAX_ENTRIES):
+        self._entries = TTLCache(ttl, max_entries)
+
+    def get(self, session_id):
+        return self._entries.get(session_id)
+
+    def create(self, session_id, data, expires_at=None):
+        self._entries.set(session_id, data, expires_at)
+
+    def delete(self, session_id):
+        self._entries.delete(session_id)
+
+    def delete_user(self, user_id):
+        return self._entries.delete_matching(
+            lambda session_id, data: data.get("id") == user_id
+        )
+
+    def update_user(self, user_id, changes):
+        return self._entries.update_matching(
+            lambda session_id, data: data.get("id") == user_id,
+            lambda data: {**data, **changes},
+        )
+
+    def sweep(self):
+        return self._entries.sweep()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteSessionStore(SessionStore):
+
+    def __init__(
+        self,
+        ttl=SESSION_TTL,
+        cache_size=SESSION_CACHE_SIZE,
+        cache_ttl=SESSION_CACHE_TTL,
+        sweep_interval=SESSION_SWEEP_INTERVAL,
+    ):
+        self.ttl = ttl
+        self.cache = TTLCache(cache_ttl, cache_size)
+        self.sweep_interval = sweep_interval
+        self._stopped = threading.Event()
+        self._sweeper = None
+        self._sweeper_lock = threading.Lock()
+
+    @staticmethod
+    def revocation_version(conn):
+        row = conn.execute(SESSIONS_VERSION_SQL).fetchone()
+        return row["version"] if row else 0
+
+    def get(self, session_id):
+        now = time.time()
+        with AMSDatabase.connection() as conn:
+            version = self.revocation_version(conn)
+            cached = self.cache.get(session_id)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            self.start_sweeper()
+            row = conn.execute(
+                "SELECT data, expires_at FROM sessions WHERE id = ? AND expires_at > ?",
+                (session_id, now),
+            ).fetchone()
+        if row is None:
+            return None
+
+        data = json.loads(row["data"])
+        if row["expires_at"] - now < self.ttl / 2:
+            self.touch(session_id, now + self.ttl)
+        self.cache.set(session_id, (version, data))
+        return data
+
+    def create(self, session_id, data):
+        now = time.time()
+
+        def _create(conn):
+            conn.execute(
+                """
+                INSERT INTO sessions (id, user_id, data, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    session_id,
+                    data.get("id"),
+                    json.dumps(data),
+                    datetime.now(),
+                    now + self.ttl,
+                ),
+            )
+            return self.revocation_version(conn)
+
+        version = AMSDatabase.write(_create)
+        self.cache.set(session_id, (version, data))
+
+    def touch(self, session_id, expires_at):
+        def _touch(conn):
+            conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE id = ?",
+                (expires_at, session_id),
+            )
+
+        AMSDatabase.write(_touch)
+
+    def delete(self, session_id):
+        self.cache.delete(session_id)
+
+        def _delete(conn):
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.execute(BUMP_SESSIONS_VERSION_SQL)
+
+        AMSDatabase.write(_delete)
+
+    def delete_user(self, user_id):
+        self.cache.delete_matching(
+            lambda session_id, entry: entry[1].get("id") == user_id
+        )
+
+        def _delete_user(conn):
+            deleted = conn.execute(
+                "DELETE FROM sessions WHERE user_id = ?", (user_id,)
+            ).rowcount
+            conn.execute(BUMP_SESSIONS_VERSION_SQL)
+            return deleted
+
+        return AMSDatabase.write(_delete_user)
+
+    def update_user(self, user_id, changes):
+        self.cache.delete_matching(
+            lambda session_id, entry: entry[1].get("id") == user_id
+        )
+
+        def _update_user(conn):
+            rows = conn.execute(
+                "SELECT id, data FROM sessions WHERE user_id = ?", (user_id,)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE sessions SET data = ? WHERE id = ?",
+                [
+                    (json.dumps({**json.loads(row["data"]), **changes}), row["id"])
+                    for row in rows
+                ],
+            )
+            conn.execute(BUMP_SESSIONS_VERSION_SQL)
+            return len(rows)
+
+        return AMSDatabase.write(_update_user)
+
+    def sweep(self):
+        self.cache.sweep()
+
+        def _sweep(conn):
+            return conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+        return AMSDatabase.write(_sweep)
+
+    def start_sweeper(self):
+        if self._sweeper is not None or self.sweep_interval is None:
+            return
+        with self._sweeper_lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, name="ams-session-sweeper", daemon=True
+                )
+                self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stopped.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception:
+                pass
+
+    def close(self):
+        self._stopped.set()
+        with self._sweeper_lock:
+            sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None:
+            sweeper.join()
+
+
+SESSION_BACKENDS = {
+    "memory": MemorySessionStore,
+    "sqlite": SQLiteSessionStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SESSION_BACKENDS[SESSION_BACKEND]()
+    return _store
+
+
+def set_session_store(store):
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    if previous is not None and previous is not store:
+        previous.close()
+
+
+def close_session_store():
+    set_session_store(None)
+
+
+def reset_session_store():
+    global _store, _store_lock
+    _store = None
+    _store_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=reset_session_store)
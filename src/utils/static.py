@@ -0,0 +1,142 @@
+import gzip
+import mimetypes
+import os
+import stat as stat_module
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote
+
+from src.utils.compression import COMPRESSIBLE_TYPES
+from src.utils.stream import accepts_gzip
+from src.utils.template import DEV_MODE
+
+STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "static",
+)
+STATIC_MAX_AGE = 3600
+MAX_CACHED_ASSET_SIZE = 256 * 1024
+MIN_GZIP_SIZE = 512
+GZIP_LEVEL = 9
+
+
+def etag_matches(if_none_match, etag):
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class StaticAsset:
+
+    def __init__(self, path, stat):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        self.content_type = content_type
+        self.body = None
+        self.gzip_body = None
+
+    def load(self, max_cached_size=MAX_CACHED_ASSET_SIZE):
+        if self.size > max_cached_size:
+            return self
+        with open(self.path, "rb") as f:
+            self.body = f.read()
+        if self.compressible and self.size >= MIN_GZIP_SIZE:
+            compressed = gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+            if len(compressed) < self.size * 0.9:
+                self.gzip_body = compressed
+        return self
+
+    def variant(self, accept_encoding):
+        if self.gzip_body is not None and accepts_gzip(accept_encoding):
+            return self.gzip_body, self.etag[:-1] + '-gz"', "gzip"
+        return self.body, self.etag, None
+
+    def not_modified(self, headers, etag):
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match:
+            return etag_matches(if_none_match, etag)
+        if_modified_since = headers.get("If-Modified-Since")
+        if not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return self.mtime_ns // 1_000_000_000 <= since
+
+
+class StaticFiles:
+
+    def __init__(
+        self,
+        directory=STATIC_DIR,
+        auto_reload=DEV_MODE,
+        max_cached_size=MAX_CACHED_ASSET_SIZE,
+        max_age=STATIC_MAX_AGE,
+    ):
+        self.directory = os.path.realpath(directory)
+        self.auto_reload = auto_reload
+        self.max_cached_size = max_cached_size
+        self.max_age = max_age
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, name):
+        segments = name.split("/")
+        for segment in segments:
+            if not segment or segment.startswith("."):
+                return None
+            if "\\" in segment or "\0" in segment:
+                return None
+        path = os.path.realpath(os.path.join(self.directory, *segments))
+        if os.path.commonpath([path, self.directory]) != self.directory:
+            return None
+        return path
+
+    def get_asset(self, name):
+        name = unquote(name)
+        asset = self._cache.get(name)
+        if asset is not None and asset.body is not None and not self.auto_reload:
+            return asset
+
+        path = self.resolve(name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not stat_module.S_ISREG(stat.st_mode):
+            return None
+        if (
+            asset is not None
+            and asset.mtime_ns == stat.st_mtime_ns
+            and asset.size == stat.st_size
+        ):
+            return asset
+
+        asset = StaticAsset(path, stat).load(self.max_cached_size)
+        with self._lock:
+            self._cache[name] = asset
+        return asset
+
+    def cache_control(self):
+        if self.auto_reload:
+            return "no-cache"
+        return f"public, max-age={self.max_age}"
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+default_static = StaticFiles()
@@ -0,0 +1,90 @@
+import csv
+import zlib
+
+from src.utils.template import FLUSH
+
+GZIP_LEVEL = 6
+ENCODING_WBITS = {
+    "gzip": zlib.MAX_WBITS | 16,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+def negotiate_encoding(accept_encoding, supported=("gzip", "deflate")):
+    weights = {}
+    for token in (accept_encoding or "").split(","):
+        coding, _, params = token.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in supported:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def accepts_gzip(accept_encoding):
+    return negotiate_encoding(accept_encoding, ("gzip",)) == "gzip"
+
+
+class LineBuffer:
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(data)
+
+    def drain(self):
+        data = "".join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_csv(header, batches):
+    buffer = LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.drain()
+
+    first = True
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.drain()
+        if first:
+            yield FLUSH
+            first = False
+
+
+def compress_bytes(data, encoding, level=GZIP_LEVEL):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODING_WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level=GZIP_LEVEL):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODING_WBITS[encoding])
+    for piece in chunks:
+        if piece is FLUSH:
+            yield compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield FLUSH
+            continue
+        data = piece.encode("utf-8") if isinstance(piece, str) else piece
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def gzip_stream(chunks, level=GZIP_LEVEL):
+    return compress_stream(chunks, "gzip", level)
@@ -1,29 +1,128 @@
+import html
 import os
+import re
+import threading
+import time
 from urllib.parse import parse_qs
 
+from src.utils.metrics import record_template, timed_stream
+
 TEMPLATE_DIR = os.path.join("templates")
+DEV_MODE = os.environ.get("AMS_DEV_MODE", "") == "1"
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+FLUSH = object()
 
 
-def render_template(template_name, **context):
-    file_path = os.path.join(TEMPLATE_DIR, template_name)
+class Markup(str):
+    pass
+
+
+class CompiledTemplate:
+
+    def __init__(self, source, mtime=None):
+        self.mtime = mtime
+        self.segments = []
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            if match.start() > position:
+                self.segments.append((source[position : match.start()], None))
+            self.segments.append((match.group(0), match.group(1)))
+            position = match.end()
+        if position < len(source):
+            self.segments.append((source[position:], None))
+
+    def render(self, context, autoescape=False):
+        parts = []
+        append = parts.append
+        for text, key in self.segments:
+            if key is None or key not in context:
+                append(text)
+                continue
+            value = context[key]
+            if autoescape and not isinstance(value, Markup):
+                append(html.escape(str(value)))
+            else:
+                append(str(value))
+        return "".join(parts)
+
+    def iter_render(self, context, autoescape=False):
+        for text, key in self.segments:
+            if key is None or key not in context:
+                yield text
+                continue
+            value = context[key]
+            if is_stream(value):
+                yield FLUSH
+                yield from value
+            elif autoescape and not isinstance(value, Markup):
+                yield html.escape(str(value))
+            else:
+                yield str(value)
+
+
+def is_stream(value):
+    return not isinstance(value, (str, bytes, int, float)) and hasattr(
+        value, "__iter__"
+    )
+
+
+class TemplateEngine:
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    def __init__(self, directory=TEMPLATE_DIR, autoescape=False, auto_reload=DEV_MODE):
+        self.directory = directory
+        self.autoescape = autoescape
+        self.auto_reload = auto_reload
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get_template(self, template_name):
+        template = self._cache.get(template_name)
+        if template is not None and not self.auto_reload:
+            return template
+
+        file_path = os.path.join(self.directory, template_name)
+        mtime = os.path.getmtime(file_path)
+        if template is not None and template.mtime == mtime:
+            return template
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            template = CompiledTemplate(f.read(), mtime)
+        with self._lock:
+            self._cache[template_name] = template
+        return template
+
+    def render(self, template_name, **context):
+        return self.get_template(template_name).render(context, self.autoescape)
+
+    def stream(self, template_name, **context):
+        return self.get_template(template_name).iter_render(context, self.autoescape)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+default_engine = TemplateEngine()
+
+
+def render_template(template_name, **context):
+    started = time.perf_counter()
+    try:
+        return default_engine.render(template_name, **context)
+    finally:
+        record_template(time.perf_counter() - started)
 
-    for key, value in context.items():
-        content = content.replace(f"{{{{{key}}}}}", str(value))
-        content = content.replace(f"{{{{ {key} }}}}", str(value))
 
-    return content
+def stream_template(template_name, **context):
+    return timed_stream(default_engine.stream(template_name, **context))
 
 
 def parse_post_body(handler):
     content_len = int(handler.headers.get("Content-Length", "0"))
     content_type = handler.headers.get("Content-Type", "")
+    raw = handler.rfile.read(content_len) if content_len > 0 else b""
     if "application/x-www-form-urlencoded" in content_type:
-        raw = (
-            handler.rfile.read(content_len).decode("utf-8") if content_len > 0 else ""
-        )
-        parsed = parse_qs(raw)
+        parsed = parse_qs(raw.decode("utf-8"))
         return {k: v[0] if v else "" for k, v in parsed.items()}
     return {}
@@ -1,139 +1,268 @@
 import re
-from datetime import datetime, date
+import string
+import time
+from datetime import date, datetime, timedelta
 
 from src.utils.enums import Role
 
+MINIMUM_AGE = 15
+MINIMUM_RELEASE_YEAR = 1900
+PASSWORD_MIN_LENGTH = 8
+GENDERS = frozenset(("m", "f", "o"))
+ROLES = frozenset(role.value for role in Role)
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_PATTERN = re.compile(r"\d{10}")
+DOB_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+UPPERCASE = frozenset(string.ascii_uppercase)
+LOWERCASE = frozenset(string.ascii_lowercase)
+DIGITS = frozenset(string.digits)
+INVALID = object()
 
-def valid_email(email: str):
-    return re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", email) is not None
+
+class DateBounds:
+    __slots__ = ("year", "latest_dob", "expires")
+
+    def __init__(self, today):
+        tomorrow = today + timedelta(days=1)
+        self.year = today.year
+        self.latest_dob = (today.year - MINIMUM_AGE, today.month, today.day)
+        self.expires = datetime(tomorrow.year, tomorrow.month, tomorrow.day).timestamp()
+
+
+_date_bounds = DateBounds(date.today())
+
+
+def date_bounds():
+    global _date_bounds
+    bounds = _date_bounds
+    if time.time() >= bounds.expires:
+        bounds = _date_bounds = DateBounds(date.today())
+    return bounds
 
 
 def valid_phone(phone):
     if not phone:
         return True
-    return re.fullmatch(r"\d{10}", phone) is not None
+    return PHONE_PATTERN.fullmatch(phone) is not None
 
 
 def valid_password(password):
-    if len(password) < 8:
+    if len(password) < PASSWORD_MIN_LENGTH:
         return False
+    characters = set(password)
+    return not (
+        characters.isdisjoint(UPPERCASE)
+        or characters.isdisjoint(LOWERCASE)
+        or characters.isdisjoint(DIGITS)
+    )
 
-    if not re.search(r"[A-Z]", password):
-        return False
 
-    if not re.search(r"[a-z]", password):
+def valid_dob(dob_string, bounds=None):
+    if not dob_string:
         return False
 
-    if not re.search(r"\d", password):
+    match = DOB_PATTERN.fullmatch(dob_string)
+    if match is None:
+        return False
+    year, month, day = int(match[1]), int(match[2]), int(match[3])
+    try:
+        date(year, month, day)
+    except ValueError:
         return False
 
-    return True
+    return (year, month, day) <= (bounds or date_bounds()).latest_dob
 
 
-def valid_dob(dob_string):
-    if not dob_string:
-        return False
+def check_required(value, bounds):
+    return value if value else INVALID
+
+
+def check_email(value, bounds):
+    value = value.lower()
+    return value if EMAIL_PATTERN.match(value) else INVALID
+
+
+def check_password(value, bounds):
+    return value if valid_password(value) else INVALID
 
-    dob = datetime.strptime(dob_string, "%Y-%m-%d").date()
-    today = date.today()
 
-    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+def check_phone(value, bounds):
+    return value if valid_phone(value) else INVALID
 
-    return age >= 15
 
+def check_dob(value, bounds):
+    return value if valid_dob(value, bounds) else INVALID
 
-def to_int(value):
+
+def check_int(value, bounds):
     try:
-        return int(str(value).strip())
-    except (TypeError, ValueError):
-        return None
+        return int(value)
+    except ValueError:
+        return INVALID
 
 
-def validate_user_create_form(form):
-    required_text_fields = ["first_name", "last_name", "address"]
-    for field in required_text_fields:
-        if not form.get(field, "").strip():
-            return f"{field.replace('_', ' ').title()} is required."
+def check_count(value, bounds):
+    number = check_int(value, bounds)
+    return number if number is not INVALID and number >= 0 else INVALID
+
+
+def check_release_year(value, bounds):
+    return value if MINIMUM_RELEASE_YEAR <= value <= bounds.year else INVALID
+
+
+def choice(options):
+    def check_choice(value, bounds):
+        return value if value in options else INVALID
+
+    return check_choice
 
-    email = form.get("email", "").strip().lower()
-    if not valid_email(email):
-        return "Invalid email format."
 
-    password = form.get("password", "").strip()
-    if not valid_password(password):
-        return "Password must be 8+ chars with uppercase, lowercase, and number."
+def fallback(options, default):
+    def check_fallback(value, bounds):
+        return value if value in options else default
 
-    phone = form.get("phone", "").strip()
-    if not valid_phone(phone):
-        return "Phone number must be exactly 10 digits."
+    return check_fallback
 
-    dob = form.get("dob", "").strip()
-    if not valid_dob(dob):
-        return "DOB is invalid. User must be at least 15 years old."
 
-    gender = form.get("gender", "").strip()
-    if gender not in {"m", "f", "o"}:
-        return "Invalid gender."
+class Rule:
+    __slots__ = ("fields", "check", "message", "when")
 
-    role = form.get("role", "").strip()
-    if role not in {r.value for r in Role}:
-        return "Invalid role."
+    def __init__(self, fields, check, message=None, when=None):
+        self.fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        self.check = check
+        self.message = message
+        self.when = when
 
-    if role == Role.ARTIST.value:
-        if not form.get("stage_name", "").strip():
-            return "Stage name is required for artist role."
-        release_year = to_int(form.get("first_release_year"))
-        if release_year is None:
-            return "First release year must be a valid number."
-        if release_year < 1900 or release_year > date.today().year:
-            return "First release year is out of valid range."
 
-        albums = to_int(form.get("no_of_albums_released"))
-        if albums is None or albums < 0:
-            return "No. of albums released must be 0 or greater."
+class Schema:
 
-    return ""
+    def __init__(
+        self, rules, fields=(), defaults=None, unique=None, duplicate_message=None
+    ):
+        self.rules = tuple(rules)
+        names = dict.fromkeys(fields)
+        for rule in self.rules:
+            names.update(dict.fromkeys(rule.fields))
+        self.fields = tuple(names)
+        self.defaults = defaults or {}
+        self.unique = unique
+        self.duplicate_message = duplicate_message
+
+    def values(self, row):
+        defaults = self.defaults
+        values = {}
+        for name in self.fields:
+            value = row.get(name)
+            values[name] = (value.strip() if value else "") or defaults.get(name, "")
+        return values
+
+    def check(self, values, bounds):
+        for rule in self.rules:
+            if rule.when is not None and not rule.when(values):
+                continue
+            check = rule.check
+            for name in rule.fields:
+                result = check(values[name], bounds)
+                if result is INVALID:
+                    return rule.message
+                values[name] = result
+        return None
+
+    def validate(self, row):
+        return self.check(self.values(row), date_bounds()) or ""
+
+    def clean(self, row):
+        values = self.values(row)
+        error = self.check(values, date_bounds())
+        return (None, error) if error else (values, None)
+
+    def clean_rows(self, rows):
+        bounds = date_bounds()
+        seen = set()
+        for row in rows:
+            values = self.values(row)
+            error = self.check(values, bounds)
+            if error is None and self.unique is not None:
+                key = values[self.unique]
+                if key in seen:
+                    error = self.duplicate_message
+                else:
+                    seen.add(key)
+            yield (None, error) if error else (values, None)
+
+
+def required(*fields):
+    return tuple(
+        Rule(field, check_required, f"{field.replace('_', ' ').title()} is required.")
+        for field in fields
+    )
+
+
+def artist_role(values):
+    return values["role"] == Role.ARTIST.value
+
+
+ACCOUNT_RULES = (
+    Rule("email", check_email, "Invalid email format."),
+    Rule(
+        "password",
+        check_password,
+        "Password must be 8+ chars with uppercase, lowercase, and number.",
+    ),
+    Rule("phone", check_phone, "Phone number must be exactly 10 digits."),
+    Rule("dob", check_dob, "DOB is invalid. User must be at least 15 years old."),
+    Rule("gender", choice(GENDERS), "Invalid gender."),
+)
+
+
+def release_rules(when=None):
+    return (
+        Rule(
+            "first_release_year",
+            check_int,
+            "First release year must be a valid number.",
+            when,
+        ),
+        Rule(
+            "first_release_year",
+            check_release_year,
+            "First release year is out of valid range.",
+            when,
+        ),
+        Rule(
+            "no_of_albums_released",
+            check_count,
+            "No. of albums released must be 0 or greater.",
+            when,
+        ),
+    )
+
+
+USER_FORM_SCHEMA = Schema(
+    required("first_name", "last_name", "address")
+    + ACCOUNT_RULES
+    + (
+        Rule("role", choice(ROLES), "Invalid role."),
+        Rule(
+            "stage_name",
+            check_required,
+            "Stage name is required for artist role.",
+            artist_role,
+        ),
+    )
+    + release_rules(artist_role)
+)
+
+ARTIST_FORM_SCHEMA = Schema(
+    required("first_name", "last_name", "address", "stage_name")
+    + ACCOUNT_RULES
+    + release_rules()
+)
+
+
+def validate_user_create_form(form):
+    return USER_FORM_SCHEMA.validate(form)
 
 
 def validate_artist_create_form(form):
-    required_text_fields = [
-        "first_name",
-        "last_name",
-        "address",
-        "stage_name",
-    ]
-    for field in required_text_fields:
-        if not form.get(field, "").strip():
-            return f"{field.replace('_', ' ').title()} is required."
-
-    email = form.get("email", "").strip().lower()
-    if not valid_email(email):
-        return "Invalid email format."
-
-    password = form.get("password", "").strip()
-    if not valid_password(password):
-        return "Password must be 8+ chars with uppercase, lowercase, and number."
-
-    phone = form.get("phone", "").strip()
-    if not valid_phone(phone):
-        return "Phone number must be exactly 10 digits."
-
-    dob = form.get("dob", "").strip()
-    if not valid_dob(dob):
-        return "DOB is invalid. User must be at least 15 years old."
-
-    gender = form.get("gender", "").strip()
-    if gender not in {"m", "f", "o"}:
-        return "Invalid gender."
-
-    release_year = to_int(form.get("first_release_year"))
-    if release_year is None:
-        return "First release year must be a valid number."
-    if release_year < 1900 or release_year > date.today().year:
-        return "First release year is out of valid range."
-
-    albums = to_int(form.get("no_of_albums_released"))
-    if albums is None or albums < 0:
-        return "No. of albums released must be 0 or greater."
-
-    return ""
+    return ARTIST_FORM_SCHEMA.validate(form)
@@ -0,0 +1,220 @@
+import csv
+import os
+import secrets
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.controllers.artist import ArtistController
+from src.controllers.job import JobController
+from src.database.database import AMSDatabase
+from src.utils.enums import JobKind
+from src.utils.stream import gzip_stream, iter_csv
+from src.utils.template import FLUSH
+
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 5.0
+JOB_FILE_CHUNK_SIZE = 64 * 1024
+JOB_RETENTION = float(os.environ.get("AMS_JOB_RETENTION", str(24 * 60 * 60)))
+JOB_SWEEP_INTERVAL = 5 * 60.0
+
+
+def job_dir():
+    path = os.path.join(os.path.dirname(os.path.abspath(AMSDatabase.DB_PATH)), "jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def save_job_upload(upload, suffix=".csv"):
+    path = os.path.join(job_dir(), f"upload-{secrets.token_hex(8)}{suffix}")
+    upload.seek(0)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(upload, f, JOB_FILE_CHUNK_SIZE)
+    return path
+
+
+def remove_job_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def sweep_jobs(retention=JOB_RETENTION):
+    cutoff = datetime.now() - timedelta(seconds=retention)
+    removed = 0
+    for path in JobController.delete_finished_jobs(cutoff):
+        removed += remove_job_file(path)
+    oldest = time.time() - retention
+    with os.scandir(job_dir()) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < oldest:
+                removed += remove_job_file(entry.path)
+    return removed
+
+
+def run_artist_import(job):
+    path = job["params"]["path"]
+    try:
+        with open(path, "r", encoding="utf-8-sig", errors="ignore", newline="") as f:
+            total = max(sum(1 for _ in csv.reader(f)) - 1, 0)
+            f.seek(0)
+            JobController.update_progress(job["id"], 0, total)
+            report = ArtistController.import_artists(
+                csv.DictReader(f),
+                on_batch=lambda processed: JobController.update_progress(
+                    job["id"], processed
+                ),
+            )
+    finally:
+        os.remove(path)
+    if report.errors and not report.created:
+        raise ValueError(report.summary())
+    return None, report.summary()
+
+
+def run_artist_export(job):
+    columns = job["params"]["columns"]
+    compress = job["params"].get("gzip", False)
+    with AMSDatabase.connection() as conn:
+        total = AMSDatabase.row_count(conn, "artists")
+    JobController.update_progress(job["id"], 0, total)
+
+    def batches():
+        exported = 0
+        for batch in ArtistController.iter_export_batches(columns):
+            yield batch
+            exported += len(batch)
+            JobController.update_progress(job["id"], exported)
+
+    chunks = iter_csv(columns, batches())
+    if compress:
+        chunks = gzip_stream(chunks)
+    suffix = ".csv.gz" if compress else ".csv"
+    path = os.path.join(job_dir(), f"export-{job['id']}{suffix}")
+    with open(path, "wb") as f:
+        for piece in chunks:
+            if piece is FLUSH:
+                continue
+            f.write(piece.encode("utf-8") if isinstance(piece, str) else piece)
+    return path, "Export ready."
+
+
+JOB_HANDLERS = {
+    JobKind.ARTIST_IMPORT.value: run_artist_import,
+    JobKind.ARTIST_EXPORT.value: run_artist_export,
+}
+
+
+class JobWorkerPool:
+
+    def __init__(
+        self,
+        workers=JOB_WORKERS,
+        poll_interval=JOB_POLL_INTERVAL,
+        handlers=None,
+        sweep_interval=JOB_SWEEP_INTERVAL,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.handlers = handlers or JOB_HANDLERS
+        self.sweep_interval = sweep_interval
+        self._wakeup = threading.Condition()
+        self._pending = 0
+        self._stopping = False
+        self._stopped = threading.Event()
+        self._threads = []
+
+    def start(self):
+        JobController.requeue_interrupted_jobs()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"ams-job-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        if self.sweep_interval is not None:
+            thread = threading.Thread(
+                target=self._sweep_loop, name="ams-job-sweeper", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        with self._wakeup:
+            self._pending += 1
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+                self._pending = max(self._pending - 1, 0)
+            job = JobController.claim_next_job()
+            if job is None:
+                with self._wakeup:
+                    if not self._pending and not self._stopping:
+                        self._wakeup.wait(self.poll_interval)
+                continue
+            self._execute(job)
+
+    def _execute(self, job):
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            JobController.fail_job(job["id"], f"Unknown job kind: {job['kind']}")
+            return
+        try:
+            result_path, message = handler(job)
+        except Exception as e:
+            JobController.fail_job(job["id"], str(e))
+            return
+        JobController.finish_job(job["id"], result_path, message)
+
+    def _sweep_loop(self):
+        while True:
+            try:
+                sweep_jobs()
+            except Exception:
+                pass
+            if self._stopped.wait(self.sweep_interval):
+                return
+
+    def stop(self, timeout=None):
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+_job_pool = None
+_job_pool_lock = threading.Lock()
+
+
+def start_job_workers(workers=JOB_WORKERS):
+    global _job_pool
+    with _job_pool_lock:
+        if _job_pool is None:
+            _job_pool = JobWorkerPool(workers)
+            _job_pool.start()
+        return _job_pool
+
+
+def stop_job_workers(timeout=None):
+    global _job_pool
+    with _job_pool_lock:
+        pool, _job_pool = _job_pool, None
+    if pool is not None:
+        pool.stop(timeout)
+
+
+def enqueue_job(kind, owner_id, params=None):
+    job_id = JobController.create_job(kind, owner_id, params)
+    if _job_pool is not None:
+        _job_pool.notify()
+    return job_id
@@ -0,0 +1,101 @@
+import http.client
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from src.database.database import AMSDatabase
+from src.utils.session import SESSION_COOKIE_NAME, create_session
+from src.utils.session_store import MemorySessionStore, set_session_store
+
+SEED_USER = (
+    "Test",
+    "User",
+    "9800000000",
+    "1990-01-01",
+    "o",
+    "Kathmandu",
+)
+
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    original_path = AMSDatabase.DB_PATH
+    AMSDatabase.shutdown()
+    AMSDatabase.DB_PATH = os.path.join(tmp_path, "test.db")
+    AMSDatabase().init_db()
+    yield AMSDatabase
+    AMSDatabase.shutdown()
+    AMSDatabase.DB_PATH = original_path
+
+
+def insert_user(email, role="artist"):
+    def _insert(conn):
+        return conn.execute(
+            """
+            INSERT INTO users
+            (first_name, last_name, email, password_hash, phone, dob, gender, address, role)
+            VALUES (?, ?, ?, '', ?, ?, ?, ?, ?)
+            """,
+            (*SEED_USER[:2], email, *SEED_USER[2:], role),
+        ).lastrowid
+
+    return AMSDatabase.write(_insert)
+
+
+def insert_artist(email, stage_name):
+    user_id = insert_user(email)
+
+    def _insert(conn):
+        return conn.execute(
+            """
+            INSERT INTO artists (user_id, stage_name, first_release_year)
+            VALUES (?, ?, 2001)
+            """,
+            (user_id, stage_name),
+        ).lastrowid
+
+    return AMSDatabase.write(_insert)
+
+
+def login(client, role):
+    user_id = insert_user(f"{role}@example.com", role=role)
+    session_id = create_session({"id": user_id, "role": role, "artist_id": None})
+    client.cookie = f"{SESSION_COOKIE_NAME}={session_id}"
+
+
+class Client:
+
+    def __init__(self, port):
+        self.port = port
+        self.cookie = ""
+
+    def request(self, method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        headers = dict(headers or {})
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.getheaders(), response.read()
+        finally:
+            conn.close()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+
+@pytest.fixture
+def client(scratch_db):
+    from src.server import AMSRequestHandler
+
+    set_session_store(MemorySessionStore())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AMSRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield Client(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+    set_session_store(None)
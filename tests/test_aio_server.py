@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from src.aio_server import AsyncAMSServer
+
+
+async def send_raw(request, max_body_size=1024):
+    server = await AsyncAMSServer("127.0.0.1", 0, max_body_size=max_body_size).start()
+    serving = asyncio.ensure_future(server.serve_forever())
+    try:
+        reader, writer = await asyncio.open_connection(*server.server_address)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await serving
+
+
+@pytest.mark.parametrize("length", ["-1", "-100", "abc"])
+def test_rejects_invalid_content_length(length):
+    response = asyncio.run(
+        send_raw(
+            f"POST /login HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode()
+        )
+    )
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_rejects_oversized_body_before_reading_it():
+    response = asyncio.run(
+        send_raw(
+            b"POST /login HTTP/1.1\r\nHost: x\r\nContent-Length: 1025\r\n\r\n"
+        )
+    )
+    assert response.startswith(b"HTTP/1.1 413 ")
@@ -0,0 +1,118 @@
+import csv
+import io
+
+import pytest
+
+from src.controllers import artist
+from src.controllers.artist import ArtistController
+from src.database.database import AMSDatabase
+from src.utils import rate_limit
+from tests.conftest import insert_artist
+
+CSV_TEXT = """email,stage_name,first_release_year,no_of_albums_released,gender
+new1@example.com,New One,2001,1,f
+taken@example.com,Taken,2002,2,m
+new1@example.com,Copy,2003,3,o
+bad-email,Bad,2004,4,o
+new2@example.com,,2005,5,o
+new3@example.com,New Three,later,1,o
+NEW4@example.com,New Four,2006,0,x
+"""
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setattr(
+        artist, "hash_passwords", lambda passwords: ["hash" for _ in passwords]
+    )
+    rate_limit.reset_throttles()
+
+
+def import_csv(text=CSV_TEXT, **kwargs):
+    return ArtistController.import_artists(csv.DictReader(io.StringIO(text)), **kwargs)
+
+
+def imported_emails():
+    with AMSDatabase.connection() as conn:
+        rows = conn.execute(
+            "SELECT u.email FROM users u JOIN artists a ON a.user_id = u.id"
+        ).fetchall()
+    return sorted(row["email"] for row in rows)
+
+
+def test_report_lists_each_skipped_row_once(scratch_db):
+    insert_artist("taken@example.com", "Already Here")
+
+    report = import_csv(batch_size=2)
+
+    assert report.created == 2
+    assert sorted(report.errors) == [
+        (3, "Email already exists."),
+        (4, "Duplicate email in file."),
+        (5, "Invalid email format."),
+        (
+            6,
+            "stage_name, first_release_year and no_of_albums_released are required.",
+        ),
+        (7, "first_release_year and no_of_albums_released must be numbers."),
+    ]
+    assert report.summary().startswith("Imported 2 artist(s). Skipped 5 row(s): ")
+    assert imported_emails() == [
+        "new1@example.com",
+        "new4@example.com",
+        "taken@example.com",
+    ]
+
+
+def test_rows_taken_during_the_write_are_reported_after_it(scratch_db, monkeypatch):
+    insert_artist("taken@example.com", "Already Here")
+    real_existing = ArtistController.existing_emails
+    calls = []
+
+    def stale_first_check(conn, emails):
+        calls.append(emails)
+        return set() if len(calls) == 1 else real_existing(conn, emails)
+
+    monkeypatch.setattr(ArtistController, "existing_emails", stale_first_check)
+    rate_limit.remember_unknown_email("taken@example.com", (0,))
+    rate_limit.remember_unknown_email("new1@example.com", (0,))
+
+    report = import_csv(
+        "email,stage_name,first_release_year,no_of_albums_released\n"
+        "new1@example.com,New One,2001,1\n"
+        "taken@example.com,Taken,2002,2\n"
+    )
+
+    assert report.created == 1
+    assert report.errors == [(3, "Email already exists.")]
+    assert rate_limit.unknown_emails.get("taken@example.com") == (0,)
+    assert rate_limit.unknown_emails.get("new1@example.com") is None
+
+
+def test_failed_write_reports_one_error_per_row(scratch_db, monkeypatch):
+    insert_artist("taken@example.com", "Already Here")
+    monkeypatch.setattr(
+        ArtistController,
+        "existing_emails",
+        staticmethod(lambda conn, emails: set()),
+    )
+    real_write = AMSDatabase.write
+
+    def failing_write(fn):
+        def _write(conn):
+            fn(conn)
+            conn.execute("SELECT * FROM missing_table")
+
+        return real_write(_write)
+
+    monkeypatch.setattr(AMSDatabase, "write", failing_write)
+
+    report = import_csv(
+        "email,stage_name,first_release_year,no_of_albums_released\n"
+        "new1@example.com,New One,2001,1\n"
+        "taken@example.com,Taken,2002,2\n"
+    )
+
+    assert report.created == 0
+    assert [line for line, _ in report.errors] == [2, 3]
+    assert all(error.startswith("Insert failed: ") for _, error in report.errors)
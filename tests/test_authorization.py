@@ -0,0 +1,86 @@
+import pytest
+
+from src.controllers.user import UserController
+from src.database.query_trace import query_stats
+from src.server import AMSRequestHandler
+from src.utils.session_store import (
+    SQLiteSessionStore,
+    get_session_store,
+    set_session_store,
+)
+from tests.conftest import insert_artist
+
+
+@pytest.fixture
+def handler():
+    return AMSRequestHandler.__new__(AMSRequestHandler)
+
+
+@pytest.fixture
+def session_store(scratch_db):
+    set_session_store(SQLiteSessionStore(sweep_interval=None))
+    yield get_session_store()
+    set_session_store(None)
+
+
+def test_artist_access_comes_from_the_session(scratch_db, handler):
+    user = {"id": 1, "role": "artist", "artist_id": 5}
+    executions = query_stats()["executions"]
+
+    assert handler.can_access_artist_songs(user, 5)
+    assert handler.can_access_artist_songs(user, "5")
+    assert not handler.can_access_artist_songs(user, 6)
+    assert not handler.can_access_artist_songs(dict(user, artist_id=None), 5)
+    assert query_stats()["executions"] == executions
+
+
+@pytest.mark.parametrize("role", ["super_admin", "artist_manager"])
+def test_admins_can_access_any_artist(handler, role):
+    assert handler.can_access_artist_songs({"id": 1, "role": role}, 42)
+
+
+def test_sessions_without_artist_id_fall_back_to_a_lookup(scratch_db, handler):
+    artist_id = insert_artist("artist@example.com", "Fallback")
+    user = {"id": 1, "role": "artist"}
+
+    assert handler.get_own_artist_id(user) == artist_id
+    assert handler.can_access_artist_songs(user, artist_id)
+    assert not handler.can_access_artist_songs(user, artist_id + 1)
+    assert not handler.can_access_artist_songs({"id": 99, "role": "artist"}, artist_id)
+
+
+def user_form(user_id, **changes):
+    form = {
+        "id": str(user_id),
+        "first_name": "Test",
+        "last_name": "User",
+        "email": "artist@example.com",
+        "phone": "9800000000",
+        "dob": "1990-01-01",
+        "gender": "o",
+        "address": "Kathmandu",
+        "role": "artist",
+    }
+    return {**form, **changes}
+
+
+def test_editing_contact_details_keeps_sessions(session_store):
+    artist_id = insert_artist("artist@example.com", "Edited")
+    session = {"id": 1, "role": "artist", "email": "artist@example.com"}
+    session_store.create("session-a", dict(session, artist_id=artist_id))
+
+    UserController.update_user(user_form(1, phone="9811111111"))
+
+    assert session_store.get("session-a") == dict(session, artist_id=artist_id)
+
+
+def test_role_change_updates_sessions_on_every_store(session_store):
+    insert_artist("artist@example.com", "Promoted")
+    session_store.create("session-a", {"id": 1, "role": "artist", "artist_id": 1})
+    other_worker = SQLiteSessionStore(sweep_interval=None)
+    assert other_worker.get("session-a")["role"] == "artist"
+
+    UserController.update_user(user_form(1, role="artist_manager"))
+
+    assert session_store.get("session-a")["role"] == "artist_manager"
+    assert other_worker.get("session-a")["role"] == "artist_manager"
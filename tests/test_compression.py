@@ -0,0 +1,100 @@
+import gzip
+import zlib
+
+import pytest
+
+from src.utils.compression import ResponseCompressor, default_compressor
+from src.utils.stream import compress_stream, negotiate_encoding
+from src.utils.template import FLUSH
+from tests.conftest import insert_artist, login
+
+SYNC_FLUSH_MARKER = b"\x00\x00\xff\xff"
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("gzip, deflate", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("GZIP;Q=0.8, deflate;q=0.4", "gzip"),
+        ("gzip;q=0, deflate;q=0", None),
+        ("gzip;q=0", None),
+        ("gzip;q=abc, deflate;q=0.1", "deflate"),
+        ("*", "gzip"),
+        ("*;q=0.5, gzip;q=0", "deflate"),
+        ("identity;q=0", None),
+        ("identity;q=0, *;q=0", None),
+        ("br, gzip;q=0.1", "gzip"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_compress_skips_bodies_below_min_size():
+    compressor = ResponseCompressor(min_size=100)
+
+    assert compressor.compress(b"x" * 99, "gzip") is None
+    assert gzip.decompress(compressor.compress(b"x" * 100, "gzip")) == b"x" * 100
+    stats = compressor.stats()
+    assert stats["skipped_small"] == 1
+    assert stats["compressed"] == 1
+    assert stats["bytes_in"] == 100
+
+
+def test_flush_emits_a_sync_flush_block():
+    pieces = list(compress_stream(["header\n", FLUSH, "row\n"], "deflate"))
+    flushed = pieces.index(FLUSH)
+    head = b"".join(pieces[:flushed])
+    tail = b"".join(pieces[flushed + 1:])
+
+    assert head.endswith(SYNC_FLUSH_MARKER)
+    decompressor = zlib.decompressobj()
+    assert decompressor.decompress(head) == b"header\n"
+    assert decompressor.decompress(tail) + decompressor.flush() == b"row\n"
+
+
+@pytest.fixture
+def compressing(monkeypatch):
+    monkeypatch.setattr(default_compressor, "cpu_saturated", lambda: False)
+    return default_compressor
+
+
+def test_html_responses_respect_the_size_threshold(client, compressing, monkeypatch):
+    status, headers, plain = client.get("/login")
+    assert status == 200
+    assert "Content-Encoding" not in dict(headers)
+
+    monkeypatch.setattr(compressing, "min_size", len(plain) + 1)
+    _, headers, body = client.get("/login", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in dict(headers)
+    assert body == plain
+
+    monkeypatch.setattr(compressing, "min_size", len(plain))
+    _, headers, body = client.get("/login", headers={"Accept-Encoding": "gzip"})
+    headers = dict(headers)
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == plain
+
+    _, headers, body = client.get("/login", headers={"Accept-Encoding": "identity;q=0"})
+    assert "Content-Encoding" not in dict(headers)
+    assert body == plain
+
+
+def test_gzip_export_is_not_compressed_twice(client, compressing):
+    insert_artist("artist@example.com", "Stage Name")
+    login(client, "artist_manager")
+
+    status, headers, body = client.get(
+        "/artists/export?gzip=1", headers={"Accept-Encoding": "gzip"}
+    )
+
+    headers = dict(headers)
+    assert status == 200
+    assert headers["Content-Type"] == "application/gzip"
+    assert "Content-Encoding" not in headers
+    assert b"Stage Name" in gzip.decompress(body)
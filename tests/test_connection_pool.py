@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.database.database import AMSDatabase, ConnectionPool, PoolTimeoutError
+
+
+def connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def checkout(pool):
+    with pool.connection() as conn:
+        return conn
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def hold_connections(pool, count):
+    held = threading.Barrier(count + 1)
+    release = threading.Event()
+
+    def hold():
+        with pool.connection():
+            held.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    held.wait()
+    return release, threads
+
+
+def test_nested_checkouts_on_one_thread_share_a_connection():
+    pool = ConnectionPool(connect)
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        assert pool.stats()["in_use"] == 1
+
+    stats = pool.stats()
+    assert stats["checkouts"] == 1
+    assert stats["idle"] == 1
+
+
+def test_thread_gets_back_the_connection_it_used_last():
+    pool = ConnectionPool(connect)
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        with pool.connection() as first:
+            second = worker.submit(checkout, pool).result()
+        assert second is not first
+
+        # first was released last, so a plain pop() would hand it out.
+        assert worker.submit(checkout, pool).result() is second
+        assert checkout(pool) is first
+
+    assert pool.stats()["created"] == 2
+
+
+def test_idle_connection_is_checked_before_reuse():
+    pool = ConnectionPool(connect, health_check_interval=0)
+    broken = checkout(pool)
+    broken.close()
+
+    conn = checkout(pool)
+
+    assert conn is not broken
+    conn.execute("SELECT 1")
+    stats = pool.stats()
+    assert stats["discarded"] == 1
+    assert stats["created"] == 2
+    assert stats["size"] == 1
+
+
+def test_recently_used_connection_skips_the_check():
+    pool = ConnectionPool(connect, health_check_interval=60)
+    conn = checkout(pool)
+    conn.close()
+
+    with pool.connection() as reused:
+        assert reused is conn
+        assert pool.stats()["discarded"] == 0
+
+
+def test_checkout_waits_for_a_free_connection_at_the_cap():
+    pool = ConnectionPool(connect, max_connections=2, timeout=5)
+    release, holders = hold_connections(pool, 2)
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(checkout(pool)))
+    waiter.start()
+
+    wait_for(lambda: pool.stats()["waits"] >= 1)
+    assert acquired == []
+    assert pool.stats()["size"] == 2
+
+    release.set()
+    for thread in (*holders, waiter):
+        thread.join()
+
+    stats = pool.stats()
+    assert len(acquired) == 1
+    assert stats["created"] == 2
+    assert stats["reused"] == 1
+    assert stats["checkouts"] == 3
+    assert stats["idle"] == 2
+
+
+def test_checkout_times_out_when_every_connection_is_busy():
+    pool = ConnectionPool(connect, max_connections=1, timeout=0.05)
+    with pool.connection():
+        with ThreadPoolExecutor(max_workers=1) as worker:
+            with pytest.raises(PoolTimeoutError):
+                worker.submit(checkout, pool).result()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["size"] == 1
+
+
+def test_database_pool_is_sized_by_pool_size(scratch_db, monkeypatch):
+    monkeypatch.setattr(AMSDatabase, "POOL_SIZE", 2)
+    monkeypatch.setattr(AMSDatabase, "POOL_TIMEOUT", 0.05)
+    AMSDatabase.close_pool()
+    pool = AMSDatabase.get_pool()
+    release, holders = hold_connections(pool, 2)
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as worker:
+            with pytest.raises(PoolTimeoutError):
+                worker.submit(checkout, pool).result()
+        stats = AMSDatabase.pool_stats()
+        assert stats["max_connections"] == 2
+        assert stats["size"] == 2
+        assert stats["in_use"] == 2
+        assert stats["timeouts"] == 1
+    finally:
+        release.set()
+        for thread in holders:
+            thread.join()
+
+    assert AMSDatabase.pool_stats()["idle"] == 2
@@ -0,0 +1,25 @@
+from src.database.query_trace import query_stats
+from tests.conftest import insert_artist, login
+
+
+def test_warm_songs_page_runs_no_sql(client):
+    artist_id = insert_artist("artist@example.com", "Cached Artist")
+    login(client, "artist_manager")
+    path = f"/artists/{artist_id}/songs"
+
+    status, _, cold = client.get(path)
+    assert status == 200
+    executions = query_stats()["executions"]
+
+    status, _, warm = client.get(path)
+    assert status == 200
+    assert warm == cold
+    assert b"Cached Artist" in warm
+    assert query_stats()["executions"] == executions
+
+
+def test_missing_artist_is_not_found(client):
+    login(client, "artist_manager")
+
+    status, _, _ = client.get("/artists/999/songs")
+    assert status == 404
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from src.controllers.job import JobController
+from src.utils.enums import JobStatus
+
+
+def test_claim_next_job_takes_oldest_queued_job(scratch_db):
+    first = JobController.create_job("artist_export", 1)
+    second = JobController.create_job("artist_export", 1)
+
+    job = JobController.claim_next_job()
+    assert job["id"] == first
+    assert job["status"] == JobStatus.RUNNING.value
+    assert job["started_at"] is not None
+    assert JobController.claim_next_job()["id"] == second
+    assert JobController.claim_next_job() is None
+
+
+def test_delete_finished_jobs_returns_result_paths(scratch_db):
+    done = JobController.create_job("artist_export", 1)
+    failed = JobController.create_job("artist_export", 1)
+    queued = JobController.create_job("artist_export", 1)
+    JobController.finish_job(done, result_path="/tmp/export.csv")
+    JobController.fail_job(failed, "boom")
+
+    paths = JobController.delete_finished_jobs(datetime.now() + timedelta(seconds=1))
+
+    assert paths == ["/tmp/export.csv"]
+    assert JobController.get_job(done) is None
+    assert JobController.get_job(failed) is None
+    assert JobController.get_job(queued)["status"] == JobStatus.QUEUED.value
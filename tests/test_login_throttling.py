@@ -0,0 +1,122 @@
+import asyncio
+import io
+import threading
+import time
+from urllib.parse import urlencode
+
+import pytest
+
+from src import server
+from src.aio_server import AsyncAMSServer
+from src.controllers import auth
+from src.controllers.auth import AuthController, DelayedRejection
+from src.database.query_trace import query_stats
+from src.utils import rate_limit
+from src.utils.fragment_cache import bump_table_versions
+from src.utils.rate_limit import Throttle
+
+LOGIN_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_throttles(monkeypatch):
+    rate_limit.reset_throttles()
+    monkeypatch.setattr(auth, "simulate_verify", lambda elapsed: 0.2)
+    yield
+    rate_limit.reset_throttles()
+
+
+def login_body(email):
+    return urlencode({"email": email, "password": "Wrong1234"})
+
+
+def test_throttled_login_gets_429_before_any_work(client, monkeypatch):
+    monkeypatch.setattr(rate_limit, "login_throttle", Throttle((20, 10), (2, 1)))
+    calls = []
+    monkeypatch.setattr(
+        auth.AuthController,
+        "login_user",
+        lambda self, data: calls.append(data) or (False, "Invalid credentials."),
+    )
+
+    statuses = [
+        client.request(
+            "POST", "/login", body=login_body("a@example.com"), headers=LOGIN_HEADERS
+        )
+        for _ in range(3)
+    ]
+
+    assert [status for status, _, _ in statuses] == [303, 303, 429]
+    assert int(dict(statuses[2][1])["Retry-After"]) >= 1
+    assert len(calls) == 2
+
+
+def test_unknown_email_is_cached_until_users_change(scratch_db):
+    controller = AuthController()
+
+    success, result = controller.login_user(
+        {"email": "nobody@example.com", "password": "x"}
+    )
+    assert not success
+    assert isinstance(result, DelayedRejection)
+    assert result.delay == 0.2
+
+    executions = query_stats()["executions"]
+    success, result = controller.login_user(
+        {"email": "Nobody@example.com ", "password": "x"}
+    )
+    assert not success and result.delay == 0.2
+    assert query_stats()["executions"] == executions
+
+    bump_table_versions("users")
+    controller.login_user({"email": "nobody@example.com", "password": "x"})
+    assert query_stats()["executions"] > executions
+
+
+def test_asyncio_login_delay_does_not_hold_handler_threads(scratch_db):
+    async def run():
+        server = await AsyncAMSServer("127.0.0.1", 0, workers=1).start()
+        serving = asyncio.ensure_future(server.serve_forever())
+
+        async def request(raw):
+            reader, writer = await asyncio.open_connection(*server.server_address)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.readuntil(b"\r\n\r\n")
+            writer.close()
+            return response, time.perf_counter()
+
+        body = login_body("nobody@example.com").encode()
+        started = time.perf_counter()
+        login = asyncio.ensure_future(
+            request(
+                b"POST /login HTTP/1.1\r\nHost: x\r\nConnection: close\r\n"
+                b"Content-Type: application/x-www-form-urlencoded\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+        )
+        await asyncio.sleep(0.05)
+        page, page_done = await request(
+            b"GET /login HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+        rejected, login_done = await login
+        server.close()
+        await serving
+        return started, page, page_done, rejected, login_done
+
+    started, page, page_done, rejected, login_done = asyncio.run(run())
+    assert page.startswith(b"HTTP/1.1 200 ")
+    assert rejected.startswith(b"HTTP/1.1 303 ")
+    assert page_done - started < 0.2
+    assert login_done - started >= 0.2
+
+
+def test_threaded_delays_are_bounded(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(server, "inline_delay_slots", slots)
+    handler = server.AMSRequestHandler.__new__(server.AMSRequestHandler)
+    handler.wfile = io.BytesIO()
+
+    assert handler.delay_response(0.01)
+    slots.acquire()
+    assert not handler.delay_response(0.01)
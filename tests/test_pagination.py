@@ -0,0 +1,52 @@
+import base64
+import json
+
+import pytest
+
+from src.utils.pagination import decode_cursor, decode_id_cursor, encode_cursor
+from tests.conftest import insert_artist, login
+
+
+def craft_cursor(values):
+    raw = json.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def test_decode_round_trips_encoded_cursors():
+    assert decode_cursor(encode_cursor(42)) == [42]
+    assert decode_cursor(encode_cursor("Title", 42)) == ["Title", 42]
+    assert decode_id_cursor(encode_cursor(42)) == 42
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [[1], {"a": 1}],
+        [{"a": 1}],
+        ["Title"],
+        [True],
+        [1.5],
+        [2**64],
+        ["Title", "42"],
+        [1, 2],
+        ["Title", 42, 1],
+        {"id": 1},
+    ],
+)
+def test_decode_rejects_malformed_cursors(values):
+    token = craft_cursor(values)
+    assert decode_cursor(token) is None
+    assert decode_id_cursor(token) is None
+
+
+@pytest.mark.parametrize("sort", ["newest", "title"])
+def test_songs_page_ignores_malformed_cursor(client, sort):
+    artist_id = insert_artist("artist@example.com", "Paged Artist")
+    login(client, "artist_manager")
+    cursor = craft_cursor([[1], {"a": 1}])
+
+    for key in ("after", "before"):
+        status, _, _ = client.get(
+            f"/artists/{artist_id}/songs?sort={sort}&{key}={cursor}&page=3"
+        )
+        assert status == 200
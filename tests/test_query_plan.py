@@ -0,0 +1,395 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.controllers.artist import ArtistController
+from src.controllers.auth import AuthController
+from src.controllers.job import JobController
+from src.controllers.song import SongController
+from src.controllers.user import UserController
+from src.database.database import AMSDatabase
+from src.utils.fragment_cache import TableVersions
+from src.utils.session_store import SQLiteSessionStore
+
+SCAN_PATTERN = re.compile(r"^SCAN (\S+)")
+TEMP_BTREE_PATTERN = re.compile(r"^USE TEMP B-TREE")
+SKIPPED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "SAVEPOINT", "RELEASE")
+
+SEED_USER = {
+    "first_name": "Plan",
+    "last_name": "Check",
+    "password": "PlanCheck123",
+    "phone": "9800000000",
+    "dob": "1990-01-01",
+    "gender": "o",
+    "address": "Kathmandu",
+}
+
+
+class StatementRecorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements = []
+
+    def __call__(self, conn):
+        conn.set_trace_callback(self.record)
+
+    def record(self, statement):
+        sql = " ".join(statement.split())
+        if sql.upper().startswith(SKIPPED_PREFIXES):
+            return
+        with self._lock:
+            self.statements.append(sql)
+
+    def drain(self):
+        with self._lock:
+            statements, self.statements = self.statements, []
+        return statements
+
+
+def seed(artist_controller, song_controller, user_controller):
+    user_controller.create_user(
+        dict(SEED_USER, email="plan-admin@example.com", role="super_admin")
+    )
+    artist_controller.create_artist(
+        dict(
+            SEED_USER,
+            email="plan-artist@example.com",
+            stage_name="Plan Artist",
+            first_release_year=2001,
+            no_of_albums_released=2,
+        )
+    )
+    artist = artist_controller.list_artists(page_size=1).rows[0]
+    song_controller.create_song(
+        {
+            "artist_id": artist["id"],
+            "title": "Plan Song",
+            "album_name": "Plan Album",
+            "genre": "rock",
+        }
+    )
+    return artist
+
+
+def build_cases():
+    artist_controller = ArtistController()
+    auth_controller = AuthController()
+    job_controller = JobController()
+    song_controller = SongController()
+    user_controller = UserController()
+    session_store = SQLiteSessionStore(sweep_interval=None)
+
+    artist = seed(artist_controller, song_controller, user_controller)
+    artist_id = artist["id"]
+    user_id = artist["user_id"]
+
+    def existing_emails(emails):
+        with AMSDatabase.connection() as conn:
+            return artist_controller.existing_emails(conn, emails)
+
+    def first_song_id():
+        return song_controller.list_artist_songs(artist_id, page_size=1).rows[0]["id"]
+
+    new_artist = dict(
+        SEED_USER,
+        email="plan-new-artist@example.com",
+        stage_name="New Artist",
+        first_release_year=2010,
+        no_of_albums_released=0,
+    )
+
+    return [
+        (
+            "ArtistController.list_artists",
+            lambda: artist_controller.list_artists(after=artist_id + 1, page_size=1),
+            set(),
+        ),
+        (
+            "ArtistController.get_artist_by_id",
+            lambda: artist_controller.get_artist_by_id(artist_id),
+            set(),
+        ),
+        (
+            "ArtistController.get_artist_by_user_id",
+            lambda: artist_controller.get_artist_by_user_id(user_id),
+            set(),
+        ),
+        (
+            "ArtistController.create_artist",
+            lambda: artist_controller.create_artist(new_artist),
+            set(),
+        ),
+        (
+            "ArtistController.update_artist",
+            lambda: artist_controller.update_artist(
+                {
+                    "id": artist_id,
+                    "stage_name": "Plan Artist",
+                    "first_release_year": 2002,
+                    "no_of_albums_released": 3,
+                }
+            ),
+            set(),
+        ),
+        (
+            "ArtistController.iter_export_batches",
+            lambda: list(artist_controller.iter_export_batches(batch_size=1)),
+            set(),
+        ),
+        (
+            "ArtistController.existing_emails",
+            lambda: existing_emails(["plan-artist@example.com", "plan-x@example.com"]),
+            set(),
+        ),
+        (
+            "ArtistController.import_artists",
+            lambda: artist_controller.import_artists(
+                [
+                    {
+                        "email": "plan-import@example.com",
+                        "stage_name": "Imported",
+                        "first_release_year": "2005",
+                        "no_of_albums_released": "1",
+                    }
+                ]
+            ),
+            set(),
+        ),
+        (
+            "SongController.list_artist_songs",
+            lambda: song_controller.list_artist_songs(
+                artist_id, after=[first_song_id() + 1], page_size=1
+            ),
+            set(),
+        ),
+        (
+            "SongController.list_artist_songs(genre)",
+            lambda: song_controller.list_artist_songs(
+                artist_id, genre="rock", before=[0], sort="oldest"
+            ),
+            set(),
+        ),
+        (
+            "SongController.list_artist_songs(title)",
+            lambda: song_controller.list_artist_songs(
+                artist_id, sort="title", after=["Plan", first_song_id()]
+            ),
+            set(),
+        ),
+        (
+            "SongController.list_artist_songs(prefix)",
+            lambda: song_controller.list_artist_songs(
+                artist_id, title_prefix="Pla", album="Plan Album", sort="title_desc"
+            ),
+            set(),
+        ),
+        (
+            "SongController.list_artist_albums",
+            lambda: song_controller.list_artist_albums(artist_id),
+            set(),
+        ),
+        (
+            "SongController.get_song_by_id",
+            lambda: song_controller.get_song_by_id(first_song_id()),
+            set(),
+        ),
+        (
+            "SongController.update_song",
+            lambda: song_controller.update_song(
+                {
+                    "id": first_song_id(),
+                    "title": "Plan Song",
+                    "album_name": "Plan Album",
+                    "genre": "jazz",
+                }
+            ),
+            set(),
+        ),
+        (
+            "SongController.delete_song",
+            lambda: song_controller.delete_song(first_song_id()),
+            set(),
+        ),
+        (
+            "UserController.list_users",
+            lambda: user_controller.list_users(before=user_id, page_size=1),
+            set(),
+        ),
+        (
+            "UserController.update_user",
+            lambda: user_controller.update_user(
+                dict(
+                    SEED_USER,
+                    id=user_id,
+                    email="plan-artist@example.com",
+                    role="artist",
+                )
+            ),
+            set(),
+        ),
+        (
+            "AuthController.register_user",
+            lambda: auth_controller.register_user(
+                dict(SEED_USER, email="plan-register@example.com", role="artist")
+            ),
+            set(),
+        ),
+        (
+            "AuthController.login_user",
+            lambda: auth_controller.login_user(
+                {"email": "plan-admin@example.com", "password": "PlanCheck123"}
+            ),
+            set(),
+        ),
+        (
+            "JobController.create_job",
+            lambda: job_controller.create_job("artist_export", user_id, {}),
+            set(),
+        ),
+        (
+            "JobController.claim_next_job",
+            job_controller.claim_next_job,
+            set(),
+        ),
+        (
+            "JobController.get_job",
+            lambda: job_controller.get_job(1),
+            set(),
+        ),
+        (
+            "JobController.update_progress",
+            lambda: job_controller.update_progress(1, 1, 2),
+            set(),
+        ),
+        (
+            "JobController.finish_job",
+            lambda: job_controller.finish_job(1, message="done"),
+            set(),
+        ),
+        (
+            "JobController.fail_job",
+            lambda: job_controller.fail_job(1, "failed"),
+            set(),
+        ),
+        (
+            "JobController.requeue_interrupted_jobs",
+            job_controller.requeue_interrupted_jobs,
+            set(),
+        ),
+        (
+            "JobController.delete_finished_jobs",
+            lambda: job_controller.delete_finished_jobs(datetime.now()),
+            set(),
+        ),
+        (
+            "TableVersions.get",
+            lambda: TableVersions(shared=True).get(("users", "artists")),
+            {"table_versions"},
+        ),
+        (
+            "SQLiteSessionStore.create",
+            lambda: session_store.create("plan-session", {"id": user_id}),
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.get",
+            lambda: session_store.cache.delete("plan-session")
+            or session_store.get("plan-session"),
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.update_user",
+            lambda: session_store.update_user(user_id, {"role": "artist"}),
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.touch",
+            lambda: session_store.touch("plan-session", 0),
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.sweep",
+            session_store.sweep,
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.delete",
+            lambda: session_store.delete("plan-session"),
+            set(),
+        ),
+        (
+            "SQLiteSessionStore.delete_user",
+            lambda: session_store.delete_user(user_id),
+            set(),
+        ),
+        (
+            "ArtistController.delete_artist",
+            lambda: artist_controller.delete_artist(artist_id),
+            set(),
+        ),
+        (
+            "UserController.delete_user",
+            lambda: user_controller.delete_user(user_id),
+            set(),
+        ),
+    ]
+
+
+def explain(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def find_regressions(plan, allowed_scans):
+    problems = []
+    for detail in plan:
+        scan = SCAN_PATTERN.match(detail)
+        if scan and scan.group(1) != "CONSTANT" and scan.group(1) not in allowed_scans:
+            problems.append(detail)
+        elif TEMP_BTREE_PATTERN.match(detail):
+            problems.append(detail)
+    return problems
+
+
+@pytest.fixture
+def recorder(scratch_db):
+    recorder = StatementRecorder()
+    AMSDatabase.add_connection_hook(recorder)
+    AMSDatabase.close_pool()
+    yield recorder
+    AMSDatabase.remove_connection_hook(recorder)
+
+
+@pytest.fixture
+def query_plans(recorder):
+    cases = build_cases()
+    recorder.drain()
+    explain_conn = sqlite3.connect(AMSDatabase.DB_PATH)
+    plans = []
+    try:
+        for name, call, allowed_scans in cases:
+            call()
+            for sql in recorder.drain():
+                plans.append((name, sql, explain(explain_conn, sql), allowed_scans))
+    finally:
+        explain_conn.close()
+    return [name for name, _, _ in cases], plans
+
+
+def test_every_case_runs_sql(query_plans):
+    names, plans = query_plans
+    assert set(names) == {name for name, _, _, _ in plans}
+
+
+def test_queries_use_indexes(query_plans):
+    _, plans = query_plans
+    failures = [
+        f"{name}: {sql}\n        " + "\n        ".join(plan)
+        for name, sql, plan, allowed_scans in plans
+        if find_regressions(plan, allowed_scans)
+    ]
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
@@ -0,0 +1,51 @@
+import pytest
+
+from src.utils.router import Router
+
+
+def handler(request, **params):
+    return params
+
+
+@pytest.fixture
+def router():
+    router = Router()
+    router.add("GET", "/dashboard", handler)
+    router.add("GET", "/artists/{artist_id:int}/songs", handler)
+    router.add("GET", "/static/{path:path}", handler)
+    return router
+
+
+def test_matches_canonical_paths(router):
+    assert router.match("GET", "/dashboard").params == {}
+    assert router.match("GET", "/artists/5/songs").params == {"artist_id": 5}
+    assert router.match("GET", "/static/css/style.css").params == {
+        "path": "css/style.css"
+    }
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/dashboard/",
+        "/artists/5/songs/",
+        "//artists/5/songs",
+        "/static/style.css/",
+        "/static/css//style.css",
+        "/static/",
+    ],
+)
+def test_rejects_non_canonical_paths(router, path):
+    assert router.match("GET", path) is None
+
+
+def test_trailing_slash_redirects_to_canonical_path(client):
+    status, headers, _ = client.get("/login/?error=x")
+    assert status == 301
+    assert dict(headers)["Location"] == "/login?error=x"
+
+    status, _, _ = client.get("/static/style.css/")
+    assert status == 301
+
+    status, _, _ = client.get("/missing/")
+    assert status == 404
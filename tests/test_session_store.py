@@ -0,0 +1,42 @@
+from src.utils.session_store import SQLiteSessionStore
+
+
+def make_store():
+    return SQLiteSessionStore(sweep_interval=None)
+
+
+def test_logout_on_one_store_reaches_another(scratch_db):
+    first, second = make_store(), make_store()
+    first.create("session-a", {"id": 1, "role": "artist"})
+    assert second.get("session-a") == {"id": 1, "role": "artist"}
+
+    first.delete("session-a")
+
+    assert second.get("session-a") is None
+
+
+def test_revoking_a_user_reaches_another_store(scratch_db):
+    first, second = make_store(), make_store()
+    first.create("session-a", {"id": 1})
+    first.create("session-b", {"id": 1})
+    first.create("session-c", {"id": 2})
+    for session_id in ("session-a", "session-b", "session-c"):
+        assert second.get(session_id) is not None
+
+    assert first.delete_user(1) == 2
+
+    assert second.get("session-a") is None
+    assert second.get("session-b") is None
+    assert second.get("session-c") == {"id": 2}
+
+
+def test_cache_hit_serves_data_without_reading_the_row(scratch_db):
+    store = make_store()
+    store.create("session-a", {"id": 1})
+
+    def _tamper(conn):
+        conn.execute("UPDATE sessions SET data = '{}' WHERE id = 'session-a'")
+
+    scratch_db.write(_tamper)
+
+    assert store.get("session-a") == {"id": 1}
@@ -0,0 +1,125 @@
+import gzip
+import os
+
+import pytest
+
+from src.utils.static import StaticFiles
+
+STYLESHEET = "body { color: #333; }\n" * 64
+SECRET = "do-not-serve"
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    directory = tmp_path / "static"
+    (directory / "css").mkdir(parents=True)
+    (directory / "css" / "app.css").write_text(STYLESHEET)
+    (directory / ".env").write_text("SECRET=1")
+    (tmp_path / "secret.txt").write_text(SECRET)
+    os.symlink(tmp_path / "secret.txt", directory / "escape.txt")
+    return directory
+
+
+@pytest.fixture
+def static_client(client, static_dir, monkeypatch):
+    import src.server
+
+    monkeypatch.setattr(
+        src.server, "default_static", StaticFiles(static_dir, auto_reload=False)
+    )
+    return client
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "../secret.txt",
+        "css/../../secret.txt",
+        "%2e%2e/secret.txt",
+        "%2E%2E%2Fsecret.txt",
+        "css%2f..%2f..%2fsecret.txt",
+        "..\\secret.txt",
+        "css\\..\\..\\secret.txt",
+        "css%5c..%5c..%5csecret.txt",
+        "css/app.css%00.txt",
+        "css/app.css\0",
+        "/etc/passwd",
+        "css//app.css",
+        ".env",
+        "%2eenv",
+        "escape.txt",
+        "css",
+        "missing.css",
+    ],
+)
+def test_resolve_rejects_paths_outside_regular_files(static_dir, name):
+    assert StaticFiles(static_dir).get_asset(name) is None
+
+
+def test_serves_files_inside_the_directory(static_dir):
+    asset = StaticFiles(static_dir).get_asset("css/app.css")
+
+    assert asset.body == STYLESHEET.encode("utf-8")
+    assert asset.content_type == "text/css; charset=utf-8"
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/static/%2e%2e/secret.txt",
+        "/static/..%2fsecret.txt",
+        "/static/css%5c..%5c..%5csecret.txt",
+        "/static/css/app.css%00",
+        "/static/escape.txt",
+    ],
+)
+def test_traversal_requests_are_not_found(static_client, path):
+    status, _, body = static_client.get(path)
+
+    assert status == 404
+    assert SECRET.encode("utf-8") not in body
+
+
+def test_if_none_match_returns_not_modified(static_client):
+    status, headers, body = static_client.get("/static/css/app.css")
+    etag = dict(headers)["ETag"]
+    assert status == 200
+    assert body == STYLESHEET.encode("utf-8")
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        status, headers, body = static_client.get(
+            "/static/css/app.css", headers={"If-None-Match": if_none_match}
+        )
+        assert status == 304
+        assert dict(headers)["ETag"] == etag
+        assert body == b""
+
+    status, _, _ = static_client.get(
+        "/static/css/app.css", headers={"If-None-Match": '"stale"'}
+    )
+    assert status == 200
+
+
+def test_gzip_variant_has_its_own_etag(static_client):
+    _, headers, _ = static_client.get("/static/css/app.css")
+    plain_etag = dict(headers)["ETag"]
+
+    status, headers, body = static_client.get(
+        "/static/css/app.css", headers={"Accept-Encoding": "gzip"}
+    )
+    headers = dict(headers)
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"] != plain_etag
+    assert gzip.decompress(body) == STYLESHEET.encode("utf-8")
+
+    status, _, _ = static_client.get(
+        "/static/css/app.css",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": plain_etag},
+    )
+    assert status == 200
+    status, _, _ = static_client.get(
+        "/static/css/app.css",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]},
+    )
+    assert status == 304
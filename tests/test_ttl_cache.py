@@ -0,0 +1,37 @@
+import time
+
+from src.utils.ttl_cache import TTLCache
+
+
+def test_get_returns_none_after_expiry():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("live", 1)
+    cache.set("expired", 2, expires_at=time.time() - 1)
+
+    assert cache.get("live") == 1
+    assert cache.get("expired") is None
+    assert len(cache) == 1
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_delete_matching_and_sweep():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("a", {"id": 1})
+    cache.set("b", {"id": 2})
+    cache.set("c", {"id": 1}, expires_at=time.time() - 1)
+
+    assert cache.sweep() == 1
+    assert cache.delete_matching(lambda key, value: value["id"] == 1) == 1
+    assert cache.get("b") == {"id": 2}
+    assert len(cache) == 1
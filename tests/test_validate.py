@@ -0,0 +1,217 @@
+from datetime import date
+
+import pytest
+
+from src.controllers.artist import IMPORT_SCHEMA
+from src.controllers.auth import REGISTRATION_SCHEMA
+from src.utils.validate import (
+    DateBounds,
+    valid_dob,
+    valid_password,
+    validate_artist_create_form,
+    validate_user_create_form,
+)
+
+DOB_MESSAGE = "DOB is invalid. User must be at least 15 years old."
+PASSWORD_MESSAGE = "Password must be 8+ chars with uppercase, lowercase, and number."
+MALFORMED_DATES = [
+    "abc",
+    "1990",
+    "1990-01",
+    "1990-01-01T00:00",
+    "1990/01/01",
+    " 1990-01-01x",
+    "19900-01-01",
+    "0000-01-01",
+    "1990-00-10",
+    "1990-13-01",
+    "1990-02-30",
+    "1991-02-29",
+    "1990-01-32",
+    "1990-001-01",
+]
+
+USER_FORM = {
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "email": "Ada@Example.com",
+    "password": "Secret123",
+    "phone": "9800000000",
+    "dob": "1990-01-01",
+    "gender": "f",
+    "address": "Kathmandu",
+    "role": "artist",
+    "stage_name": "Ada",
+    "first_release_year": "2001",
+    "no_of_albums_released": "3",
+}
+ARTIST_FORM = {key: value for key, value in USER_FORM.items() if key != "role"}
+
+
+@pytest.mark.parametrize(
+    ("changes", "expected"),
+    [
+        ({}, ""),
+        ({"phone": ""}, ""),
+        ({"dob": "1990-1-5"}, ""),
+        ({"first_name": " "}, "First Name is required."),
+        ({"last_name": "", "address": ""}, "Last Name is required."),
+        ({"address": "", "email": "bad"}, "Address is required."),
+        ({"email": "no-at-sign"}, "Invalid email format."),
+        ({"email": "a b@example.com"}, "Invalid email format."),
+        ({"email": "bad", "password": "weak"}, "Invalid email format."),
+        ({"password": "Short1"}, PASSWORD_MESSAGE),
+        ({"password": "alllowercase1"}, PASSWORD_MESSAGE),
+        ({"password": "ALLUPPERCASE1"}, PASSWORD_MESSAGE),
+        ({"password": "NoDigitsHere"}, PASSWORD_MESSAGE),
+        ({"password": "weak", "phone": "123"}, PASSWORD_MESSAGE),
+        ({"phone": "123"}, "Phone number must be exactly 10 digits."),
+        ({"phone": "98000000001"}, "Phone number must be exactly 10 digits."),
+        ({"phone": "123", "dob": ""}, "Phone number must be exactly 10 digits."),
+        ({"dob": ""}, DOB_MESSAGE),
+        ({"dob": "1990-02-30"}, DOB_MESSAGE),
+        ({"dob": "1990-02-30", "gender": "x"}, DOB_MESSAGE),
+        ({"gender": "x"}, "Invalid gender."),
+        ({"gender": "x", "role": "admin"}, "Invalid gender."),
+        ({"role": "admin"}, "Invalid role."),
+        ({"stage_name": ""}, "Stage name is required for artist role."),
+        ({"first_release_year": "soon"}, "First release year must be a valid number."),
+        ({"first_release_year": "1899"}, "First release year is out of valid range."),
+        (
+            {"first_release_year": str(date.today().year + 1)},
+            "First release year is out of valid range.",
+        ),
+        ({"no_of_albums_released": "-1"}, "No. of albums released must be 0 or greater."),
+        ({"no_of_albums_released": ""}, "No. of albums released must be 0 or greater."),
+        (
+            {"role": "artist_manager", "stage_name": "", "first_release_year": ""},
+            "",
+        ),
+    ],
+)
+def test_user_form_messages_in_rule_order(changes, expected):
+    assert validate_user_create_form({**USER_FORM, **changes}) == expected
+
+
+@pytest.mark.parametrize(
+    ("changes", "expected"),
+    [
+        ({}, ""),
+        ({"stage_name": ""}, "Stage Name is required."),
+        ({"address": "", "stage_name": ""}, "Address is required."),
+        ({"stage_name": "", "email": "bad"}, "Stage Name is required."),
+        ({"gender": "", "first_release_year": "soon"}, "Invalid gender."),
+        ({"first_release_year": ""}, "First release year must be a valid number."),
+        (
+            {"first_release_year": "1800", "no_of_albums_released": "-1"},
+            "First release year is out of valid range.",
+        ),
+        ({"no_of_albums_released": "many"}, "No. of albums released must be 0 or greater."),
+    ],
+)
+def test_artist_form_messages_in_rule_order(changes, expected):
+    assert validate_artist_create_form({**ARTIST_FORM, **changes}) == expected
+
+
+@pytest.mark.parametrize("dob", MALFORMED_DATES)
+def test_malformed_dates_fail_instead_of_raising(dob):
+    assert valid_dob(dob) is False
+    assert validate_user_create_form({**USER_FORM, "dob": dob}) == DOB_MESSAGE
+    assert REGISTRATION_SCHEMA.clean({**USER_FORM, "dob": dob}) == (
+        None,
+        "You must be at least 15 years old to register.",
+    )
+
+
+@pytest.mark.parametrize(
+    ("dob", "expected"),
+    [
+        ("2005-06-14", True),
+        ("2005-06-15", True),
+        ("2005-6-15", True),
+        ("2005-06-16", False),
+        ("2008-02-29", False),
+        ("2004-02-29", True),
+    ],
+)
+def test_dob_must_be_at_least_fifteen_years_ago(dob, expected):
+    assert valid_dob(dob, DateBounds(date(2020, 6, 15))) is expected
+
+
+@pytest.mark.parametrize(
+    ("password", "expected"),
+    [
+        ("Secret12", True),
+        ("Secret1", False),
+        ("secret12", False),
+        ("SECRET12", False),
+        ("Secretss", False),
+        ("", False),
+    ],
+)
+def test_valid_password(password, expected):
+    assert valid_password(password) is expected
+
+
+@pytest.mark.parametrize(
+    ("changes", "expected"),
+    [
+        ({"email": "", "password": "weak"}, "Email and password are required."),
+        ({"password": ""}, "Email and password are required."),
+        ({"email": "bad", "password": "weak"}, "Invalid email format."),
+        ({"password": "weak", "phone": "1"}, PASSWORD_MESSAGE),
+        ({"phone": "1", "dob": ""}, "Phone number must be exactly 10 digits."),
+    ],
+)
+def test_registration_messages_in_rule_order(changes, expected):
+    assert REGISTRATION_SCHEMA.clean({**USER_FORM, **changes}) == (None, expected)
+
+
+def test_registration_clean_normalizes_values():
+    values, error = REGISTRATION_SCHEMA.clean({**USER_FORM, "email": " Ada@Example.COM "})
+
+    assert error is None
+    assert values["email"] == "ada@example.com"
+
+
+def import_row(email, **changes):
+    row = {
+        "email": email,
+        "stage_name": "Stage",
+        "first_release_year": "2001",
+        "no_of_albums_released": "2",
+    }
+    row.update(changes)
+    return row
+
+
+def test_clean_rows_reports_duplicates_after_normalizing():
+    rows = [
+        import_row("one@example.com"),
+        import_row("ONE@example.com "),
+        import_row("two@example.com", stage_name=""),
+        import_row("two@example.com"),
+        import_row("two@example.com"),
+        import_row("bad-email"),
+        import_row("three@example.com", first_release_year="soon"),
+        import_row("three@example.com", gender="x"),
+    ]
+
+    results = list(IMPORT_SCHEMA.clean_rows(rows))
+
+    assert [error for _, error in results] == [
+        None,
+        "Duplicate email in file.",
+        "stage_name, first_release_year and no_of_albums_released are required.",
+        None,
+        "Duplicate email in file.",
+        "Invalid email format.",
+        "first_release_year and no_of_albums_released must be numbers.",
+        None,
+    ]
+    values = results[-1][0]
+    assert values["email"] == "three@example.com"
+    assert values["gender"] == "o"
+    assert values["first_release_year"] == 2001
+    assert values["first_name"] == "Artist"
+    assert values["password"] == "Import123"
@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.database.database import AMSDatabase
+from src.utils.metrics import current_request, reset_metrics, track_request
+
+
+@pytest.fixture
+def counter(scratch_db):
+    AMSDatabase.write(
+        lambda conn: conn.executescript(
+            "CREATE TABLE counter (n INTEGER NOT NULL); INSERT INTO counter VALUES (0);"
+        )
+    )
+
+
+def read_counter():
+    with AMSDatabase.connection() as conn:
+        return conn.execute("SELECT n FROM counter").fetchone()["n"]
+
+
+def increment(conn):
+    n = conn.execute("SELECT n FROM counter").fetchone()["n"]
+    conn.execute("UPDATE counter SET n = ?", (n + 1,))
+    return threading.current_thread().name
+
+
+def test_concurrent_writes_are_serialized(counter):
+    names = []
+
+    def worker():
+        for _ in range(20):
+            names.append(AMSDatabase.write(increment))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert read_counter() == 160
+    assert set(names) == {"ams-db-writer"}
+    assert AMSDatabase.write_stats()["writes"] >= 160
+
+
+def test_write_holds_the_reserved_lock(counter):
+    def probe(conn):
+        other = sqlite3.connect(AMSDatabase.DB_PATH, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            return conn.in_transaction, str(e)
+        finally:
+            other.close()
+        return conn.in_transaction, None
+
+    assert AMSDatabase.write(probe) == (True, "database is locked")
+
+
+def test_failed_write_raises_and_rolls_back(counter):
+    def fail(conn):
+        increment(conn)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        AMSDatabase.write(fail)
+
+    assert read_counter() == 0
+    assert AMSDatabase.write_stats()["failures"] == 1
+    AMSDatabase.write(increment)
+    assert read_counter() == 1
+
+
+def test_write_runs_in_the_callers_context(counter):
+    def write(conn):
+        increment(conn)
+        return current_request()
+
+    with track_request("POST") as request:
+        seen = AMSDatabase.write(write)
+    reset_metrics()
+
+    assert seen is request
+    assert request.sql_queries >= 2